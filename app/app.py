@@ -1,30 +1,65 @@
-from dash import Dash, dcc
+from dash import Dash, callback_context, dcc, html, no_update
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 from app_utils import AppUtils
 import layout
+import metrics
+import profiling
+import workspace
 import json
 import io
 import zipfile
 import os
+import tempfile
 import base64
+import flask
 from pydub import AudioSegment
 from voice_utils import merge_recordings
+from voice_generator import generate_voice_sets, recording_name
+from augmentation import PRESETS, augment_voice_set
+from fingerprint import ingest_clip, near_duplicate_of
+from run_compare import compare_runs, run_created, run_names, save_run
+from table_query import query_rows, page_rows
+from server_store import store
 from typing import Any, Dict, List, Optional, Tuple
 
 # Create Dash app
 app = Dash(__name__)
 
-# Define the app layout
-app.layout = layout.create_layout()
+
+def serve_layout() -> html.Div:
+    """
+    Build the layout for one page load, listing the workspace's paths and the runs.
+
+    A new workspace is seeded with a starter conversation path.
+
+    Returns:
+        html.Div: The main layout of the Dash app.
+    """
+    if not flask.has_request_context():
+        # Dash also builds the layout once at startup to validate callbacks
+        return layout.create_layout([], [])
+    current = workspace.current_workspace()
+    if not store.path_names(current):
+        store.replace_path(current, "base", layout.default_rows())
+    return layout.create_layout(store.path_names(current), run_names(current))
+
+
+# Define the app layout; built per page load so it lists the stored paths and runs
+app.layout = serve_layout
+
+# Expose Prometheus metrics at /metrics on the underlying Flask server
+metrics.init_app(app.server)
+# Give each browser its own workspace of conversation paths
+workspace.init_app(app.server)
 
 
 @app.callback(
     Output("table", "data"),
+    Output("table", "page_count"),
+    Output("table-page", "data"),
     Output("table", "dropdown"),
     Output("convo-path-dropdown", "options"),
-    Output("data-store", "data"),
-    Output("recording-store", "data"),
     Input("add-row-btn", "n_clicks"),
     Input("add-convo-path-btn", "n_clicks"),
     Input("transcribe-btn", "n_clicks"),
@@ -32,15 +67,24 @@ app.layout = layout.create_layout()
     Input("gen-btn", "n_clicks"),
     Input("voice-dropdown", "value"),
     Input("convo-path-dropdown", "value"),
+    Input("table", "page_current"),
+    Input("table", "page_size"),
+    Input("table", "sort_by"),
+    Input("table", "filter_query"),
+    Input("table", "data_timestamp"),
     State("convo-path-dropdown", "options"),
     State("response-voice-dropdown", "value"),
     State("new-convo-path-name", "value"),
     State("table", "data"),
+    State("table", "data_previous"),
+    State("table-page", "data"),
     State("table", "dropdown"),
-    State("data-store", "data"),
     State("voice-store", "data"),
-    State("recording-store", "data"),
+    State("stt-model-dropdown", "value"),
+    State("batch-options", "value"),
 )
+@metrics.track_callback
+@profiling.profile_callback
 def update_table_and_dropdowns(
     n_clicks_add_row: Optional[int],
     n_clicks_add_convo_path: Optional[int],
@@ -49,24 +93,35 @@ def update_table_and_dropdowns(
     n_clicks_gen: Optional[int],
     voice_dropdown: Optional[str],
     convo_path_dropdown_value: Optional[str],
+    page_current: Optional[int],
+    page_size: int,
+    sort_by: Optional[List[Dict[str, str]]],
+    filter_query: Optional[str],
+    data_timestamp: Optional[int],
     convo_path_dropdown_options: List[Dict[str, Any]],
     response_voice_dropdown_value: Optional[str],
     new_convo_path_name: Optional[str],
-    table_data: List[Dict[str, Any]],
+    page_data: List[Dict[str, Any]],
+    page_previous: Optional[List[Dict[str, Any]]],
+    page: Optional[Dict[str, Any]],
     table_dropdown: List[Dict[str, Any]],
-    data_store: Dict[str, Any],
     voice_store: Dict[str, Any],
-    recording_store: Dict[str, Any],
+    stt_models: Optional[List[str]],
+    batch_options: Optional[List[str]],
 ) -> Tuple[
     List[Dict[str, Any]],
+    int,
+    Dict[str, Any],
     List[Dict[str, Any]],
     List[Dict[str, Any]],
-    Dict[str, Any],
-    Dict[str, Any],
 ]:
     """
     Update the table and dropdowns based on user interactions.
 
+    The conversation paths live in the server-side store, in the browser's
+    workspace; only the page of rows currently visible in the table is sent
+    to the browser.
+
     Args:
         n_clicks_add_row (Optional[int]): Number of clicks on the 'add-row-btn'.
         n_clicks_add_convo_path (Optional[int]): Number of clicks on the 'add-convo-path-btn'.
@@ -75,22 +130,30 @@ def update_table_and_dropdowns(
         n_clicks_gen (Optional[int]): Number of clicks on the 'gen-btn'.
         voice_dropdown (Optional[str]): Selected value from the 'voice-dropdown'.
         convo_path_dropdown_value (Optional[str]): Selected value from the 'convo-path-dropdown'.
+        page_current (Optional[int]): Page of the table being displayed.
+        page_size (int): Number of rows per page.
+        sort_by (Optional[List[Dict[str, str]]]): Table sort specification.
+        filter_query (Optional[str]): Table filter query.
+        data_timestamp (Optional[int]): Time of the last edit made in the table.
         convo_path_dropdown_options (List[Dict[str, Any]]): Options for the conversation path dropdown.
+        response_voice_dropdown_value (Optional[str]): Selected value from the 'response-voice-dropdown'.
         new_convo_path_name (Optional[str]): New conversation path name input by the user.
-        table_data (List[Dict[str, Any]]): Current data in the table.
+        page_data (List[Dict[str, Any]]): Rows of the visible page, including user edits.
+        page_previous (Optional[List[Dict[str, Any]]]): Rows of the visible page before the last edit.
+        page (Optional[Dict[str, Any]]): Row IDs and path version the visible page was served with.
         table_dropdown (List[Dict[str, Any]]): Dropdown options for the table.
-        data_store (Dict[str, Any]): Data store dictionary.
         voice_store (Dict[str, Any]): Voice store dictionary.
-        recording_store (Dict[str, Any]): Recording store dictionary.
+        stt_models (Optional[List[str]]): Models selected in the 'stt-model-dropdown'.
+        batch_options (Optional[List[str]]): Options checked in 'batch-options'.
 
     Returns:
         Tuple[
             List[Dict[str, Any]],
-            List[Dict[str, Any]],
-            List[Dict[str, Any]],
+            int,
             Dict[str, Any],
-            Dict[str, Any]
-        ]: Updated table data, table dropdowns, conversation path options, data store, and recording store.
+            List[Dict[str, Any]],
+            List[Dict[str, Any]]
+        ]: Visible page rows, page count, row IDs and version of the page, table dropdowns and conversation path options.
     """
     utils = AppUtils(
         voice_dropdown,
@@ -98,11 +161,19 @@ def update_table_and_dropdowns(
         convo_path_dropdown_options,
         response_voice_dropdown_value,
         new_convo_path_name,
-        table_data,
+        page_current,
+        page_size,
+        sort_by,
+        filter_query,
+        page_data,
+        page_previous,
+        (page or {}).get("ids", []),
+        (page or {}).get("version"),
         table_dropdown,
-        data_store,
         voice_store,
-        recording_store,
+        stt_models or [],
+        "restart" in (batch_options or []),
+        workspace.current_workspace(),
     )
 
     # Run updates based on input and state values
@@ -112,8 +183,29 @@ def update_table_and_dropdowns(
     return utils.generate_output()
 
 
+@app.callback(
+    Output("table", "columns"),
+    Input("stt-model-dropdown", "value"),
+    prevent_initial_call=True,
+)
+@metrics.track_callback
+@profiling.profile_callback
+def update_stt_model_columns(stt_models: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """
+    Show a transcript and an accuracy column for each selected STT model.
+
+    Args:
+        stt_models (Optional[List[str]]): Models selected in the 'stt-model-dropdown'.
+
+    Returns:
+        List[Dict[str, Any]]: Columns of the table.
+    """
+    return layout.table_columns(stt_models or [])
+
+
 @app.callback(
     Output("upload-popup", "displayed"),
+    Output("upload-popup", "message"),
     Output("voice-dropdown", "options"),
     Output("voice-store", "data"),
     Input("voice-upload", "contents"),
@@ -121,15 +213,19 @@ def update_table_and_dropdowns(
     State("voice-store", "data"),
     State("voice-dropdown", "options"),
 )
+@metrics.track_callback
+@profiling.profile_callback
 def upload_voice(
     zip_contents: Optional[str],
     zip_filename: Optional[str],
     voice_store: Dict[str, Any],
     voice_options: List[Dict[str, str]],
-) -> Tuple[bool, List[Dict[str, str]], Dict[str, Any]]:
+) -> Tuple[bool, str, List[Dict[str, str]], Dict[str, Any]]:
     """
     Handle the upload and processing of voice files from a zip archive.
 
+    Clips that nearly match an earlier take are listed in the confirmation.
+
     Args:
         zip_contents (Optional[str]): Base64 encoded contents of the uploaded zip file.
         zip_filename (Optional[str]): Filename of the uploaded zip file.
@@ -137,8 +233,9 @@ def upload_voice(
         voice_options (List[Dict[str, str]]): Current options for the voice dropdown.
 
     Returns:
-        Tuple[bool, List[Dict[str, str]], Dict[str, Any]]:
+        Tuple[bool, str, List[Dict[str, str]], Dict[str, Any]]:
             - bool: Whether the upload was successful.
+            - str: Confirmation message, listing near-duplicate clips.
             - List[Dict[str, str]]: Updated voice dropdown options.
             - Dict[str, Any]: Updated voice store dictionary.
     """
@@ -147,135 +244,288 @@ def upload_voice(
         decoded = io.BytesIO(base64.b64decode(content_string))
         display_name = zip_filename[:-4]
         voice_store[display_name] = {}
-        upload_dir = "uploaded_files"
-        zip_dir = display_name
-        zip_path = os.path.join(upload_dir, zip_dir)
-
-        with zipfile.ZipFile(decoded, "r") as zip_ref:
-            zip_ref.extractall(upload_dir)
-
-        for file_name in os.listdir(zip_path):
-            file_path = os.path.join(zip_path, file_name)
-            if file_name.endswith(".wav") or file_name.endswith(".m4a"):
-                # Convert .m4a files to .wav if necessary
-                if file_name.endswith(".m4a"):
-                    audio = AudioSegment.from_file(file_path, format="m4a")
-                    wav_path = file_path.replace(".m4a", ".wav")
-                    audio.export(wav_path, format="wav")
-                    file_path = wav_path
-                    file_name = file_name.replace(".m4a", ".wav")
-
-                encoded_wav = base64.b64encode(open(file_path, "rb").read()).decode(
-                    "utf-8"
-                )
-                voice_store[display_name][file_name] = encoded_wav
+
+        # Extract outside uploaded_files/, so an archive whose folder is named
+        # like a store directory (e.g. audio.zip) cannot overwrite stored clips
+        with tempfile.TemporaryDirectory() as upload_dir:
+            zip_path = os.path.join(upload_dir, display_name)
+
+            with zipfile.ZipFile(decoded, "r") as zip_ref:
+                zip_ref.extractall(upload_dir)
+
+            for file_name in os.listdir(zip_path):
+                file_path = os.path.join(zip_path, file_name)
+                if file_name.endswith(".wav") or file_name.endswith(".m4a"):
+                    # Convert .m4a files to .wav if necessary
+                    if file_name.endswith(".m4a"):
+                        audio = AudioSegment.from_file(file_path, format="m4a")
+                        wav_path = file_path.replace(".m4a", ".wav")
+                        audio.export(wav_path, format="wav")
+                        file_path = wav_path
+                        file_name = file_name.replace(".m4a", ".wav")
+
+                    # Keep the audio server-side, stored once per distinct clip
+                    with open(file_path, "rb") as wav_file:
+                        voice_store[display_name][file_name] = ingest_clip(
+                            wav_file.read()
+                        )
 
         voice_options.append({"label": display_name, "value": display_name})
 
-        return True, voice_options, voice_store
+        # Name each clip after the first voice set file that holds it
+        clip_names: Dict[str, str] = {}
+        for voice_set, files in voice_store.items():
+            for file_name, audio_key in files.items():
+                clip_names.setdefault(audio_key, f"{voice_set}/{file_name}")
+        duplicates = []
+        for file_name, audio_key in voice_store[display_name].items():
+            canonical = near_duplicate_of(audio_key)
+            if canonical is not None:
+                first_take = clip_names.get(canonical, "an earlier upload")
+                duplicates.append(f"{file_name} (like {first_take})")
+        message = "Your ZIP file has been successfully uploaded and processed."
+        if duplicates:
+            message += " Near-duplicate takes: " + ", ".join(duplicates)
+
+        return True, message, voice_options, voice_store
+
+    return False, no_update, voice_options, voice_store
+
+
+@app.callback(
+    Output("voice-dropdown", "options", allow_duplicate=True),
+    Output("voice-dropdown", "value", allow_duplicate=True),
+    Output("voice-store", "data", allow_duplicate=True),
+    Output("synth-voices-popup", "displayed"),
+    Output("synth-voices-popup", "message"),
+    Input("synth-voices-btn", "n_clicks"),
+    State("synth-voice-dropdown", "value"),
+    State("convo-path-dropdown", "value"),
+    State("voice-store", "data"),
+    State("voice-dropdown", "options"),
+    prevent_initial_call="initial_duplicate",
+)
+@metrics.track_callback
+@profiling.profile_callback
+def generate_voices(
+    n_clicks: Optional[int],
+    voices: Optional[List[str]],
+    convo_path: str,
+    voice_store: Dict[str, Any],
+    voice_options: List[Dict[str, str]],
+) -> Tuple[List[Dict[str, str]], str, Dict[str, Any], bool, str]:
+    """
+    Synthesize the Expected User Text of the current path with each selected voice.
+
+    Every voice becomes a new voice set, and rows without a recording are
+    pointed at their synthesized file name. Rows that could not be synthesized
+    are reported in a popup.
+
+    Args:
+        n_clicks (Optional[int]): Number of clicks on the 'synth-voices-btn'.
+        voices (Optional[List[str]]): Text to speech voices selected for generation.
+        convo_path (str): Selected conversation path.
+        voice_store (Dict[str, Any]): Current voice store dictionary.
+        voice_options (List[Dict[str, str]]): Current options for the voice dropdown.
+
+    Returns:
+        Tuple[List[Dict[str, str]], str, Dict[str, Any], bool, str]:
+            - List[Dict[str, str]]: Updated voice dropdown options.
+            - str: First generated voice set, selected in the voice dropdown.
+            - Dict[str, Any]: Updated voice store dictionary.
+            - bool: Whether any rows were skipped.
+            - str: Message listing the skipped rows.
+    """
+    if not n_clicks or not voices:
+        raise PreventUpdate
+
+    current = workspace.current_workspace()
+    rows, _, version = store.load_path(current, convo_path)
+    voice_sets, skipped = generate_voice_sets(
+        [row.get("Expected User Text", "") for row in rows], voices
+    )
+
+    # Point rows without a recording at their synthesized file, if any voice made one
+    synthesized = {name for files in voice_sets.values() for name in files}
+    store.update_rows(
+        current,
+        convo_path,
+        {
+            idx: {"User Recording": recording_name(idx)}
+            for idx, row in enumerate(rows)
+            if not row.get("User Recording") and recording_name(idx) in synthesized
+        },
+        version,
+    )
+
+    existing = [option["value"] for option in voice_options]
+    for voice_set, files in voice_sets.items():
+        voice_store[voice_set] = files
+        if voice_set not in existing:
+            voice_options.append({"label": voice_set, "value": voice_set})
+
+    message = "Could not synthesize: " + ", ".join(
+        f"row {idx + 1} ({voice})" for voice, idx in skipped
+    )
+    return voice_options, next(iter(voice_sets)), voice_store, bool(skipped), message
+
+
+@app.callback(
+    Output("voice-dropdown", "options", allow_duplicate=True),
+    Output("voice-store", "data", allow_duplicate=True),
+    Input("augment-btn", "n_clicks"),
+    State("augment-preset-dropdown", "value"),
+    State("voice-dropdown", "value"),
+    State("voice-store", "data"),
+    State("voice-dropdown", "options"),
+    prevent_initial_call="initial_duplicate",
+)
+@metrics.track_callback
+@profiling.profile_callback
+def augment_voices(
+    n_clicks: Optional[int],
+    preset: Optional[str],
+    voice_dropdown: Optional[str],
+    voice_store: Dict[str, Any],
+    voice_options: List[Dict[str, str]],
+) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+    """
+    Expand the selected voice set into derived voice sets using an augmentation preset.
+
+    Args:
+        n_clicks (Optional[int]): Number of clicks on the 'augment-btn'.
+        preset (Optional[str]): Selected augmentation preset.
+        voice_dropdown (Optional[str]): Voice set to augment.
+        voice_store (Dict[str, Any]): Current voice store dictionary.
+        voice_options (List[Dict[str, str]]): Current options for the voice dropdown.
 
-    return False, voice_options, voice_store
+    Returns:
+        Tuple[List[Dict[str, str]], Dict[str, Any]]:
+            - List[Dict[str, str]]: Updated voice dropdown options.
+            - Dict[str, Any]: Updated voice store dictionary.
+    """
+    if not n_clicks or not preset or voice_dropdown not in voice_store:
+        raise PreventUpdate
+
+    clips = {}
+    for file_name, audio_key in voice_store[voice_dropdown].items():
+        audio_data = store.get_audio(audio_key)
+        # Clips missing from the store are left out of the derived sets
+        if audio_data is not None:
+            clips[file_name] = bytes(audio_data)
+    if not clips:
+        raise PreventUpdate
+    specs = PRESETS[preset]
+    derived: Dict[str, Dict[str, str]] = {spec.name: {} for spec in specs}
+    # Store each clip's variants as its worker finishes instead of holding them all
+    for file_name, variants in augment_voice_set(clips, specs):
+        for name, data in variants.items():
+            derived[name][file_name] = ingest_clip(data, derived=True)
+
+    existing = [option["value"] for option in voice_options]
+    for name, files in derived.items():
+        voice_set = f"{voice_dropdown}~{name}"
+        voice_store[voice_set] = files
+        if voice_set not in existing:
+            voice_options.append({"label": voice_set, "value": voice_set})
+
+    return voice_options, voice_store
 
 
 @app.callback(
     Output("response-download", "data"),
-    Output("data-store", "data", allow_duplicate=True),
     Input("table", "active_cell"),
-    State("recording-store", "data"),
     State("convo-path-dropdown", "value"),
-    State("table", "data"),
-    State("data-store", "data"),
-    prevent_initial_call="initial_duplicate",
 )
+@metrics.track_callback
+@profiling.profile_callback
 def download_file(
     active_cell: Optional[Dict[str, Any]],
-    recording_store: Dict[str, Any],
     convo_path: str,
-    table_data: List[Dict[str, Any]],
-    data_store: Dict[str, Any],
-) -> Tuple[Optional[bytes], Dict[str, Any]]:
+) -> Optional[bytes]:
     """
     Handle the download of a specific file based on the active cell in the table.
 
     Args:
         active_cell (Optional[Dict[str, Any]]): Information about the currently active cell in the table.
-        recording_store (Dict[str, Any]): Current recording store dictionary.
         convo_path (str): Selected conversation path.
-        table_data (List[Dict[str, Any]]): Current data in the table.
-        data_store (Dict[str, Any]): Current data store dictionary.
 
     Returns:
-        Tuple[Optional[bytes], Dict[str, Any]]:
-            - Optional[bytes]: File data to be downloaded, or None if no file is selected.
-            - Dict[str, Any]: Updated data store dictionary.
+        Optional[bytes]: File data to be downloaded, or None if no file is selected.
     """
-    if active_cell:
-        data_store[convo_path] = table_data
-        if active_cell["column_id"] == "Assistant Response Recording":
-            row = active_cell["row"]
-            file_data = recording_store[convo_path][str(row)]
-            file_data = base64.b64decode(file_data)
+    if active_cell and active_cell["column_id"] == "Assistant Response Recording":
+        # row_id is the row's index in the full path, independent of paging
+        row = active_cell.get("row_id", active_cell["row"])
+        recording_key = store.get_recording(
+            workspace.current_workspace(), convo_path, int(row)
+        )
+        audio_data = store.get_audio(recording_key) if recording_key else None
+        if audio_data is not None:
+            # Base64 encoding for the browser happens only in send_bytes
+            file_data = bytes(audio_data)
             convo_path_name = f"convo_path_{convo_path}"
             row_name = f"row_{row}"
             output_filename = f"{convo_path_name}_{row_name}.wav"
-            return dcc.send_bytes(file_data, output_filename), data_store
-    return None, data_store
+            return dcc.send_bytes(file_data, output_filename)
+    return None
 
 
 @app.callback(
     Output("merged-download", "data"),
     Input("merge-btn", "n_clicks"),
-    State("recording-store", "data"),
     State("voice-store", "data"),
     State("convo-path-dropdown", "value"),
     State("voice-dropdown", "value"),
-    State("table", "data"),
     prevent_initial_call="initial_duplicate",
 )
+@metrics.track_callback
+@profiling.profile_callback
 def download_merged(
     n_clicks: Optional[int],
-    recording_store: Dict[str, Any],
     voice_store: Dict[str, Any],
     convo_path: str,
     voice_dropdown: str,
-    table_data: List[Dict[str, Any]],
 ) -> Optional[bytes]:
     """
     Handle the download of a merged WAV file containing recordings from the table.
 
     Args:
         n_clicks (Optional[int]): Number of clicks on the 'merge-btn'.
-        recording_store (Dict[str, Any]): Current recording store dictionary.
         voice_store (Dict[str, Any]): Current voice store dictionary.
         convo_path (str): Selected conversation path.
         voice_dropdown (str): Selected voice dropdown value.
-        table_data (List[Dict[str, Any]]): Current data in the table.
 
     Returns:
         Optional[bytes]: Combined WAV file data, or None if no recordings are selected.
     """
     if n_clicks > 0:
+        rows, recording_store, _ = store.load_path(
+            workspace.current_workspace(), convo_path
+        )
         recordings = []
-        for idx, row in enumerate(table_data):
+        for idx, row in enumerate(rows):
             # Get User Query
             voice_filename = row["User Recording"]
             if voice_filename != "":
-                query_file = voice_store[voice_dropdown][voice_filename]
-                recordings.append(base64.b64decode(query_file))
-
-                response_file_data = recording_store[convo_path][str(idx)]
-                recordings.append(base64.b64decode(response_file_data))
-
-        # Merge recordings and get the base64 encoded combined audio
-        file_data = merge_recordings(recordings)
+                # Memory-mapped views; pages are only loaded while merging.
+                # Turns without a stored query or response clip are skipped
+                for audio_key in (
+                    voice_store.get(voice_dropdown, {}).get(voice_filename),
+                    recording_store.get(str(idx)),
+                ):
+                    audio_data = store.get_audio(audio_key) if audio_key else None
+                    if audio_data is not None:
+                        recordings.append(audio_data)
+        if not recordings:
+            return None
+
+        # Merge recordings into one WAV file
+        file_bytes = merge_recordings(recordings)
 
         convo_path_name = f"convo_path_{convo_path}"
         voice_name = f"audio_{voice_dropdown}"
         output_filename = f"{convo_path_name}_{voice_name}.wav"
 
-        # Decode base64 to bytes for downloading
-        file_bytes = base64.b64decode(file_data)
-
         return dcc.send_bytes(file_bytes, output_filename)
     return None
 
@@ -283,18 +533,16 @@ def download_merged(
 @app.callback(
     Output("project-download", "data"),
     Input("export-btn", "n_clicks"),
-    State("table", "data"),
     State("table", "dropdown"),
-    State("convo-path-dropdown", "value"),
-    State("data-store", "data"),
+    State("convo-path-dropdown", "options"),
     State("voice-store", "data"),
 )
+@metrics.track_callback
+@profiling.profile_callback
 def export_project(
     n_clicks: Optional[int],
-    table_data: List[Dict[str, Any]],
     table_dropdowns: List[Dict[str, Any]],
-    convo_path: str,
-    data_store: Dict[str, Any],
+    convo_path_options: List[Dict[str, str]],
     voice_store: Dict[str, Any],
 ) -> Optional[bytes]:
     """
@@ -302,10 +550,8 @@ def export_project(
 
     Args:
         n_clicks (Optional[int]): Number of clicks on the 'export-btn'.
-        table_data (List[Dict[str, Any]]): Data currently displayed in the table.
         table_dropdowns (List[Dict[str, Any]]): Dropdown options for the table.
-        convo_path (str): Current selected conversation path.
-        data_store (Dict[str, Any]): Data store dictionary with project data.
+        convo_path_options (List[Dict[str, str]]): Options for the conversation path dropdown.
         voice_store (Dict[str, Any]): Voice store dictionary with available voices.
 
     Returns:
@@ -313,9 +559,23 @@ def export_project(
     """
     if n_clicks > 0:
         project_config = {}
-        data_store[convo_path] = table_data
-        project_config["data_store"] = data_store
-        project_config["voice_store"] = voice_store
+        # Conversation paths are read from the server-side store
+        current = workspace.current_workspace()
+        project_config["data_store"] = {
+            option["value"]: store.load_path(current, option["value"])[0]
+            for option in convo_path_options
+        }
+        # Resolve server-side audio references so the export is self-contained
+        # Clips missing from the store are left out of the export
+        project_config["voice_store"] = {}
+        for voice, files in voice_store.items():
+            project_config["voice_store"][voice] = {}
+            for file_name, audio_key in files.items():
+                audio_data = store.get_audio(audio_key)
+                if audio_data is not None:
+                    project_config["voice_store"][voice][file_name] = base64.b64encode(
+                        audio_data
+                    ).decode("utf-8")
         project_config["table_dropdown"] = table_dropdowns
         # Convert data to a JSON string and return as bytes
         return dcc.send_bytes(
@@ -325,53 +585,50 @@ def export_project(
 
 
 @app.callback(
-    Output("data-store", "data", allow_duplicate=True),
     Output("voice-store", "data", allow_duplicate=True),
     Output("convo-path-dropdown", "value", allow_duplicate=True),
     Output("convo-path-dropdown", "options", allow_duplicate=True),
     Output("voice-dropdown", "options", allow_duplicate=True),
     Output("voice-dropdown", "value", allow_duplicate=True),
-    Output("table", "data", allow_duplicate=True),
     Output("table", "dropdown", allow_duplicate=True),
     Input("project-upload", "contents"),
     prevent_initial_call="initial_duplicate",
 )
+@metrics.track_callback
+@profiling.profile_callback
 def import_project(
     json_contents: Optional[str],
 ) -> Tuple[
-    Dict[str, Any],
     Dict[str, Any],
     str,
     List[Dict[str, str]],
     List[Dict[str, str]],
     str,
     List[Dict[str, Any]],
-    List[Dict[str, Any]],
 ]:
     """
     Import a project configuration from a JSON file and update the app state.
 
+    The conversation paths and audio are written to the server-side store;
+    selecting the first path then loads its first page into the table.
+
     Args:
         json_contents (Optional[str]): Base64 encoded JSON content from the uploaded file.
 
     Returns:
         Tuple[
-            Dict[str, Any],
             Dict[str, Any],
             str,
             List[Dict[str, str]],
             List[Dict[str, str]],
             str,
-            List[Dict[str, Any]],
             List[Dict[str, Any]]
         ]:
-            - Dict[str, Any]: Data store dictionary with project data.
             - Dict[str, Any]: Voice store dictionary with available voices.
             - str: Default selected conversation path.
             - List[Dict[str, str]]: Options for the conversation path dropdown.
             - List[Dict[str, str]]: Options for the voice dropdown.
             - str: Default selected voice.
-            - List[Dict[str, Any]]: Data to be displayed in the table.
             - List[Dict[str, Any]]: Dropdown options for the table.
     """
     if json_contents:
@@ -380,29 +637,147 @@ def import_project(
         decoded = base64.b64decode(content_string).decode("utf-8")
 
         json_data = json.loads(decoded)
+        # Move the embedded audio into the server-side store
+        for voice, files in json_data["voice_store"].items():
+            # Augmented voice sets are named "<voice set>~<variant>"
+            derived = "~" in voice
+            for file_name, encoded_wav in files.items():
+                files[file_name] = ingest_clip(
+                    base64.b64decode(encoded_wav), derived=derived
+                )
+        # Conversation paths are kept server-side and paged into the table
+        current = workspace.current_workspace()
+        for convo, rows in json_data["data_store"].items():
+            store.replace_path(current, convo, rows)
         convo_paths = list(json_data["data_store"].keys())
         voices = list(json_data["voice_store"].keys())
         voice = voices[0]
         convo_path = convo_paths[0]
-        table_data = json_data["data_store"][convo_path]
         convo_options = [{"label": convo, "value": convo} for convo in convo_paths]
         voice_options = [{"label": voice, "value": voice} for voice in voices]
         table_dropdown = json_data["table_dropdown"]
 
         return [
-            json_data["data_store"],
             json_data["voice_store"],
             convo_path,
             convo_options,
             voice_options,
             voice,
-            table_data,
             table_dropdown,
         ]
     else:
         raise PreventUpdate
 
 
+@app.callback(
+    Output("run-a-dropdown", "options"),
+    Output("run-b-dropdown", "options"),
+    Input("save-run-btn", "n_clicks"),
+    State("run-name", "value"),
+    State("convo-path-dropdown", "options"),
+    State("voice-dropdown", "value"),
+    prevent_initial_call=True,
+)
+@metrics.track_callback
+@profiling.profile_callback
+def save_run_results(
+    n_clicks: Optional[int],
+    run_name: Optional[str],
+    convo_path_options: List[Dict[str, str]],
+    voice_dropdown: Optional[str],
+) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """
+    Save the current results of every conversation path as a named run.
+
+    Args:
+        n_clicks (Optional[int]): Number of clicks on the 'save-run-btn'.
+        run_name (Optional[str]): Name to save the run under.
+        convo_path_options (List[Dict[str, str]]): Options for the conversation path dropdown.
+        voice_dropdown (Optional[str]): Voice set the results were produced with.
+
+    Returns:
+        Tuple[List[Dict[str, str]], List[Dict[str, str]]]: Updated options for
+        the baseline and compared run dropdowns.
+    """
+    if not n_clicks or not run_name:
+        raise PreventUpdate
+
+    convo_paths = [option["value"] for option in convo_path_options]
+    current = workspace.current_workspace()
+    save_run(current, run_name, convo_paths, voice_dropdown)
+    run_options = [{"label": name, "value": name} for name in run_names(current)]
+    return run_options, run_options
+
+
+@app.callback(
+    Output("compare-table", "data"),
+    Output("compare-table", "page_count"),
+    Output("compare-summary", "children"),
+    Input("compare-btn", "n_clicks"),
+    Input("compare-table", "page_current"),
+    Input("compare-table", "page_size"),
+    Input("compare-table", "sort_by"),
+    Input("compare-table", "filter_query"),
+    State("run-a-dropdown", "value"),
+    State("run-b-dropdown", "value"),
+    prevent_initial_call=True,
+)
+@metrics.track_callback
+@profiling.profile_callback
+def compare_run_results(
+    n_clicks: Optional[int],
+    page_current: Optional[int],
+    page_size: int,
+    sort_by: Optional[List[Dict[str, str]]],
+    filter_query: Optional[str],
+    run_a: Optional[str],
+    run_b: Optional[str],
+) -> Tuple[List[Dict[str, Any]], int, str]:
+    """
+    Compare two saved runs and serve one page of the changed turns.
+
+    The comparison is computed when 'compare-btn' is clicked and kept in the
+    server-side store, so paging, sorting and filtering only re-query it.
+
+    Args:
+        n_clicks (Optional[int]): Number of clicks on the 'compare-btn'.
+        page_current (Optional[int]): Zero-based page requested by the table.
+        page_size (int): Rows per page.
+        sort_by (Optional[List[Dict[str, str]]]): Sort specification of the table.
+        filter_query (Optional[str]): Filter query of the table.
+        run_a (Optional[str]): Baseline run.
+        run_b (Optional[str]): Run compared against the baseline.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int, str]: Rows of the page, page count and
+        a summary of the comparison.
+    """
+    if not run_a or not run_b:
+        raise PreventUpdate
+
+    # Runs and their comparisons belong to the browser's workspace; a run
+    # saved again under the same name gets a new comparison
+    current = workspace.current_workspace()
+    comparison_key = (
+        f"{current}/{run_a}@{run_created(current, run_a)}"
+        f"|{run_b}@{run_created(current, run_b)}"
+    )
+    comparison = store.get("comparisons", comparison_key)
+    if comparison is None or callback_context.triggered_id == "compare-btn":
+        changes, summary = compare_runs(current, run_a, run_b)
+        comparison = {"changes": changes, "summary": summary}
+        store.set("comparisons", comparison_key, comparison)
+
+    changes = comparison["changes"]
+    page, page_count = page_rows(
+        changes, query_rows(changes, filter_query, sort_by), page_current, page_size
+    )
+    summary = ", ".join(
+        f"{kind}: {count}" for kind, count in comparison["summary"].items()
+    )
+    return page, page_count, summary
+
+
 server = app.server  # This is the WSGI application that Gunicorn needs to run
 
 if __name__ == "__main__":
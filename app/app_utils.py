@@ -1,12 +1,51 @@
-from typing import List, Dict, Any
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import List, Dict, Any, Awaitable, Optional, Sequence, Set, Tuple
 from dataclasses import dataclass, field
 import dash
+from metrics import JOBS_IN_FLIGHT
+from server_store import store
+from scoring import word_accuracy
 from voice_utils import (
-    transcribe_audio,
-    synthesize_speech,
-    create_session_id,
-    query_assistant,
+    parse_stt_models,
+    stt_model_label,
+    transcribe_audio_models,
+    transcribe_audio_stream,
+    synthesize_speech_stream,
+    STT_MODE,
+    STT_MODEL,
+    STT_CACHE,
+    STT_STREAM_PACING,
+    TTS_MODE,
 )
+from session_pool import get_session_pool
+from watson_async import AsyncWatsonClient
+from table_query import query_rows, page_rows
+
+# Seconds a batch may run before its unfinished rows are recorded as timed out;
+# keep it below the worker timeout so the callback returns the finished rows
+BATCH_DEADLINE: float = float(os.getenv("BATCH_DEADLINE", "540"))
+
+
+def parse_latency(cell: str) -> Dict[str, int]:
+    """
+    Parse a Latency cell such as "stt: 820 ms, assistant: 312 ms".
+
+    Args:
+        cell (str): Latency cell text.
+
+    Returns:
+        Dict[str, int]: Milliseconds per stage.
+    """
+    latencies = {}
+    for part in (cell or "").split(", "):
+        stage, _, value = part.partition(": ")
+        if value.endswith(" ms") and value[:-3].isdigit():
+            latencies[stage] = int(value[:-3])
+    return latencies
 
 
 @dataclass
@@ -18,12 +57,22 @@ class AppUtils:
     response_voice_dropdown_value: str
     new_convo_path_name: str
 
+    # Server-side paging, sorting and filtering of the table
+    page_current: int
+    page_size: int
+    sort_by: List[Dict[str, str]]
+    filter_query: str
+    page_data: List[Dict[str, Any]]
+    page_previous: Optional[List[Dict[str, Any]]]
+    page_ids: List[int]
+    page_version: Optional[int]
+
     # Data storage
-    table_data: List[Dict[str, Any]]
     table_dropdown: Dict[str, Dict[str, List[Dict[str, str]]]]
-    data_store: Dict[str, List[Dict[str, Any]]]
     voice_store: Dict[str, Dict[str, str]]
-    recording_store: Dict[str, Dict[int, Any]]
+    stt_models: List[str]  # Labels of the models compared by "Transcribe Text"
+    restart: bool  # Ignore the checkpoints of an unfinished earlier run
+    workspace: str
 
     # Default columns for the table
     default_columns: List[Dict[str, Any]] = field(
@@ -51,12 +100,31 @@ class AppUtils:
                 "editable": False,
             },
             {"name": "Latency", "id": "Latency", "editable": True},
+            {"name": "Error", "id": "Error", "editable": False},
         ]
     )
 
+    # Rows, recording references and version of the selected path, loaded from
+    # the server-side store
+    table_data: List[Dict[str, Any]] = field(init=False, default_factory=list)
+    recording_store: Dict[str, str] = field(init=False, default_factory=dict)
+    version: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        """Load the selected conversation path from the server-side store."""
+        self.load()
+
+    def load(self) -> None:
+        """(Re)read the selected conversation path from the server-side store."""
+        self.table_data, self.recording_store, self.version = store.load_path(
+            self.workspace, self.convo_path_dropdown_value
+        )
+
     def run_updates(self) -> None:
         """Process updates based on the triggered event."""
-        triggered = dash.callback_context.triggered[0]["prop_id"].split(".")[0]
+        triggered, _, prop = dash.callback_context.triggered[0]["prop_id"].partition(
+            "."
+        )
         print(triggered)
 
         if triggered == "voice-dropdown":
@@ -65,8 +133,8 @@ class AppUtils:
             for voice in voice_files:
                 self.update_table_dropdown("User Recording", voice)
 
-        elif triggered == "convo-path-dropdown":
-            self.update_table()
+        elif triggered == "table" and prop == "data_timestamp":
+            self.save_edits()
 
         elif triggered == "add-row-btn":
             self.add_row()
@@ -74,51 +142,540 @@ class AppUtils:
         elif triggered == "add-convo-path-btn":
             self.add_option()
 
-        elif triggered == "transcribe-btn":
-            for idx, row in enumerate(self.table_data):
-                filename = row.get("User Recording", "")
-                if filename:
-                    audio_file = self.voice_store.get(self.voice_dropdown, {}).get(
-                        filename
-                    )
-                    if audio_file:
-                        transcription = transcribe_audio(audio_file)
-                        self.table_data[idx]["Transcribed Text"] = transcription
+        elif triggered in ("transcribe-btn", "query-btn", "gen-btn"):
+            with JOBS_IN_FLIGHT.labels(triggered).track_inprogress():
+                self.run_batch(triggered)
 
+    def run_batch(self, triggered: str) -> None:
+        """
+        Run a batch action over every row of the current table.
+
+        Rows are checkpointed to the server-side store as they finish, with a
+        hash of their inputs and settings. If the previous run of the same
+        action on this path did not complete, its successful rows whose inputs
+        are unchanged are restored and only the remaining rows are processed,
+        unless a restart was requested.
+        """
+        scope = f"{self.workspace}/{self.convo_path_dropdown_value}"
+        previous = None
+        if not self.restart:
+            previous = store.resumable_job(triggered, scope, stale_after=BATCH_DEADLINE)
+        job_id = store.create_job(triggered, len(self.table_data), scope)
+        inputs = self.row_inputs(triggered)
+        done = set()
+        if previous is not None:
+            done = self.restore_checkpoints(previous["id"], job_id, inputs)
+        # Restored rows were copied to the new job; earlier checkpoints are spent
+        store.prune_checkpoints(triggered, scope, job_id, stale_after=BATCH_DEADLINE)
+        try:
+            failed = asyncio.run(self._run_batch(triggered, job_id, done, inputs))
+        except Exception:
+            store.update_job(job_id, status="failed")
+            raise
+        finally:
+            # Finished rows were written one by one; pick up concurrent edits too
+            self.load()
+        store.update_job(job_id, status="incomplete" if failed else "done")
+        if not failed:
+            # A completed job is never resumed
+            store.prune_checkpoints(triggered, scope, None, stale_after=BATCH_DEADLINE)
+
+    def row_inputs(self, triggered: str) -> List[str]:
+        """
+        Hash what each row's result depends on for a batch action.
+
+        Covers the row's input cells and the settings of the action: the clip
+        and STT model(s) and mode for transcription, the user turns up to and
+        including the row for assistant queries (earlier turns set the
+        conversation context), and the text, response voice and TTS mode for
+        recordings.
+
+        Args:
+            triggered (str): ID of the button that started the batch.
+
+        Returns:
+            List[str]: One hex digest per row.
+        """
+        if triggered == "transcribe-btn":
+            voice_files = self.voice_store.get(self.voice_dropdown, {})
+            settings = [self.stt_models or [STT_MODEL], STT_MODE, STT_STREAM_PACING]
+            inputs = [
+                [
+                    voice_files.get(row.get("User Recording", "")),
+                    row.get("Expected User Text", ""),
+                ]
+                for row in self.table_data
+            ]
         elif triggered == "query-btn":
-            session_id = create_session_id()
-            for idx, row in enumerate(self.table_data):
-                text = row.get("Transcribed Text", "") or row.get(
-                    "Expected User Text", ""
+            settings, inputs, turns = [], [], []
+            for row in self.table_data:
+                turns.append(
+                    row.get("Transcribed Text", "") or row.get("Expected User Text", "")
+                )
+                inputs.append(list(turns))
+        else:
+            settings = [self.response_voice_dropdown_value, TTS_MODE]
+            inputs = [
+                [
+                    row.get("Actual Assistant Response")
+                    or row.get("Expected Assistant Response")
+                ]
+                for row in self.table_data
+            ]
+        return [
+            hashlib.sha256(json.dumps([settings, row_inputs]).encode()).hexdigest()
+            for row_inputs in inputs
+        ]
+
+    def restore_checkpoints(
+        self, previous_job_id: str, job_id: str, inputs: List[str]
+    ) -> Set[int]:
+        """
+        Restore the successful rows of an unfinished job into the table.
+
+        Args:
+            previous_job_id (str): Job whose checkpoints are restored.
+            job_id (str): New job the restored rows are checkpointed under.
+            inputs (List[str]): Current input hash of every row, from `row_inputs`;
+                rows whose checkpoint was made with other inputs are not restored.
+
+        Returns:
+            Set[int]: Indices of the restored rows.
+        """
+        restored = set()
+        checkpoints = store.job_checkpoints(previous_job_id)
+        for idx, (row, recording, row_inputs) in checkpoints.items():
+            if (
+                idx < len(self.table_data)
+                and row_inputs == inputs[idx]
+                and not row.get("Error")
+            ):
+                before, self.table_data[idx] = self.table_data[idx], row
+                self.write_row(idx, before, recording)
+                if recording:
+                    self.recording_store[str(idx)] = recording
+                store.checkpoint_row(job_id, idx, row, recording, row_inputs)
+                restored.add(idx)
+        store.update_job(job_id, progress=len(restored))
+        return restored
+
+    def write_row(
+        self,
+        idx: int,
+        before: Dict[str, Any],
+        recording: Optional[str] = None,
+    ) -> None:
+        """
+        Store the cells a batch changed in a row, and its recording if any.
+
+        Only the cells that differ from `before` are written, so edits made to
+        other cells while the batch ran are kept. Nothing is written if rows
+        were deleted or the path was replaced since it was loaded.
+
+        Args:
+            idx (int): Index of the row in `table_data`.
+            before (Dict[str, Any]): The row as it was loaded.
+            recording (Optional[str]): Audio key of the row's generated recording.
+        """
+        changes = {
+            column: value
+            for column, value in self.table_data[idx].items()
+            if before.get(column) != value
+        }
+        path = self.convo_path_dropdown_value
+        if not store.update_rows(self.workspace, path, {idx: changes}, self.version):
+            print(
+                f"Result of row {idx} discarded: rows of {path} changed during the run"
+            )
+        elif recording is not None:
+            store.set_recording(self.workspace, path, idx, recording, self.version)
+
+    def save_row(
+        self,
+        job_id: str,
+        idx: int,
+        before: Dict[str, Any],
+        recording: Optional[str],
+        inputs: str,
+        progress: int,
+    ) -> None:
+        """Write a finished row to its path, checkpoint it and update the job's progress."""
+        self.write_row(idx, before, recording)
+        store.checkpoint_row(job_id, idx, self.table_data[idx], recording, inputs)
+        store.update_job(job_id, progress=progress)
+
+    async def _run_batch(
+        self, triggered: str, job_id: str, done: Set[int], inputs: List[str]
+    ) -> int:
+        """
+        Process the rows of a batch on one event loop, concurrently if possible.
+
+        Every row must finish within BATCH_DEADLINE of the start of the batch;
+        rows that fail or run out of time get an "Error" cell instead of
+        stopping the batch.
+
+        Returns:
+            int: Number of rows that failed.
+        """
+        deadline = time.monotonic() + BATCH_DEADLINE
+        # Rows restored or processed so far; a row counts once even if re-run
+        finished = set(done)
+        failed = 0
+
+        async def process(idx: int, work: Awaitable[None], stage: str) -> None:
+            nonlocal failed
+            row = self.table_data[idx]
+            before = dict(row)
+            try:
+                await asyncio.wait_for(work, timeout=deadline - time.monotonic())
+                row["Error"] = ""
+            except asyncio.TimeoutError:
+                row["Error"] = f"{stage}: timed out"
+                failed += 1
+            except Exception as error:
+                row["Error"] = f"{stage}: {error}"
+                failed += 1
+            finished.add(idx)
+            recording = self.recording_store.get(str(idx))
+            # The SQLite writes run in a worker thread so other rows keep going
+            await asyncio.to_thread(
+                self.save_row,
+                job_id,
+                idx,
+                before,
+                recording,
+                inputs[idx],
+                len(finished),
+            )
+
+        async with AsyncWatsonClient() as client:
+            if triggered == "transcribe-btn":
+                # Fan each clip out to every selected model in A/B mode
+                stt_models = parse_stt_models(",".join(self.stt_models))
+                voice_files = self.voice_store.get(self.voice_dropdown, {})
+                # Recognitions of this batch by clip and model(s), shared by
+                # rows that use identical clips
+                recognitions: Dict[str, asyncio.Future] = {}
+
+                async def transcribe(idx: int, row: Dict[str, Any]) -> None:
+                    audio_key = voice_files.get(row.get("User Recording", ""))
+                    if audio_key and stt_models:
+                        await self.transcribe_row_models(
+                            client, idx, audio_key, stt_models, recognitions
+                        )
+                    elif audio_key:
+                        await self.transcribe_row(client, idx, audio_key, recognitions)
+
+                await asyncio.gather(
+                    *(
+                        process(idx, transcribe(idx, row), "stt")
+                        for idx, row in enumerate(self.table_data)
+                        if idx not in done
+                    )
+                )
+
+            elif triggered == "query-btn":
+                # Turns of a path share the session, so they are sent in order and
+                # a resumed run continues from the first unfinished turn
+                texts = [
+                    row.get("Transcribed Text", "") or row.get("Expected User Text", "")
+                    for row in self.table_data
+                ]
+                start = next(
+                    (idx for idx in range(len(texts)) if idx not in done), len(texts)
                 )
-                response = query_assistant(text, session_id)
-                self.table_data[idx]["Actual Assistant Response"] = response
-
-        elif triggered == "gen-btn":
-            self.recording_store[self.convo_path_dropdown_value] = {}
-            for idx, row in enumerate(self.table_data):
-                text = row.get("Actual Assistant Response")
-                if text == "":
-                    text = row.get("Expected Assistant Response")
-                if text != "":
-                    self.table_data[idx]["Assistant Response Recording"] = "recording"
-                    self.recording_store[self.convo_path_dropdown_value][idx] = (
-                        synthesize_speech(text, self.response_voice_dropdown_value)
+                if start == len(texts):
+                    return failed
+                # Pre-created session, so the first turn excludes session setup;
+                # the turns before a resumed run are replayed to restore context
+                session_pool = get_session_pool()
+                resume = session_pool.resume_async(client, texts[:start])
+                try:
+                    session = await asyncio.wait_for(
+                        resume, timeout=deadline - time.monotonic()
+                    )
+                except Exception as error:
+                    # Without a session no turn can be sent; record why on each
+                    failure = error
+
+                    async def unavailable() -> None:
+                        raise failure
+
+                    for idx in range(start, len(texts)):
+                        await process(idx, unavailable(), "assistant")
+                    return failed
+
+                async def ask(idx: int) -> None:
+                    response, latency = await session_pool.query_async(
+                        session, texts[idx], client
+                    )
+                    self.table_data[idx]["Actual Assistant Response"] = response
+                    self.set_latency(idx, "assistant", latency)
+
+                for idx in range(start, len(texts)):
+                    await process(idx, ask(idx), "assistant")
+
+            elif triggered == "gen-btn":
+                # Recordings of the rows to regenerate are replaced or dropped
+                path = self.convo_path_dropdown_value
+                for idx in list(self.recording_store):
+                    if int(idx) not in done:
+                        del self.recording_store[idx]
+                        store.set_recording(
+                            self.workspace, path, int(idx), None, self.version
+                        )
+
+                async def synthesize(idx: int, row: Dict[str, Any]) -> None:
+                    text = row.get("Actual Assistant Response")
+                    if text == "":
+                        text = row.get("Expected Assistant Response")
+                    if text != "":
+                        # Keep the audio server-side and only a reference in the browser
+                        self.recording_store[str(idx)] = await self.synthesize_row(
+                            client, idx, text
+                        )
+                        row["Assistant Response Recording"] = "recording"
+
+                await asyncio.gather(
+                    *(
+                        process(idx, synthesize(idx, row), "tts")
+                        for idx, row in enumerate(self.table_data)
+                        if idx not in done
+                    )
+                )
+        return failed
+
+    async def transcribe_row(
+        self,
+        client: AsyncWatsonClient,
+        idx: int,
+        audio_key: str,
+        recognitions: Dict[str, asyncio.Future],
+    ) -> None:
+        """
+        Transcribe one row's recording and record the STT latency.
+
+        Rows of one batch whose clips are identical share a single
+        recognition; only the first records a latency, the others are
+        marked as cached.
+        """
+        # Clip keys are content hashes, so only identical audio shares a transcription
+        cache_key = f"{audio_key}:{STT_MODEL}"
+        transcription = store.cache_get("stt", cache_key) if STT_CACHE else None
+        if transcription is None and cache_key in recognitions:
+            transcription, _ = await asyncio.shield(recognitions[cache_key])
+        if transcription is not None:
+            self.table_data[idx]["Transcribed Text"] = transcription
+            self.mark_cached(idx, "stt", ("stt first interim", "stt first final"))
+            return
+        audio_file = store.get_audio(audio_key)
+        if audio_file is None:
+            return
+
+        async def recognize() -> Tuple[str, Dict[str, float]]:
+            if STT_MODE == "stream":
+                # WebSocket streaming goes through the SDK in a worker thread,
+                # holding one of the service's slots like an HTTP request
+                transcription, timings = await client.run_sync(
+                    "stt", transcribe_audio_stream, audio_file
+                )
+                return transcription, {
+                    f"stt {stage}": timings[stage]
+                    for stage in ("first interim", "first final")
+                    if stage in timings
+                }
+            start = time.perf_counter()
+            transcription = await client.recognize(audio_file)
+            return transcription, {"stt": time.perf_counter() - start}
+
+        # Shielded, so rows sharing the recognition keep it if this row times out
+        recognitions[cache_key] = asyncio.ensure_future(recognize())
+        transcription, latencies = await asyncio.shield(recognitions[cache_key])
+        for stage, seconds in latencies.items():
+            self.set_latency(idx, stage, seconds)
+        self.table_data[idx]["Transcribed Text"] = transcription
+        if transcription != "Transcription failed":
+            store.cache_set("stt", cache_key, transcription)
+
+    async def transcribe_row_models(
+        self,
+        client: AsyncWatsonClient,
+        idx: int,
+        audio_key: str,
+        models: List[Tuple[str, Optional[str]]],
+        recognitions: Dict[str, asyncio.Future],
+    ) -> None:
+        """
+        Transcribe one row's recording with several models and score each one.
+
+        As in `transcribe_row`, identical clips of one batch share their
+        recognitions.
+        """
+        transcriptions: Dict[str, str] = {}
+        pending = []
+        for model, customization_id in models:
+            label = stt_model_label(model, customization_id)
+            cached = None
+            if STT_CACHE:
+                cached = store.cache_get("stt", f"{audio_key}:{label}")
+            if cached is not None:
+                transcriptions[label] = cached
+                self.mark_cached(idx, f"stt {label}")
+            else:
+                pending.append((model, customization_id))
+
+        recognition_key = f"{audio_key}:" + ",".join(
+            stt_model_label(*pair) for pair in pending
+        )
+        if pending and recognition_key in recognitions:
+            results = await asyncio.shield(recognitions[recognition_key])
+            for label, (transcription, _) in results.items():
+                transcriptions[label] = transcription
+                self.mark_cached(idx, f"stt {label}")
+        elif pending:
+            audio_file = store.get_audio(audio_key)
+            if audio_file is None:
+                return
+
+            async def recognize_models() -> Dict[str, Tuple[str, float]]:
+                if STT_MODE == "stream":
+                    return await client.run_sync(
+                        "stt", transcribe_audio_models, audio_file, pending
+                    )
+
+                async def recognize(
+                    model: str, customization_id: Optional[str]
+                ) -> Tuple[str, float]:
+                    start = time.perf_counter()
+                    transcript = await client.recognize(
+                        audio_file, model, customization_id
                     )
+                    return transcript, time.perf_counter() - start
 
-    def update_table(self) -> None:
-        """Update table data based on the selected conversation path."""
-        self.data_store[self.convo_path_dropdown_value] = self.table_data
-        self.table_data = self.data_store.get(self.convo_path_dropdown_value, [])
+                # Every model gets the same memory-mapped audio buffer
+                outcomes = await asyncio.gather(*(recognize(*pair) for pair in pending))
+                return {
+                    stt_model_label(*pair): outcome
+                    for pair, outcome in zip(pending, outcomes)
+                }
+
+            recognitions[recognition_key] = asyncio.ensure_future(recognize_models())
+            results = await asyncio.shield(recognitions[recognition_key])
+            for label, (transcription, seconds) in results.items():
+                transcriptions[label] = transcription
+                self.set_latency(idx, f"stt {label}", seconds)
+                if transcription != "Transcription failed":
+                    store.cache_set("stt", f"{audio_key}:{label}", transcription)
+
+        row = self.table_data[idx]
+        expected = row.get("Expected User Text", "")
+        labels = [stt_model_label(*pair) for pair in models]
+        for label in labels:
+            row[f"Transcribed Text ({label})"] = transcriptions[label]
+            row[f"Accuracy ({label})"] = (
+                round(100 * word_accuracy(expected, transcriptions[label]), 1)
+                if expected
+                else ""
+            )
+        # The first model's transcript is the one sent to the assistant
+        row["Transcribed Text"] = transcriptions[labels[0]]
+
+    async def synthesize_row(
+        self, client: AsyncWatsonClient, idx: int, text: str
+    ) -> str:
+        """Synthesize one row's response into the store and record the TTS latency."""
+        key = f"recording/{self.workspace}/{self.convo_path_dropdown_value}/{idx}"
+        if TTS_MODE == "stream":
+            # WebSocket streaming goes through the SDK in a worker thread,
+            # holding one of the service's slots like an HTTP request
+            timings = await client.run_sync(
+                "tts",
+                synthesize_speech_stream,
+                text,
+                self.response_voice_dropdown_value,
+                key,
+            )
+            if "first chunk" in timings:
+                self.set_latency(idx, "tts first chunk", timings["first chunk"])
+            self.set_latency(idx, "tts total", timings["total"])
+        else:
+            start = time.perf_counter()
+            audio_data = await client.synthesize(
+                text, self.response_voice_dropdown_value
+            )
+            self.set_latency(idx, "tts", time.perf_counter() - start)
+            store.put_audio(key, audio_data)
+        return key
+
+    def set_latency(self, idx: int, stage: str, seconds: float) -> None:
+        """Record the latency of one stage in a row's Latency cell."""
+        self._set_latency_value(idx, stage, f"{round(seconds * 1000)} ms")
+
+    def mark_cached(self, idx: int, stage: str, replaces: Sequence[str] = ()) -> None:
+        """
+        Mark a stage whose result came from a cache in a row's Latency cell.
+
+        The stage shows "cached" instead of a time, so runs that reuse results
+        are not mistaken for fast calls, and `parse_latency` leaves it out.
+
+        Args:
+            idx (int): Row index.
+            stage (str): Stage name, e.g. "stt".
+            replaces (Sequence[str]): Other stages of the same call whose earlier
+                timings no longer apply.
+        """
+        self._set_latency_value(idx, stage, "cached", replaces)
+
+    def _set_latency_value(
+        self, idx: int, stage: str, value: str, replaces: Sequence[str] = ()
+    ) -> None:
+        """Set one "stage: value" part of a row's Latency cell, keeping the others."""
+        parts = {}
+        for part in (self.table_data[idx].get("Latency") or "").split(", "):
+            name, _, text = part.partition(": ")
+            if name and name not in replaces:
+                parts[name] = text
+        parts[stage] = value
+        self.table_data[idx]["Latency"] = ", ".join(
+            f"{name}: {text}" for name, text in parts.items()
+        )
+
+    def save_edits(self) -> None:
+        """Apply cell edits and row deletions from the visible page to the full path."""
+        # Only the cells the tester changed are written, so results written by a
+        # batch in another worker since the page was served are kept
+        previous = {row["id"]: row for row in self.page_previous or [] if "id" in row}
+        edited = {row["id"]: row for row in self.page_data if "id" in row}
+        changes = {}
+        for row_id, row in edited.items():
+            if row_id in self.page_ids and row_id < len(self.table_data):
+                cells = {
+                    column: value
+                    for column, value in row.items()
+                    if column != "id" and previous.get(row_id, {}).get(column) != value
+                }
+                if cells:
+                    changes[row_id] = cells
+        path = self.convo_path_dropdown_value
+        # The page's version guards against rows having moved since it was served
+        if changes and not store.update_rows(
+            self.workspace, path, changes, self.page_version
+        ):
+            print(f"Edits to {path} discarded: rows changed since the page was loaded")
+        deleted = sorted(set(self.page_ids) - set(edited), reverse=True)
+        if deleted:
+            store.delete_rows(self.workspace, path, deleted, self.page_version)
+        self.load()
 
     def add_row(self) -> None:
         """Add a new row to the table with default column values."""
         if not self.table_data:
             columns = [col["id"] for col in self.default_columns]
-            self.table_data.append({col: "" for col in columns})
+            row = {col: "" for col in columns}
         else:
-            self.table_data.append({col: "" for col in self.table_data[0].keys()})
-        self.data_store[self.convo_path_dropdown_value] = self.table_data
+            row = {col: "" for col in self.table_data[0].keys()}
+        store.append_row(self.workspace, self.convo_path_dropdown_value, row)
+        self.load()
 
     def add_option(self) -> None:
         """Add a new option to the conversation path dropdown."""
@@ -129,15 +686,19 @@ class AppUtils:
         }
         if self.new_convo_path_name and new_option["value"] not in options:
             self.convo_path_dropdown_options.append(new_option)
-            self.data_store[self.new_convo_path_name] = [
-                {
-                    "User Recording": "",
-                    "Expected User Text": "",
-                    "Transcribed Text": "",
-                    "Expected Assistant Response": "",
-                    "Latency": "",
-                }
-            ]
+            store.replace_path(
+                self.workspace,
+                self.new_convo_path_name,
+                [
+                    {
+                        "User Recording": "",
+                        "Expected User Text": "",
+                        "Transcribed Text": "",
+                        "Expected Assistant Response": "",
+                        "Latency": "",
+                    }
+                ],
+            )
 
     def update_table_dropdown(self, option_type: str, new_option: str) -> None:
         """Update dropdown options in the table."""
@@ -156,11 +717,15 @@ class AppUtils:
             self.table_dropdown[option_type]["options"] = []
 
     def generate_output(self) -> List:
-        """Generate the output of the current state."""
+        """Generate the output of the current state, sending only the visible page."""
+        indices = query_rows(self.table_data, self.filter_query, self.sort_by)
+        page, page_count = page_rows(
+            self.table_data, indices, self.page_current, self.page_size
+        )
         return [
-            self.table_data,
+            page,
+            page_count,
+            {"ids": [row["id"] for row in page], "version": self.version},
             self.table_dropdown,
             self.convo_path_dropdown_options,
-            self.data_store,
-            self.recording_store,
         ]
@@ -0,0 +1,241 @@
+import io
+import os
+import wave
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Worker processes used to augment a voice set
+AUGMENT_WORKERS: int = int(os.getenv("AUGMENT_WORKERS", str(os.cpu_count() or 1)))
+
+TELEPHONY_RATE = 8000  # Sample rate of narrowband telephony audio
+TELEPHONY_BAND = (300.0, 3400.0)  # Pass band of a telephone channel in Hz
+MU = 255.0  # G.711 mu-law compression parameter
+
+
+@dataclass(frozen=True)
+class AugmentationSpec:
+    """One degradation applied to every clip of a voice set."""
+
+    snr_db: Optional[float] = None  # Additive white noise at this signal-to-noise ratio
+    gain_db: float = 0.0  # Gain change; results are clipped to full scale
+    speed: float = 1.0  # Playback speed factor (changes tempo and pitch together)
+    telephony: bool = False  # Band-limit, resample to 8 kHz and mu-law round trip
+
+    @property
+    def name(self) -> str:
+        """Suffix identifying the derived voice set, e.g. "snr10_gain-6_tel"."""
+        parts = []
+        if self.snr_db is not None:
+            parts.append(f"snr{self.snr_db:g}")
+        if self.gain_db:
+            parts.append(f"gain{self.gain_db:+g}")
+        if self.speed != 1.0:
+            parts.append(f"speed{self.speed:g}")
+        if self.telephony:
+            parts.append("tel")
+        return "_".join(parts) or "clean"
+
+
+def spec_grid(
+    snrs: Sequence[Optional[float]] = (None,),
+    gains: Sequence[float] = (0.0,),
+    speeds: Sequence[float] = (1.0,),
+    telephony: Sequence[bool] = (False,),
+) -> List[AugmentationSpec]:
+    """
+    Build every combination of the given augmentation parameters.
+
+    Args:
+        snrs (Sequence[Optional[float]]): Noise levels in dB (None for no noise).
+        gains (Sequence[float]): Gain changes in dB.
+        speeds (Sequence[float]): Speed factors.
+        telephony (Sequence[bool]): Whether to simulate a telephone channel.
+
+    Returns:
+        List[AugmentationSpec]: One spec per combination, excluding the clean one.
+    """
+    specs = [
+        AugmentationSpec(snr, gain, speed, tel)
+        for snr, gain, speed, tel in itertools.product(snrs, gains, speeds, telephony)
+    ]
+    return [spec for spec in specs if spec.name != "clean"]
+
+
+# Named sets of augmentations offered in the UI
+PRESETS: Dict[str, List[AugmentationSpec]] = {
+    "Noise sweep": spec_grid(snrs=(20, 10, 5, 0)),
+    "Gain": spec_grid(gains=(-12, -6, 6)),
+    "Speed": spec_grid(speeds=(0.8, 0.9, 1.1, 1.2)),
+    "Telephony": spec_grid(telephony=(True,), snrs=(None, 20, 10)),
+    "Full robustness grid": spec_grid(
+        snrs=(None, 20, 10, 5),
+        gains=(-6, 0, 6),
+        speeds=(0.9, 1.0, 1.1),
+        telephony=(False, True),
+    ),
+}
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Decode PCM WAV bytes into mono float samples.
+
+    Args:
+        data (bytes): WAV file contents.
+
+    Returns:
+        Tuple[np.ndarray, int]: Samples in [-1, 1] and the sample rate.
+    """
+    with wave.open(io.BytesIO(data), "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        width = wav_file.getsampwidth()
+        rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+    # Mix interleaved channels down to mono
+    return samples.reshape(-1, channels).mean(axis=1), rate
+
+
+def encode_wav(samples: np.ndarray, rate: int) -> bytes:
+    """
+    Encode mono float samples as 16-bit PCM WAV bytes.
+
+    Args:
+        samples (np.ndarray): Samples in [-1, 1].
+        rate (int): Sample rate in Hz.
+
+    Returns:
+        bytes: WAV file contents.
+    """
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(pcm.tobytes())
+    return output.getvalue()
+
+
+def add_noise(
+    samples: np.ndarray, snr_db: float, rng: np.random.Generator
+) -> np.ndarray:
+    """Add white noise scaled to reach the target signal-to-noise ratio."""
+    signal_power = float(np.mean(samples**2)) or 1e-10
+    noise_power = signal_power / (10 ** (snr_db / 10))
+    return samples + rng.normal(0.0, np.sqrt(noise_power), samples.shape).astype(
+        np.float32
+    )
+
+
+def apply_gain(samples: np.ndarray, gain_db: float) -> np.ndarray:
+    """Scale the samples by a gain in dB, clipping at full scale."""
+    return np.clip(samples * (10 ** (gain_db / 20)), -1.0, 1.0)
+
+
+def resample(samples: np.ndarray, factor: float) -> np.ndarray:
+    """Linearly resample to `len(samples) / factor` samples."""
+    length = max(1, int(round(len(samples) / factor)))
+    positions = np.linspace(0, len(samples) - 1, length)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def telephony_channel(samples: np.ndarray, rate: int) -> np.ndarray:
+    """
+    Simulate a telephone channel: band-limit, resample to 8 kHz and mu-law code.
+
+    Args:
+        samples (np.ndarray): Samples in [-1, 1] at `rate`.
+        rate (int): Sample rate of `samples` in Hz.
+
+    Returns:
+        np.ndarray: Degraded samples at TELEPHONY_RATE.
+    """
+    spectrum = np.fft.rfft(samples)
+    frequencies = np.fft.rfftfreq(len(samples), d=1.0 / rate)
+    spectrum[(frequencies < TELEPHONY_BAND[0]) | (frequencies > TELEPHONY_BAND[1])] = 0
+    narrowband = resample(np.fft.irfft(spectrum, n=len(samples)), rate / TELEPHONY_RATE)
+    # 8-bit mu-law quantization round trip
+    narrowband = np.clip(narrowband, -1.0, 1.0)
+    encoded = np.sign(narrowband) * np.log1p(MU * np.abs(narrowband)) / np.log1p(MU)
+    quantized = np.round(encoded * 127) / 127
+    return (
+        np.sign(quantized) * np.expm1(np.abs(quantized) * np.log1p(MU)) / MU
+    ).astype(np.float32)
+
+
+def augment_clip(
+    data: bytes, specs: List[AugmentationSpec], seed: int = 0
+) -> Dict[str, bytes]:
+    """
+    Apply several augmentations to one clip, decoding it only once.
+
+    Args:
+        data (bytes): WAV file contents.
+        specs (List[AugmentationSpec]): Augmentations to apply.
+        seed (int): Seed for the noise generator, so runs are reproducible.
+
+    Returns:
+        Dict[str, bytes]: WAV file contents per augmentation name.
+    """
+    samples, rate = decode_wav(data)
+    rng = np.random.default_rng(seed)
+    variants = {}
+    for spec in specs:
+        variant, variant_rate = samples, rate
+        if spec.speed != 1.0:
+            variant = resample(variant, spec.speed)
+        if spec.gain_db:
+            variant = apply_gain(variant, spec.gain_db)
+        if spec.snr_db is not None:
+            variant = add_noise(variant, spec.snr_db, rng)
+        if spec.telephony:
+            variant, variant_rate = telephony_channel(variant, rate), TELEPHONY_RATE
+        variants[spec.name] = encode_wav(variant, variant_rate)
+    return variants
+
+
+def augment_voice_set(
+    clips: Dict[str, bytes], specs: List[AugmentationSpec]
+) -> Iterator[Tuple[str, Dict[str, bytes]]]:
+    """
+    Expand a voice set into one derived clip per clip and augmentation.
+
+    Clips are processed in parallel worker processes; each worker decodes a
+    clip once and applies every augmentation to it. Variants are yielded clip
+    by clip as the workers finish, so callers can store them without holding
+    the whole derived voice set in memory.
+
+    Args:
+        clips (Dict[str, bytes]): WAV file contents by file name.
+        specs (List[AugmentationSpec]): Augmentations to apply.
+
+    Yields:
+        Tuple[str, Dict[str, bytes]]: File name and WAV file contents by
+        augmentation name, in the order of `clips`.
+    """
+    file_names = list(clips)
+    # Spawned workers start without the parent's threads and locks, but they
+    # re-import the main script: a small launcher under Waitress or Gunicorn,
+    # the whole Dash app (built, never served) under `python app.py`
+    with ProcessPoolExecutor(
+        max_workers=AUGMENT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = executor.map(
+            augment_clip,
+            [clips[file_name] for file_name in file_names],
+            itertools.repeat(specs),
+            range(len(file_names)),
+        )
+        yield from zip(file_names, results)
@@ -0,0 +1,145 @@
+import io
+import wave
+import hashlib
+from typing import Optional
+import numpy as np
+from augmentation import decode_wav
+from metrics import record_cache_lookup
+from server_store import store
+
+FRAME_SECONDS = 0.064  # Analysis frame length
+BAND_EDGES = np.geomspace(300, 4000, 17)  # 16 log-spaced bands covering speech
+# Near-duplicates must have durations within this fraction of each other
+DURATION_TOLERANCE = 0.05
+# ... and differ in at most this fraction of fingerprint bits
+MAX_BIT_ERROR_RATE = 0.15
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash the audio content of a clip.
+
+    PCM frames are hashed rather than the whole file, so copies that differ
+    only in WAV metadata still hash the same.
+
+    Args:
+        data (bytes): WAV file contents.
+
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wav_file:
+            params = wav_file.getparams()[:3]
+            frames = wav_file.readframes(wav_file.getnframes())
+        return hashlib.sha256(repr(params).encode() + frames).hexdigest()
+    except (wave.Error, EOFError):
+        return hashlib.sha256(data).hexdigest()
+
+
+def spectral_fingerprint(data: bytes) -> np.ndarray:
+    """
+    Compute a cheap spectral fingerprint of a clip.
+
+    Each frame is reduced to the energy in 16 speech bands; one bit per band
+    pair records whether the energy difference between adjacent bands rose or
+    fell since the previous frame. The result is robust to gain, noise and
+    re-encoding but distinguishes different utterances.
+
+    Args:
+        data (bytes): WAV file contents.
+
+    Returns:
+        np.ndarray: A (frames - 1, 15) bool array.
+    """
+    samples, rate = decode_wav(data)
+    frame_length = int(rate * FRAME_SECONDS)
+    frame_count = len(samples) // frame_length
+    if frame_count < 2:
+        return np.zeros((0, len(BAND_EDGES) - 2), dtype=bool)
+    frames = samples[: frame_count * frame_length].reshape(frame_count, frame_length)
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame_length), axis=1)) ** 2
+    frequencies = np.fft.rfftfreq(frame_length, d=1.0 / rate)
+    band_index = np.digitize(frequencies, BAND_EDGES) - 1
+    energies = np.stack(
+        [
+            spectrum[:, band_index == band].sum(axis=1)
+            for band in range(len(BAND_EDGES) - 1)
+        ],
+        axis=1,
+    )
+    band_diff = np.diff(np.log1p(energies), axis=1)
+    return np.diff(band_diff, axis=0) > 0
+
+
+def bit_error_rate(first: np.ndarray, second: np.ndarray) -> float:
+    """Fraction of differing bits over the overlapping frames of two fingerprints."""
+    frames = min(len(first), len(second))
+    if frames == 0:
+        return 1.0
+    return float(np.mean(first[:frames] != second[:frames]))
+
+
+def find_near_duplicate(bits: np.ndarray) -> Optional[str]:
+    """
+    Find an indexed clip whose fingerprint nearly matches.
+
+    Args:
+        bits (np.ndarray): Fingerprint bits of the new clip.
+
+    Returns:
+        Optional[str]: Canonical clip key of the match, or None.
+    """
+    tolerance = max(1, int(len(bits) * DURATION_TOLERANCE))
+    for canonical, rows, packed in store.fingerprint_candidates(
+        len(bits) - tolerance, len(bits) + tolerance
+    ):
+        candidate = np.unpackbits(np.frombuffer(packed, dtype=np.uint8))
+        candidate = candidate[: rows * bits.shape[1]].reshape(rows, bits.shape[1])
+        if bit_error_rate(bits, candidate.astype(bool)) <= MAX_BIT_ERROR_RATE:
+            return canonical
+    return None
+
+
+def near_duplicate_of(clip: str) -> Optional[str]:
+    """Return the clip a near-identical clip was linked to at ingest, or None."""
+    canonical = store.canonical_clip(clip)
+    return canonical if canonical not in (None, clip) else None
+
+
+def ingest_clip(data: bytes, derived: bool = False) -> str:
+    """
+    Store an uploaded clip once and index it for deduplication.
+
+    Identical audio is stored a single time under its content hash. A clip
+    that only nearly matches an indexed one keeps its own audio and is
+    linked to that clip's canonical key, which groups the takes of one
+    utterance; cached results such as transcriptions are only shared
+    between identical clips.
+
+    Args:
+        data (bytes): WAV file contents.
+        derived (bool): The clip was generated from another one, e.g. by
+            augmentation. Derived clips are never linked to a near-duplicate
+            and are not offered as matches for later clips.
+
+    Returns:
+        str: Server-side store key of the clip.
+    """
+    key = f"clip/{content_hash(data)}"
+    exists = store.canonical_clip(key) is not None
+    record_cache_lookup("clip_dedup", exists)
+    if exists:
+        return key
+
+    bits, canonical = np.zeros((0, 0), dtype=bool), None
+    if not derived:
+        try:
+            bits = spectral_fingerprint(data)
+            canonical = find_near_duplicate(bits) if len(bits) else None
+        except (wave.Error, EOFError, ValueError):
+            pass
+
+    store.put_audio(key, data)
+    store.add_fingerprint(key, canonical or key, len(bits), np.packbits(bits).tobytes())
+    return key
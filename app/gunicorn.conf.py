@@ -0,0 +1,34 @@
+import os
+import shutil
+import multiprocessing
+
+# Metrics from every worker are aggregated through files in this directory;
+# it must be set before prometheus_client is imported by any process
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+from prometheus_client import multiprocess  # noqa: E402
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+# Batch callbacks call Watson once per row, so allow long requests
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "600"))
+
+
+def on_starting(server) -> None:
+    """Start each deployment with an empty metrics directory."""
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def post_fork(server, worker) -> None:
+    """Start creating Watson Assistant sessions in each worker before its first query."""
+    from session_pool import ASSISTANT_SESSION_POOL_SIZE, get_session_pool
+
+    get_session_pool().prewarm(ASSISTANT_SESSION_POOL_SIZE)
+
+
+def child_exit(server, worker) -> None:
+    """Drop live gauges owned by a worker that has exited."""
+    multiprocess.mark_process_dead(worker.pid)
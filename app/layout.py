@@ -1,32 +1,130 @@
 from dash import dcc, html, dash_table
-from typing import Dict, List
-from voice_utils import get_voices
+from typing import Any, Dict, List
+from voice_utils import get_stt_models, get_voices, parse_stt_models, stt_model_label
+from augmentation import PRESETS
+from run_compare import COMPARE_COLUMNS
 
 
-def create_layout(
-    initial_data: Dict[str, List[Dict[str, str]]] = {
-        "base": [
+def default_rows() -> List[Dict[str, str]]:
+    """
+    Create the rows of the starter conversation path.
+
+    Returns:
+        List[Dict[str, str]]: Ten empty table rows.
+    """
+    return [
+        {
+            "User Recording": "",
+            "Expected User Text": "",
+            "Transcribed Text": "",
+            "Expected Assistant Response": "",
+            "Actual Assistant Response": "",
+            "Latency": "",
+        }
+        for _ in range(10)  # Generate 10 identical dictionaries
+    ]
+
+
+def stt_model_columns(stt_models: List[str]) -> List[Dict[str, Any]]:
+    """
+    Create the per-model transcript and accuracy columns of the STT A/B mode.
+
+    Args:
+        stt_models (List[str]): Labels of the selected models.
+
+    Returns:
+        List[Dict[str, Any]]: Two table columns per model.
+    """
+    columns = []
+    for label in stt_models:
+        columns.append(
             {
-                "User Recording": "",
-                "Expected User Text": "",
-                "Transcribed Text": "",
-                "Expected Assistant Response": "",
-                "Actual Assistant Response": "",
-                "Latency": "",
+                "name": f"Transcribed Text ({label})",
+                "id": f"Transcribed Text ({label})",
+                "editable": False,
             }
-            for _ in range(10)  # Generate 10 identical dictionaries
-        ],
-    },
-) -> html.Div:
+        )
+        columns.append(
+            {
+                "name": f"Accuracy ({label})",
+                "id": f"Accuracy ({label})",
+                "editable": False,
+                "type": "numeric",
+            }
+        )
+    return columns
+
+
+def table_columns(stt_models: List[str]) -> List[Dict[str, Any]]:
+    """
+    Create the columns of the conversation path table.
+
+    Args:
+        stt_models (List[str]): Labels of the models selected for the STT A/B mode.
+
+    Returns:
+        List[Dict[str, Any]]: Table columns, with two extra columns per model.
+    """
+    return [
+        {
+            "name": "User Recording",
+            "id": "User Recording",
+            "editable": True,
+            "presentation": "dropdown",
+        },
+        {
+            "name": "Expected User Text",
+            "id": "Expected User Text",
+            "editable": True,
+        },
+        {
+            "name": "Transcribed Text",
+            "id": "Transcribed Text",
+            "editable": False,
+        },
+        *stt_model_columns(stt_models),
+        {
+            "name": "Expected Assistant Response",
+            "id": "Expected Assistant Response",
+            "editable": True,
+        },
+        {
+            "name": "Actual Assistant Response",
+            "id": "Actual Assistant Response",
+            "editable": False,
+        },
+        {
+            "name": "Assistant Response Recording",
+            "id": "Assistant Response Recording",
+            "editable": False,
+        },
+        {"name": "Latency", "id": "Latency", "editable": False},
+        {"name": "Error", "id": "Error", "editable": False},
+    ]
+
+
+def create_layout(convo_paths: List[str], run_names: List[str]) -> html.Div:
     """
     Create the layout for the Dash app.
 
     Args:
-        initial_data (Dict[str, List[Dict[str, str]]]): A dictionary containing the initial data to populate the table.
+        convo_paths (List[str]): Names of the conversation paths in the server-side store.
+        run_names (List[str]): Names of the saved runs in the server-side store.
 
     Returns:
         html.Div: The main layout of the Dash app.
     """
+    voices = get_voices()
+    # STT_MODELS preselects the models compared by "Transcribe Text"
+    stt_models = [stt_model_label(*pair) for pair in parse_stt_models()]
+    try:
+        available_models = [
+            model for model in get_stt_models() if model not in stt_models
+        ]
+    except Exception as error:
+        # The page still loads with the configured models if listing fails
+        print(f"Could not list Speech to Text models: {error}")
+        available_models = []
     layout = html.Div(
         id="main-container",
         children=[
@@ -70,11 +168,10 @@ def create_layout(
                                 placeholder="Conversation Path",
                                 options=[
                                     {"label": option, "value": option}
-                                    for option in initial_data.keys()
+                                    for option in convo_paths
                                 ],
-                                value=list(initial_data.keys())[
-                                    0
-                                ],  # Default to the first key
+                                # Default to the first path
+                                value=convo_paths[0] if convo_paths else None,
                             ),
                         ],
                     ),
@@ -100,12 +197,47 @@ def create_layout(
                                 id="response-voice-dropdown",
                                 placeholder="Response Voice",
                                 options=[
-                                    {"label": voice, "value": voice}
-                                    for voice in get_voices()
+                                    {"label": voice, "value": voice} for voice in voices
                                 ],
                                 value="en-US_EmmaExpressive",
                                 clearable=False,
                             ),
+                            dcc.Dropdown(
+                                id="stt-model-dropdown",
+                                placeholder="Speech to Text Models (A/B)",
+                                options=[
+                                    {"label": model, "value": model}
+                                    for model in stt_models + available_models
+                                ],
+                                value=stt_models,
+                                multi=True,
+                            ),
+                            dcc.Dropdown(
+                                id="synth-voice-dropdown",
+                                placeholder="Synthetic User Voices",
+                                options=[
+                                    {"label": voice, "value": voice} for voice in voices
+                                ],
+                                multi=True,
+                            ),
+                            html.Button(
+                                "Generate Voice Sets", id="synth-voices-btn", n_clicks=0
+                            ),
+                            dcc.ConfirmDialog(id="synth-voices-popup"),
+                            dcc.Dropdown(
+                                id="augment-preset-dropdown",
+                                placeholder="Augmentation Preset",
+                                options=[
+                                    {
+                                        "label": f"{preset} ({len(specs)} variants)",
+                                        "value": preset,
+                                    }
+                                    for preset, specs in PRESETS.items()
+                                ],
+                            ),
+                            html.Button(
+                                "Augment Voice Set", id="augment-btn", n_clicks=0
+                            ),
                             dcc.ConfirmDialog(
                                 id="upload-popup",
                                 message="Your ZIP file has been successfully uploaded and processed.",
@@ -119,43 +251,8 @@ def create_layout(
                 children=[
                     dash_table.DataTable(
                         id="table",
-                        columns=[
-                            {
-                                "name": "User Recording",
-                                "id": "User Recording",
-                                "editable": True,
-                                "presentation": "dropdown",
-                            },
-                            {
-                                "name": "Expected User Text",
-                                "id": "Expected User Text",
-                                "editable": True,
-                            },
-                            {
-                                "name": "Transcribed Text",
-                                "id": "Transcribed Text",
-                                "editable": False,
-                            },
-                            {
-                                "name": "Expected Assistant Response",
-                                "id": "Expected Assistant Response",
-                                "editable": True,
-                            },
-                            {
-                                "name": "Actual Assistant Response",
-                                "id": "Actual Assistant Response",
-                                "editable": False,
-                            },
-                            {
-                                "name": "Assistant Response Recording",
-                                "id": "Assistant Response Recording",
-                                "editable": False,
-                            },
-                            {"name": "Latency", "id": "Latency", "editable": False},
-                        ],
-                        data=initial_data[
-                            list(initial_data.keys())[0]
-                        ],  # Default to the first key
+                        columns=table_columns(stt_models),
+                        data=[],  # Pages are served by the update callback
                         editable=True,
                         dropdown={"User Recording": {"options": []}},
                         style_data_conditional=[
@@ -213,7 +310,16 @@ def create_layout(
                             "whiteSpace": "normal",  # Enable text wrapping
                             "textOverflow": "ellipsis",
                         },
-                        page_size=10,  # Enable pagination after 10 rows
+                        # Page, sort and filter server-side so the browser
+                        # only holds the visible rows of the path
+                        page_action="custom",
+                        page_current=0,
+                        page_size=10,
+                        sort_action="custom",
+                        sort_mode="multi",
+                        sort_by=[],
+                        filter_action="custom",
+                        filter_query="",
                     ),
                 ],
             ),
@@ -225,6 +331,17 @@ def create_layout(
                     html.Button("Transcribe Text", id="transcribe-btn", n_clicks=0),
                     html.Button("Query Assistant", id="query-btn", n_clicks=0),
                     html.Button("Generate Recordings", id="gen-btn", n_clicks=0),
+                    dcc.Checklist(
+                        id="batch-options",
+                        options=[
+                            {
+                                "label": "Restart (ignore unfinished runs)",
+                                "value": "restart",
+                            }
+                        ],
+                        value=[],
+                        inline=True,
+                    ),
                     html.Button(
                         "Download Merged Recording", id="merge-btn", n_clicks=0
                     ),
@@ -246,9 +363,62 @@ def create_layout(
                     ),
                 ],
             ),
-            dcc.Store(id="data-store", data=initial_data),
+            html.Div(
+                id="run-compare-section",
+                className="section",
+                children=[
+                    html.Div(className="section-title", children="Run Comparison"),
+                    dcc.Input(
+                        id="run-name", type="text", placeholder="Run Name", value=""
+                    ),
+                    html.Button("Save Run", id="save-run-btn", n_clicks=0),
+                    dcc.Dropdown(
+                        id="run-a-dropdown",
+                        placeholder="Baseline Run",
+                        options=[{"label": name, "value": name} for name in run_names],
+                    ),
+                    dcc.Dropdown(
+                        id="run-b-dropdown",
+                        placeholder="Compared Run",
+                        options=[{"label": name, "value": name} for name in run_names],
+                    ),
+                    html.Button("Compare Runs", id="compare-btn", n_clicks=0),
+                    html.Div(id="compare-summary"),
+                    dash_table.DataTable(
+                        id="compare-table",
+                        columns=[
+                            {"name": column, "id": column} for column in COMPARE_COLUMNS
+                        ],
+                        data=[],
+                        style_data_conditional=[
+                            {
+                                "if": {"filter_query": '{Change} = "regressed"'},
+                                "backgroundColor": "#f8d7da",
+                            },
+                            {
+                                "if": {"filter_query": '{Change} = "improved"'},
+                                "backgroundColor": "#d4edda",
+                            },
+                        ],
+                        style_table={"overflowX": "auto", "minWidth": "1200px"},
+                        style_cell={
+                            "minWidth": "100px",
+                            "maxWidth": "250px",
+                            "whiteSpace": "normal",
+                        },
+                        page_action="custom",
+                        page_current=0,
+                        page_size=20,
+                        sort_action="custom",
+                        sort_mode="multi",
+                        sort_by=[],
+                        filter_action="custom",
+                        filter_query="",
+                    ),
+                ],
+            ),
+            dcc.Store(id="table-page", data={}),
             dcc.Store(id="voice-store", data={}),
-            dcc.Store(id="recording-store", data={}),
         ],
     )
     return layout
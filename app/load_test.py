@@ -0,0 +1,298 @@
+"""
+Load generator replaying stored conversation paths against Watson Assistant.
+
+Each virtual caller opens its own session per conversation path and sends
+the path's user turns one by one, pausing for a think-time between turns.
+Callers start gradually over a ramp-up period and keep replaying paths until
+the test ends. Throughput, error rate and latency percentiles are reported
+for every interval and for the whole run. To try it without credentials:
+
+    python watson_standin.py --port 9443
+    ASSISTANT_URL=http://localhost:9443 ASSISTANT_API_KEY= python load_test.py
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from server_store import store
+from voice_utils import SessionExpiredError
+from watson_async import AsyncWatsonClient
+
+
+@dataclass
+class LoadProfile:
+    """Shape of a load test."""
+
+    callers: int = 10  # Concurrent virtual callers at full load
+    duration: float = 60.0  # Seconds from the start of the test until callers stop
+    ramp_up: float = 0.0  # Seconds over which callers are started
+    ramp_steps: int = 0  # Start callers in this many batches (0 for evenly spaced)
+    think_time: Tuple[float, float] = (1.0, 3.0)  # Pause between turns in seconds
+    interval: float = 5.0  # Seconds per reported interval
+
+    def start_delay(self, caller: int) -> float:
+        """Seconds after the start of the test at which a caller begins."""
+        if self.ramp_up <= 0:
+            return 0.0
+        fraction = caller / self.callers
+        if self.ramp_steps > 0:
+            fraction = int(fraction * self.ramp_steps) / self.ramp_steps
+        return fraction * self.ramp_up
+
+
+@dataclass
+class TurnResult:
+    """Outcome of one user turn."""
+
+    latency: float  # Seconds spent in the message call
+    ok: bool
+
+
+class LoadStats:
+    """
+    Turn results of a running load test and the number of active callers.
+
+    Results are collected per reporting interval; when an interval is
+    summarized its results are folded into running totals for the whole run,
+    so each report only looks at the turns of its own interval.
+    """
+
+    def __init__(self) -> None:
+        self.interval_results: List[TurnResult] = []  # Since the last interval
+        self.turns = 0
+        self.errors = 0
+        self.latencies: List[float] = []  # Of every successful turn so far
+        self.active = 0
+
+    def record(self, result: TurnResult) -> None:
+        """Add the outcome of a finished turn to the current interval."""
+        self.interval_results.append(result)
+
+    def summarize_interval(self, start: float, end: float) -> Dict[str, Any]:
+        """
+        Summarize the turns recorded since the previous interval and start a new one.
+
+        Args:
+            start (float): Interval start in seconds since the start of the test.
+            end (float): Interval end in seconds since the start of the test.
+
+        Returns:
+            Dict[str, Any]: Turn count, throughput, error rate and latency
+            percentiles of the successful turns.
+        """
+        results, self.interval_results = self.interval_results, []
+        latencies = [result.latency for result in results if result.ok]
+        errors = len(results) - len(latencies)
+        self.turns += len(results)
+        self.errors += errors
+        self.latencies.extend(latencies)
+        return self._summary(end, end - start, len(results), errors, latencies)
+
+    def summarize_run(self, end: float) -> Dict[str, Any]:
+        """Summarize every turn of the run, as `summarize_interval` does for one."""
+        self.summarize_interval(0.0, end)
+        return self._summary(end, end, self.turns, self.errors, self.latencies)
+
+    def _summary(
+        self,
+        end: float,
+        elapsed: float,
+        turns: int,
+        errors: int,
+        latencies: List[float],
+    ) -> Dict[str, Any]:
+        summary = {
+            "time": round(end, 1),
+            "callers": self.active,
+            "turns": turns,
+            "throughput": round(turns / elapsed, 2) if elapsed > 0 else 0.0,
+            "error rate": round(errors / turns, 4) if turns else 0.0,
+        }
+        for percentile in (50, 90, 99):
+            summary[f"p{percentile} ms"] = (
+                round(float(np.percentile(latencies, percentile)) * 1000)
+                if latencies
+                else None
+            )
+        return summary
+
+
+def load_paths(
+    names: Optional[List[str]] = None, workspace: Optional[str] = None
+) -> List[List[str]]:
+    """
+    Read the user turns of stored conversation paths.
+
+    Args:
+        names (Optional[List[str]]): Paths to replay; every stored path if None.
+        workspace (Optional[str]): Workspace to read; every workspace if None.
+
+    Returns:
+        List[List[str]]: Non-empty user turns of each path with at least one turn.
+    """
+    paths = []
+    for path_workspace, name in store.all_paths():
+        if (names and name not in names) or workspace not in (None, path_workspace):
+            continue
+        turns = [
+            row.get("Transcribed Text", "") or row.get("Expected User Text", "")
+            for row in store.load_path(path_workspace, name)[0]
+        ]
+        turns = [text for text in turns if text]
+        if turns:
+            paths.append(turns)
+    return paths
+
+
+async def _caller(
+    client: AsyncWatsonClient,
+    caller: int,
+    paths: List[List[str]],
+    profile: LoadProfile,
+    stats: LoadStats,
+    started: float,
+) -> None:
+    """Replay conversation paths as one virtual caller until the test ends."""
+    await asyncio.sleep(profile.start_delay(caller))
+    rng = random.Random(caller)
+    stats.active += 1
+    try:
+        iteration = 0
+        while time.monotonic() - started < profile.duration:
+            # Each replay of a path is a new call with its own session
+            turns = paths[(caller + iteration) % len(paths)]
+            iteration += 1
+            session_id = None
+            for text in turns:
+                if time.monotonic() - started >= profile.duration:
+                    break
+                ok = True
+                turn_start = time.perf_counter()
+                try:
+                    if session_id is None:
+                        session_id = await client.create_session()
+                        turn_start = time.perf_counter()
+                    await client.message(text, session_id)
+                except SessionExpiredError:
+                    ok, session_id = False, None
+                except Exception as error:
+                    print(f"Caller {caller}: {error}")
+                    ok = False
+                stats.record(TurnResult(time.perf_counter() - turn_start, ok))
+                await asyncio.sleep(rng.uniform(*profile.think_time))
+    finally:
+        stats.active -= 1
+
+
+async def _report(
+    profile: LoadProfile,
+    stats: LoadStats,
+    started: float,
+    intervals: List[Dict[str, Any]],
+) -> None:
+    """Print and keep a summary of every interval until cancelled."""
+    window_start = 0.0
+    while True:
+        await asyncio.sleep(profile.interval)
+        window_end = time.monotonic() - started
+        summary = stats.summarize_interval(window_start, window_end)
+        intervals.append(summary)
+        print(_format_row(summary))
+        window_start = window_end
+
+
+def _format_row(summary: Dict[str, Any]) -> str:
+    """Format a summary as one line of the progress report."""
+    return "  ".join(f"{key}={value}" for key, value in summary.items())
+
+
+async def run_load_test(
+    paths: List[List[str]], profile: LoadProfile
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Run a load test with the given profile.
+
+    Args:
+        paths (List[List[str]]): User turns of the conversation paths to replay.
+        profile (LoadProfile): Concurrency, ramp-up, think-time and duration.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]: Summary per reporting
+        interval and for the whole run.
+    """
+    stats = LoadStats()
+    intervals: List[Dict[str, Any]] = []
+    # Every caller may have a request in flight; only the connection pool is shared
+    async with AsyncWatsonClient(
+        connection_limit=profile.callers, assistant_concurrency=profile.callers
+    ) as client:
+        started = time.monotonic()
+        reporter = asyncio.create_task(_report(profile, stats, started, intervals))
+        await asyncio.gather(
+            *(
+                _caller(client, caller, paths, profile, stats, started)
+                for caller in range(profile.callers)
+            )
+        )
+        reporter.cancel()
+    return intervals, stats.summarize_run(time.monotonic() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, default=LoadProfile.callers)
+    parser.add_argument("--duration", type=float, default=LoadProfile.duration)
+    parser.add_argument("--ramp-up", type=float, default=LoadProfile.ramp_up)
+    parser.add_argument("--ramp-steps", type=int, default=LoadProfile.ramp_steps)
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        nargs=2,
+        metavar=("MIN", "MAX"),
+        default=LoadProfile.think_time,
+    )
+    parser.add_argument("--interval", type=float, default=LoadProfile.interval)
+    parser.add_argument(
+        "--paths", nargs="*", help="Conversation paths to replay (default: all)"
+    )
+    parser.add_argument(
+        "--workspace", help="Workspace of the paths to replay (default: all)"
+    )
+    parser.add_argument("--output", help="Write the interval and run summaries as JSON")
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=1.0,
+        help="Exit with status 1 if the run's error rate is higher, e.g. in CI",
+    )
+    args = parser.parse_args()
+
+    profile = LoadProfile(
+        callers=args.callers,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        ramp_steps=args.ramp_steps,
+        think_time=tuple(args.think_time),
+        interval=args.interval,
+    )
+    paths = load_paths(args.paths, args.workspace)
+    if not paths:
+        parser.error("No conversation path with user turns to replay")
+
+    intervals, summary = asyncio.run(run_load_test(paths, profile))
+    print("Total: " + _format_row(summary))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            report = {"profile": asdict(profile), "intervals": intervals}
+            json.dump(dict(report, summary=summary), output_file, indent=2)
+    if summary["error rate"] > args.max_error_rate:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
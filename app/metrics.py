@@ -0,0 +1,166 @@
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator
+import flask
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)  # Prometheus client library for exposing metrics
+
+# Latency buckets (seconds) sized for Watson round trips and long batch callbacks
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Payload size buckets (bytes) ranging from small JSON bodies to large base64 stores
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+WATSON_LATENCY = Histogram(
+    "watson_request_seconds",
+    "Latency of IBM Watson API calls",
+    ["service", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+WATSON_ERRORS = Counter(
+    "watson_request_errors_total",
+    "IBM Watson API calls that raised an exception",
+    ["service", "operation"],
+)
+WATSON_IN_FLIGHT = Gauge(
+    "watson_requests_in_flight",
+    "IBM Watson API calls currently waiting for a response",
+    ["service", "operation"],
+    multiprocess_mode="livesum",
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache name and result (hit or miss)",
+    ["cache", "result"],
+)
+CALLBACK_LATENCY = Histogram(
+    "dash_callback_seconds",
+    "Wall-clock duration of Dash callbacks",
+    ["callback"],
+    buckets=LATENCY_BUCKETS,
+)
+CALLBACKS_IN_FLIGHT = Gauge(
+    "dash_callbacks_in_flight",
+    "Dash callbacks currently executing",
+    ["callback"],
+    multiprocess_mode="livesum",
+)
+JOBS_IN_FLIGHT = Gauge(
+    "batch_jobs_in_flight",
+    "Batch table actions (transcribe, query, generate) currently running",
+    ["action"],
+    multiprocess_mode="livesum",
+)
+REQUEST_BYTES = Histogram(
+    "http_request_bytes",
+    "Size of HTTP request bodies received by the server",
+    ["endpoint", "callback"],
+    buckets=SIZE_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_bytes",
+    "Size of HTTP response bodies sent by the server",
+    ["endpoint", "callback"],
+    buckets=SIZE_BUCKETS,
+)
+
+
+@contextmanager
+def watson_call(service: str, operation: str) -> Iterator[None]:
+    """
+    Time a single IBM Watson API call and track it as in flight while it runs.
+
+    Args:
+        service (str): Watson service name, e.g. "stt", "tts" or "assistant".
+        operation (str): SDK operation name, e.g. "recognize" or "message".
+    """
+    in_flight = WATSON_IN_FLIGHT.labels(service, operation)
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        WATSON_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        WATSON_LATENCY.labels(service, operation).observe(time.perf_counter() - start)
+        in_flight.dec()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """
+    Count a cache lookup so hit rates can be derived per cache.
+
+    Args:
+        cache (str): Name of the cache that was consulted.
+        hit (bool): Whether the lookup was served from the cache.
+    """
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def track_callback(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorate a Dash callback so its duration and concurrency are recorded.
+
+    The callback name is also stored on the Flask request context so the
+    request and response payload sizes can be attributed to it.
+
+    Args:
+        func (Callable[..., Any]): The callback function to wrap.
+
+    Returns:
+        Callable[..., Any]: The wrapped callback.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if flask.has_request_context():
+            flask.g.callback_name = name
+        with CALLBACKS_IN_FLIGHT.labels(name).track_inprogress():
+            with CALLBACK_LATENCY.labels(name).time():
+                return func(*args, **kwargs)
+
+    return wrapper
+
+
+def init_app(server: flask.Flask) -> None:
+    """
+    Register the /metrics endpoint and payload size hooks on the Flask server.
+
+    Args:
+        server (flask.Flask): The Flask server backing the Dash app.
+    """
+
+    @server.after_request
+    def record_payload_sizes(response: flask.Response) -> flask.Response:
+        rule = flask.request.url_rule
+        endpoint = rule.rule if rule is not None else "unmatched"
+        callback = flask.g.get("callback_name", "")
+        if flask.request.content_length is not None:
+            REQUEST_BYTES.labels(endpoint, callback).observe(
+                flask.request.content_length
+            )
+        if response.content_length is not None:
+            RESPONSE_BYTES.labels(endpoint, callback).observe(response.content_length)
+        return response
+
+    @server.route("/metrics")
+    def metrics() -> flask.Response:
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            # Aggregate the metrics written by every worker process
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return flask.Response(
+                generate_latest(registry), mimetype=CONTENT_TYPE_LATEST
+            )
+        return flask.Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
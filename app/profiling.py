@@ -0,0 +1,179 @@
+import os
+import io
+import json
+import time
+import random
+import cProfile
+import pstats
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+import dash
+from plotly.utils import PlotlyJSONEncoder  # Same encoder Dash uses for payloads
+
+# Opt-in switch for callback profiling ("1" or "true" to enable)
+PROFILE_CALLBACKS: bool = os.getenv("PROFILE_CALLBACKS", "").lower() in ("1", "true")
+PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")  # Where profiles are saved
+# Fraction of profiled callbacks that also run under cProfile
+PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_TOP_N: int = int(os.getenv("PROFILE_TOP_N", "25"))  # Hot-path entries kept
+
+
+def payload_size(value: Any) -> int:
+    """
+    Measure the size of a value once serialized to JSON the way Dash sends it.
+
+    Args:
+        value (Any): Callback input, state or output value.
+
+    Returns:
+        int: Size of the serialized value in bytes.
+    """
+    return len(json.dumps(value, cls=PlotlyJSONEncoder).encode("utf-8"))
+
+
+def _flatten(items: List[Any]) -> List[Dict[str, Any]]:
+    """Flatten the nested lists Dash uses for pattern-matching callbacks."""
+    flat = []
+    for item in items:
+        if isinstance(item, list):
+            flat.extend(_flatten(item))
+        else:
+            flat.append(item)
+    return flat
+
+
+def _prop_name(item: Dict[str, Any]) -> str:
+    """Format a callback_context entry as "component-id.property"."""
+    component_id = item["id"]
+    if isinstance(component_id, dict):
+        component_id = json.dumps(component_id, sort_keys=True)
+    return f"{component_id}.{item['property']}"
+
+
+def _payload_sizes(result: Any) -> Dict[str, Dict[str, int]]:
+    """Collect the serialized size of every Input, State and Output."""
+    ctx = dash.callback_context
+    outputs = _flatten(
+        ctx.outputs_list if isinstance(ctx.outputs_list, list) else [ctx.outputs_list]
+    )
+    values = (
+        result if isinstance(result, (list, tuple)) and len(outputs) > 1 else [result]
+    )
+    return {
+        "inputs": {
+            _prop_name(item): payload_size(item.get("value"))
+            for item in _flatten(ctx.inputs_list)
+        },
+        "states": {
+            _prop_name(item): payload_size(item.get("value"))
+            for item in _flatten(ctx.states_list)
+        },
+        "outputs": {
+            _prop_name(item): payload_size(value)
+            for item, value in zip(outputs, values)
+        },
+    }
+
+
+def _hot_paths(profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+    """Summarize the functions with the highest cumulative time."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    entries = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        entries.append(
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "tottime": tottime,
+                "cumtime": cumtime,
+            }
+        )
+    entries.sort(key=lambda entry: entry["cumtime"], reverse=True)
+    return entries[:PROFILE_TOP_N]
+
+
+def _write_summary(
+    name: str,
+    profiler: Optional[cProfile.Profile],
+    wall_time: float,
+    cpu_time: float,
+    result: Any,
+    error: Optional[BaseException],
+) -> None:
+    """Write the JSON summary (and cProfile stats) of one callback trigger."""
+    triggered = dash.callback_context.triggered[0]["prop_id"]
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    base_name = f"{stamp}_{name}_{triggered.replace('.', '-')}"
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+
+    summary = {
+        "callback": name,
+        "triggered": triggered,
+        "wall_time": wall_time,
+        "cpu_time": cpu_time,
+    }
+    if error is None:
+        summary["payload_bytes"] = _payload_sizes(result)
+    else:
+        # PreventUpdate and real failures alike leave no outputs to measure
+        summary["error"] = f"{type(error).__name__}: {error}"
+    if profiler is not None:
+        profile_path = os.path.join(PROFILE_DIR, f"{base_name}.prof")
+        profiler.dump_stats(profile_path)
+        summary["profile"] = profile_path
+        summary["hot_paths"] = _hot_paths(profiler)
+
+    with open(os.path.join(PROFILE_DIR, f"{base_name}.json"), "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+
+
+def profile_callback(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorate a Dash callback so each trigger is profiled to disk when enabled.
+
+    Every call, including one that raises, records wall and thread CPU time
+    and the serialized size of each Input, State and Output in a JSON
+    summary. A sampled subset of calls also
+    runs under cProfile; the raw stats are written next to the summary as a
+    .prof file (viewable with snakeviz or converted to a flame graph).
+
+    Args:
+        func (Callable[..., Any]): The callback function to wrap.
+
+    Returns:
+        Callable[..., Any]: The wrapped callback, or `func` itself when
+        profiling is disabled.
+    """
+    if not PROFILE_CALLBACKS:
+        return func
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = cProfile.Profile() if random.random() < PROFILE_SAMPLE_RATE else None
+        wall_start = time.perf_counter()
+        # Thread CPU time, so work of other requests served by the same process
+        # under a threaded server is not charged to this callback
+        cpu_start = time.thread_time()
+        result, error = None, None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            _write_summary(
+                func.__name__,
+                profiler,
+                time.perf_counter() - wall_start,
+                time.thread_time() - cpu_start,
+                result,
+                error,
+            )
+
+    return wrapper
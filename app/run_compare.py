@@ -0,0 +1,238 @@
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app_utils import parse_latency
+from scoring import word_accuracy
+from server_store import store
+
+# Relative latency change (e.g. 0.2 = 20%) above which a turn is reported
+RUN_COMPARE_LATENCY_TOLERANCE: float = float(
+    os.getenv("RUN_COMPARE_LATENCY_TOLERANCE", "0.2")
+)
+
+# Columns shown in the comparison table
+COMPARE_COLUMNS = [
+    "Path",
+    "Row",
+    "Voice",
+    "Change",
+    "Transcribed Text A",
+    "Transcribed Text B",
+    "Actual Assistant Response A",
+    "Actual Assistant Response B",
+    "Score A",
+    "Score B",
+    "Latency A (ms)",
+    "Latency B (ms)",
+    "Latency Change (ms)",
+]
+
+
+def _namespace(kind: str, workspace: str) -> str:
+    """Key-value namespace holding one workspace's runs or comparisons."""
+    return f"{kind}/{workspace}"
+
+
+def run_names(workspace: str) -> List[str]:
+    """List the names of a workspace's saved runs."""
+    return store.keys(_namespace("runs", workspace))
+
+
+def save_run(workspace: str, name: str, convo_paths: List[str], voice: str) -> int:
+    """
+    Snapshot the current results of every conversation path as a named run.
+
+    Runs are kept per workspace, like the conversation paths they are taken
+    from, so testers saving runs under the same name do not overwrite each
+    other's.
+
+    Args:
+        workspace (str): Workspace of the conversation paths and the run.
+        name (str): Name of the run.
+        convo_paths (List[str]): Conversation paths to include.
+        voice (str): Voice set the results were produced with.
+
+    Returns:
+        int: Number of rows saved.
+    """
+    rows = []
+    for convo_path in convo_paths:
+        for idx, row in enumerate(store.load_path(workspace, convo_path)[0]):
+            rows.append(dict(row, Path=convo_path, Row=idx, Voice=voice or ""))
+    created = time.time()
+    store.set(
+        _namespace("runs", workspace),
+        name,
+        {"created": created, "voice": voice, "rows": rows},
+    )
+    # Kept apart from the rows so callers can check a run's age cheaply
+    store.set(_namespace("run_created", workspace), name, created)
+    return len(rows)
+
+
+def run_created(workspace: str, name: str) -> Optional[float]:
+    """
+    Return when a run was saved, or None if no run has that name.
+
+    Args:
+        workspace (str): Workspace of the run.
+        name (str): Name of the run.
+
+    Returns:
+        Optional[float]: Unix time the run was saved.
+    """
+    return store.get(_namespace("run_created", workspace), name)
+
+
+def _column(rows: List[Dict[str, Any]], indices: np.ndarray, column: str) -> np.ndarray:
+    """Gather one column of the aligned rows into an object array."""
+    return np.array([rows[idx].get(column) or "" for idx in indices], dtype=object)
+
+
+def _total_latency(rows: List[Dict[str, Any]], indices: np.ndarray) -> np.ndarray:
+    """
+    Total latency per row in ms, NaN where none was recorded.
+
+    Each service contributes one stage, so the partial timings of streaming
+    calls are not added on top of their totals: STT counts "stt", else
+    "stt first final", else the first A/B model's time; TTS counts "tts",
+    else "tts total"; the assistant counts "assistant". Cached stages carry
+    no time and are left out.
+    """
+    totals = np.full(len(indices), np.nan)
+    for position, idx in enumerate(indices):
+        latencies = parse_latency(rows[idx].get("Latency", ""))
+        models = [
+            stage
+            for stage in latencies
+            if stage.startswith("stt ") and not stage.startswith("stt first ")
+        ]
+        stages = [
+            next(
+                (
+                    latencies[stage]
+                    for stage in ["stt", "stt first final"] + models
+                    if stage in latencies
+                ),
+                None,
+            ),
+            latencies.get("tts", latencies.get("tts total")),
+            latencies.get("assistant"),
+        ]
+        recorded = [ms for ms in stages if ms is not None]
+        if recorded:
+            totals[position] = sum(recorded)
+    return totals
+
+
+def _index(rows: List[Dict[str, Any]], with_voice: bool) -> Dict[Tuple, int]:
+    """Map each row's alignment key to its position in the run."""
+    return {
+        (row["Path"], row["Row"], row["Voice"] if with_voice else ""): idx
+        for idx, row in enumerate(rows)
+    }
+
+
+def _ms(value: float) -> Optional[int]:
+    """Convert a latency in ms to an int, or None if it was not recorded."""
+    return None if np.isnan(value) else int(value)
+
+
+def _score(row: Dict[str, Any]) -> Optional[float]:
+    """Mean word accuracy of the transcript and the assistant response, in percent."""
+    accuracies = [
+        word_accuracy(row[expected], row[actual])
+        for expected, actual in (
+            ("Expected User Text", "Transcribed Text"),
+            ("Expected Assistant Response", "Actual Assistant Response"),
+        )
+        if row.get(expected) and row.get(actual)
+    ]
+    return round(100 * sum(accuracies) / len(accuracies), 1) if accuracies else None
+
+
+def compare_runs(
+    workspace: str, run_a: str, run_b: str
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Align two stored runs by path, row and voice and report the turns that changed.
+
+    Turns are matched through a dictionary of alignment keys and their text
+    and total latency compared turn by turn; word accuracy is only computed
+    for the turns whose text actually changed.
+
+    Args:
+        workspace (str): Workspace of both runs.
+        run_a (str): Name of the baseline run.
+        run_b (str): Name of the run compared against the baseline.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, int]]: Changed turns (rows of
+        the comparison table) and counts per kind of change.
+    """
+    rows_a = store.get(_namespace("runs", workspace), run_a, {}).get("rows", [])
+    rows_b = store.get(_namespace("runs", workspace), run_b, {}).get("rows", [])
+    index_a = _index(rows_a, with_voice=True)
+    index_b = _index(rows_b, with_voice=True)
+    keys = [key for key in index_a if key in index_b]
+    if not keys:
+        # Runs made with different voice sets are aligned by path and row only
+        index_a = _index(rows_a, with_voice=False)
+        index_b = _index(rows_b, with_voice=False)
+        keys = [key for key in index_a if key in index_b]
+    aligned_a = np.array([index_a[key] for key in keys], dtype=np.int64)
+    aligned_b = np.array([index_b[key] for key in keys], dtype=np.int64)
+
+    text_changed = np.zeros(len(keys), dtype=bool)
+    for column in ("Transcribed Text", "Actual Assistant Response"):
+        text_changed |= _column(rows_a, aligned_a, column) != _column(
+            rows_b, aligned_b, column
+        )
+    latency_a = _total_latency(rows_a, aligned_a)
+    latency_b = _total_latency(rows_b, aligned_b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = (latency_b - latency_a) / latency_a
+    latency_changed = (
+        np.nan_to_num(np.abs(relative), nan=0.0) > RUN_COMPARE_LATENCY_TOLERANCE
+    )
+
+    changes = []
+    summary = {"aligned": len(keys), "regressed": 0, "improved": 0, "changed": 0}
+    for position in np.flatnonzero(text_changed | latency_changed):
+        row_a = rows_a[aligned_a[position]]
+        row_b = rows_b[aligned_b[position]]
+        score_a, score_b = (
+            (_score(row_a), _score(row_b)) if text_changed[position] else (None, None)
+        )
+        delta = latency_b[position] - latency_a[position]
+        if (score_a is not None and score_b is not None and score_b < score_a) or (
+            latency_changed[position] and delta > 0
+        ):
+            change = "regressed"
+        elif (score_a is not None and score_b is not None and score_b > score_a) or (
+            latency_changed[position] and delta < 0
+        ):
+            change = "improved"
+        else:
+            change = "changed"
+        summary[change] += 1
+        changes.append(
+            {
+                "Path": row_b["Path"],
+                "Row": row_b["Row"],
+                "Voice": row_b["Voice"],
+                "Change": change,
+                "Score A": score_a,
+                "Score B": score_b,
+                "Latency A (ms)": _ms(latency_a[position]),
+                "Latency B (ms)": _ms(latency_b[position]),
+                "Latency Change (ms)": _ms(delta),
+            }
+        )
+        for column in ("Transcribed Text", "Actual Assistant Response"):
+            changes[-1][f"{column} A"] = row_a.get(column, "")
+            changes[-1][f"{column} B"] = row_b.get(column, "")
+    summary["only in A"] = len(index_a) - len(keys)
+    summary["only in B"] = len(index_b) - len(keys)
+    return changes, summary
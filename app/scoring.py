@@ -0,0 +1,54 @@
+import re
+from typing import List
+
+# Punctuation is ignored when comparing transcripts and responses
+_PUNCTUATION = re.compile(r"[^\w\s']")
+
+
+def normalize_words(text: str) -> List[str]:
+    """
+    Split text into lower-case words without punctuation.
+
+    Args:
+        text (str): Transcript or response text.
+
+    Returns:
+        List[str]: Normalized words.
+    """
+    return _PUNCTUATION.sub(" ", (text or "").lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Compute the word error rate of a hypothesis against a reference.
+
+    Args:
+        reference (str): Expected text.
+        hypothesis (str): Recognized or returned text.
+
+    Returns:
+        float: Word-level edit distance divided by the reference length.
+    """
+    expected = normalize_words(reference)
+    actual = normalize_words(hypothesis)
+    if not expected:
+        return 0.0 if not actual else 1.0
+    # Single-row Levenshtein distance over words
+    previous = list(range(len(actual) + 1))
+    for i, expected_word in enumerate(expected, 1):
+        current = [i]
+        for j, actual_word in enumerate(actual, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (expected_word != actual_word),
+                )
+            )
+        previous = current
+    return previous[-1] / len(expected)
+
+
+def word_accuracy(reference: str, hypothesis: str) -> float:
+    """Word accuracy (1 - WER, floored at 0) of a hypothesis against a reference."""
+    return max(0.0, 1.0 - word_error_rate(reference, hypothesis))
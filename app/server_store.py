@@ -0,0 +1,758 @@
+import os
+import json
+import mmap
+import time
+import uuid
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from metrics import record_cache_lookup
+
+# SQLite database shared by every worker process in the container
+STATE_DB: str = os.getenv("STATE_DB", os.path.join("uploaded_files", "state.db"))
+# Directory holding the audio clips as raw WAV files, one per store key
+AUDIO_DIR: str = os.getenv("AUDIO_DIR", os.path.join("uploaded_files", "audio"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS paths (
+    workspace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (workspace, name)
+);
+CREATE TABLE IF NOT EXISTS path_rows (
+    workspace TEXT NOT NULL,
+    path TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    row TEXT NOT NULL,
+    recording TEXT,
+    PRIMARY KEY (workspace, path, idx)
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    clip TEXT PRIMARY KEY,
+    canonical TEXT NOT NULL,
+    frames INTEGER NOT NULL,
+    bits BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fingerprints_frames ON fingerprints (frames);
+CREATE TABLE IF NOT EXISTS cache (
+    cache TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires REAL,
+    PRIMARY KEY (cache, key)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    pid INTEGER,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    scope TEXT
+);
+CREATE TABLE IF NOT EXISTS job_rows (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    row TEXT NOT NULL,
+    recording TEXT,
+    inputs TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+class ServerStore:
+    """
+    Server-side state shared between worker processes through SQLite.
+
+    Holds the conversation paths of every workspace row by row, the uploaded
+    voice clips and generated recordings (so the browser only keeps small
+    references in `dcc.Store`), shared caches and the batch job table. The
+    database runs in WAL mode so any worker can read while another writes;
+    each thread of each process gets its own connection.
+    Audio is kept outside the database as raw WAV files and read back through
+    memory maps, so clips are never copied into base64 strings server-side.
+    """
+
+    def __init__(self, path: str = STATE_DB, audio_dir: str = AUDIO_DIR) -> None:
+        self.path = path
+        self.audio_dir = audio_dir
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction, rolling back on error."""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    # Key-value state
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return a JSON value stored under `namespace`/`key`."""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under `namespace`/`key`."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value) VALUES (?, ?, ?)",
+            (namespace, key, json.dumps(value)),
+        )
+
+    def keys(self, namespace: str) -> List[str]:
+        """List the keys stored in a namespace."""
+        rows = self._connection().execute(
+            "SELECT key FROM kv WHERE namespace = ? ORDER BY key", (namespace,)
+        )
+        return [row[0] for row in rows]
+
+    # Conversation paths
+
+    def path_names(self, workspace: str) -> List[str]:
+        """List the conversation paths of a workspace."""
+        rows = self._connection().execute(
+            "SELECT name FROM paths WHERE workspace = ? ORDER BY name", (workspace,)
+        )
+        return [row[0] for row in rows]
+
+    def all_paths(self) -> List[Tuple[str, str]]:
+        """List (workspace, name) of the conversation paths of every workspace."""
+        rows = self._connection().execute(
+            "SELECT workspace, name FROM paths ORDER BY workspace, name"
+        )
+        return [(row[0], row[1]) for row in rows]
+
+    def load_path(
+        self, workspace: str, name: str
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str], int]:
+        """
+        Read the rows of a conversation path.
+
+        Args:
+            workspace (str): Workspace of the path.
+            name (str): Name of the path.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, str], int]: Rows in order,
+            audio keys of the generated recordings by row index, and the
+            path's version (see `update_rows`).
+        """
+        connection = self._connection()
+        # Read rows and version from one snapshot
+        connection.execute("BEGIN")
+        try:
+            version = connection.execute(
+                "SELECT version FROM paths WHERE workspace = ? AND name = ?",
+                (workspace, name),
+            ).fetchone()
+            rows = connection.execute(
+                "SELECT idx, row, recording FROM path_rows "
+                "WHERE workspace = ? AND path = ? ORDER BY idx",
+                (workspace, name),
+            ).fetchall()
+        finally:
+            connection.execute("COMMIT")
+        recordings = {str(idx): recording for idx, _, recording in rows if recording}
+        return (
+            [json.loads(row) for _, row, _ in rows],
+            recordings,
+            version[0] if version else 0,
+        )
+
+    def get_recording(self, workspace: str, name: str, idx: int) -> Optional[str]:
+        """Return the audio key of a row's generated recording, or None."""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT recording FROM path_rows "
+                "WHERE workspace = ? AND path = ? AND idx = ?",
+                (workspace, name, idx),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def _write_path(
+        self,
+        connection: sqlite3.Connection,
+        workspace: str,
+        name: str,
+        rows: List[Dict[str, Any]],
+        recordings: Dict[str, str],
+    ) -> None:
+        """Replace every row of a path within the caller's transaction."""
+        connection.execute(
+            "INSERT INTO paths (workspace, name) VALUES (?, ?) "
+            "ON CONFLICT (workspace, name) DO UPDATE SET version = version + 1",
+            (workspace, name),
+        )
+        connection.execute(
+            "DELETE FROM path_rows WHERE workspace = ? AND path = ?", (workspace, name)
+        )
+        connection.executemany(
+            "INSERT INTO path_rows (workspace, path, idx, row, recording) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (workspace, name, idx, json.dumps(row), recordings.get(str(idx)))
+                for idx, row in enumerate(rows)
+            ],
+        )
+
+    def replace_path(
+        self,
+        workspace: str,
+        name: str,
+        rows: List[Dict[str, Any]],
+        recordings: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Create a conversation path, or replace all of its rows.
+
+        Args:
+            workspace (str): Workspace of the path.
+            name (str): Name of the path.
+            rows (List[Dict[str, Any]]): New rows in order.
+            recordings (Optional[Dict[str, str]]): Recording audio keys by row index.
+        """
+        with self._transaction() as connection:
+            self._write_path(connection, workspace, name, rows, recordings or {})
+
+    def _check_version(
+        self,
+        connection: sqlite3.Connection,
+        workspace: str,
+        name: str,
+        version: Optional[int],
+    ) -> bool:
+        """Whether a path still has the version its rows were read at."""
+        if version is None:
+            return True
+        current = connection.execute(
+            "SELECT version FROM paths WHERE workspace = ? AND name = ?",
+            (workspace, name),
+        ).fetchone()
+        return current is not None and current[0] == version
+
+    def update_rows(
+        self,
+        workspace: str,
+        name: str,
+        changes: Dict[int, Dict[str, Any]],
+        version: Optional[int] = None,
+    ) -> bool:
+        """
+        Merge changed cells into rows of a conversation path.
+
+        Only the given cells are written, so concurrent writers changing
+        different cells of the same rows (e.g. a batch filling in results
+        while the tester edits expected text) do not overwrite each other.
+        Deleting or replacing rows changes the path's version; passing the
+        version the row indices were read at makes the update fail instead of
+        landing on the wrong rows.
+
+        Args:
+            workspace (str): Workspace of the path.
+            name (str): Name of the path.
+            changes (Dict[int, Dict[str, Any]]): Changed cells by row index.
+            version (Optional[int]): Expected path version, or None to skip the check.
+
+        Returns:
+            bool: False if the path version no longer matched and nothing was written.
+        """
+        with self._transaction() as connection:
+            if not self._check_version(connection, workspace, name, version):
+                return False
+            for idx, cells in changes.items():
+                row = connection.execute(
+                    "SELECT row FROM path_rows "
+                    "WHERE workspace = ? AND path = ? AND idx = ?",
+                    (workspace, name, idx),
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE path_rows SET row = ? "
+                        "WHERE workspace = ? AND path = ? AND idx = ?",
+                        (
+                            json.dumps({**json.loads(row[0]), **cells}),
+                            workspace,
+                            name,
+                            idx,
+                        ),
+                    )
+        return True
+
+    def set_recording(
+        self,
+        workspace: str,
+        name: str,
+        idx: int,
+        recording: Optional[str],
+        version: Optional[int] = None,
+    ) -> bool:
+        """Set or clear a row's recording audio key; see `update_rows` for `version`."""
+        with self._transaction() as connection:
+            if not self._check_version(connection, workspace, name, version):
+                return False
+            connection.execute(
+                "UPDATE path_rows SET recording = ? "
+                "WHERE workspace = ? AND path = ? AND idx = ?",
+                (recording, workspace, name, idx),
+            )
+        return True
+
+    def append_row(self, workspace: str, name: str, row: Dict[str, Any]) -> int:
+        """Append a row to a conversation path and return its index."""
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO paths (workspace, name) VALUES (?, ?)",
+                (workspace, name),
+            )
+            idx = connection.execute(
+                "SELECT COALESCE(MAX(idx) + 1, 0) FROM path_rows "
+                "WHERE workspace = ? AND path = ?",
+                (workspace, name),
+            ).fetchone()[0]
+            connection.execute(
+                "INSERT INTO path_rows (workspace, path, idx, row) VALUES (?, ?, ?, ?)",
+                (workspace, name, idx, json.dumps(row)),
+            )
+        return idx
+
+    def delete_rows(
+        self,
+        workspace: str,
+        name: str,
+        indices: List[int],
+        version: Optional[int] = None,
+    ) -> bool:
+        """
+        Delete rows of a conversation path; the rows below move up.
+
+        Args:
+            workspace (str): Workspace of the path.
+            name (str): Name of the path.
+            indices (List[int]): Indices of the rows to delete.
+            version (Optional[int]): Expected path version, or None to skip the check.
+
+        Returns:
+            bool: False if the path version no longer matched and nothing was deleted.
+        """
+        with self._transaction() as connection:
+            if not self._check_version(connection, workspace, name, version):
+                return False
+            connection.executemany(
+                "DELETE FROM path_rows WHERE workspace = ? AND path = ? AND idx = ?",
+                [(workspace, name, idx) for idx in indices],
+            )
+            remaining = connection.execute(
+                "SELECT idx FROM path_rows WHERE workspace = ? AND path = ? "
+                "ORDER BY idx",
+                (workspace, name),
+            ).fetchall()
+            # Renumber through negative indices so no two rows share one in between
+            for position, (idx,) in enumerate(remaining):
+                connection.execute(
+                    "UPDATE path_rows SET idx = ? "
+                    "WHERE workspace = ? AND path = ? AND idx = ?",
+                    (-1 - position, workspace, name, idx),
+                )
+            connection.execute(
+                "UPDATE path_rows SET idx = -1 - idx WHERE workspace = ? AND path = ?",
+                (workspace, name),
+            )
+            connection.execute(
+                "UPDATE paths SET version = version + 1 WHERE workspace = ? AND name = ?",
+                (workspace, name),
+            )
+        return True
+
+    # Audio clips
+
+    def _audio_path(self, key: str) -> str:
+        """Return the file holding the clip stored under `key`."""
+        os.makedirs(self.audio_dir, exist_ok=True)
+        return os.path.join(
+            self.audio_dir, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".wav"
+        )
+
+    def put_audio(self, key: str, audio_data: Union[bytes, memoryview]) -> str:
+        """
+        Store a raw audio clip.
+
+        The file is written under a temporary name and renamed into place, so
+        other workers never read a partially written clip.
+
+        Args:
+            key (str): Reference kept in the browser-side stores.
+            audio_data (Union[bytes, memoryview]): WAV file contents.
+
+        Returns:
+            str: The key the clip was stored under.
+        """
+        path = self._audio_path(key)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as audio_file:
+            audio_file.write(audio_data)
+        os.replace(temporary_path, path)
+        return key
+
+    def get_audio(self, key: str) -> Optional[memoryview]:
+        """
+        Return the audio clip stored under `key`.
+
+        Args:
+            key (str): Reference kept in the browser-side stores.
+
+        Returns:
+            Optional[memoryview]: Read-only view of the memory-mapped WAV file,
+            or None if no clip is stored under `key`.
+        """
+        try:
+            with open(self._audio_path(key), "rb") as audio_file:
+                if os.fstat(audio_file.fileno()).st_size == 0:
+                    return None
+                # The mapping outlives the file object. Clips are never rewritten
+                # in place, only replaced by renaming a new file over them or
+                # deleted, so the mapped pages stay valid for as long as it is used
+                return memoryview(
+                    mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+        except FileNotFoundError:
+            return None
+
+    def start_audio_stream(self, key: str) -> str:
+        """
+        Start receiving an audio clip for `key` chunk by chunk.
+
+        Chunks go to a temporary file that `finish_audio_stream` renames into
+        place, as `put_audio` does, so readers holding a memory map of the
+        clip stored under `key` never see it change underneath them.
+
+        Args:
+            key (str): Reference kept in the browser-side stores.
+
+        Returns:
+            str: Handle of the stream, passed to the other stream methods.
+        """
+        stream = f"{self._audio_path(key)}.{uuid.uuid4().hex}.tmp"
+        open(stream, "wb").close()
+        return stream
+
+    def append_audio(self, stream: str, chunk: Union[bytes, memoryview]) -> None:
+        """
+        Append one raw chunk to a streamed audio clip.
+
+        Args:
+            stream (str): Handle returned by `start_audio_stream`.
+            chunk (Union[bytes, memoryview]): Raw audio bytes.
+        """
+        with open(stream, "ab") as audio_file:
+            audio_file.write(chunk)
+
+    def patch_audio(self, stream: str, offset: int, data: bytes) -> None:
+        """
+        Overwrite part of a streamed clip, e.g. to fix its WAV header.
+
+        Args:
+            stream (str): Handle returned by `start_audio_stream`.
+            offset (int): Byte offset to write at.
+            data (bytes): Replacement bytes.
+        """
+        with open(stream, "r+b") as audio_file:
+            audio_file.seek(offset)
+            audio_file.write(data)
+
+    def finish_audio_stream(self, stream: str, key: str) -> str:
+        """
+        Store a completely streamed clip under `key`, replacing any earlier clip.
+
+        Args:
+            stream (str): Handle returned by `start_audio_stream`.
+            key (str): Key passed to `start_audio_stream`.
+
+        Returns:
+            str: The key the clip was stored under.
+        """
+        os.replace(stream, self._audio_path(key))
+        return key
+
+    def discard_audio_stream(self, stream: str) -> None:
+        """
+        Drop a streamed clip that will not be finished.
+
+        Args:
+            stream (str): Handle returned by `start_audio_stream`.
+        """
+        try:
+            os.remove(stream)
+        except FileNotFoundError:
+            pass
+
+    def delete_audio(self, key: str) -> None:
+        """
+        Remove the clip stored under `key`, if any.
+
+        Args:
+            key (str): Key of the stored clip.
+        """
+        try:
+            os.remove(self._audio_path(key))
+        except FileNotFoundError:
+            pass
+
+    # Clip deduplication index
+
+    def add_fingerprint(
+        self, clip: str, canonical: str, frames: int, bits: bytes
+    ) -> None:
+        """
+        Index a stored clip by its spectral fingerprint.
+
+        Args:
+            clip (str): Audio key of the clip.
+            canonical (str): Audio key of the first take the clip is grouped with,
+                or the clip itself.
+            frames (int): Number of fingerprint frames.
+            bits (bytes): Packed fingerprint bits.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO fingerprints (clip, canonical, frames, bits) "
+            "VALUES (?, ?, ?, ?)",
+            (clip, canonical, frames, sqlite3.Binary(bits)),
+        )
+
+    def fingerprint_candidates(
+        self, min_frames: int, max_frames: int
+    ) -> List[Tuple[str, int, bytes]]:
+        """Return (canonical, frames, bits) of canonical clips of similar length."""
+        rows = self._connection().execute(
+            "SELECT canonical, frames, bits FROM fingerprints "
+            "WHERE frames BETWEEN ? AND ? AND clip = canonical",
+            (min_frames, max_frames),
+        )
+        return [(row[0], row[1], bytes(row[2])) for row in rows]
+
+    def canonical_clip(self, clip: str) -> Optional[str]:
+        """Return the first take `clip` is grouped with, or None if not indexed."""
+        row = (
+            self._connection()
+            .execute("SELECT canonical FROM fingerprints WHERE clip = ?", (clip,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    # Shared caches
+
+    def cache_get(self, cache: str, key: str) -> Optional[Any]:
+        """
+        Look up a cached value and record the hit or miss.
+
+        Args:
+            cache (str): Cache name.
+            key (str): Cache key.
+
+        Returns:
+            Optional[Any]: The cached value, or None if missing or expired.
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value, expires FROM cache WHERE cache = ? AND key = ?",
+                (cache, key),
+            )
+            .fetchone()
+        )
+        hit = row is not None and (row[1] is None or row[1] > time.time())
+        record_cache_lookup(cache, hit)
+        return json.loads(row[0]) if hit else None
+
+    def cache_set(
+        self, cache: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        """
+        Store a value in a shared cache.
+
+        Args:
+            cache (str): Cache name.
+            key (str): Cache key.
+            value (Any): JSON-serializable value to cache.
+            ttl (Optional[float]): Seconds until the entry expires, or None to keep it.
+        """
+        expires = time.time() + ttl if ttl is not None else None
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (cache, key, value, expires) VALUES (?, ?, ?, ?)",
+            (cache, key, json.dumps(value), expires),
+        )
+
+    # Batch jobs
+
+    def create_job(self, kind: str, total: int, scope: Optional[str] = None) -> str:
+        """
+        Register a running batch job.
+
+        Args:
+            kind (str): What the job does, e.g. the triggering button id.
+            total (int): Number of rows the job will process.
+            scope (Optional[str]): What the job runs on, e.g. the conversation path.
+
+        Returns:
+            str: The new job ID.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connection().execute(
+            "INSERT INTO jobs (id, kind, status, total, pid, created, updated, scope) "
+            "VALUES (?, ?, 'running', ?, ?, ?, ?, ?)",
+            (job_id, kind, total, os.getpid(), now, now, scope),
+        )
+        return job_id
+
+    def update_job(
+        self,
+        job_id: str,
+        progress: Optional[int] = None,
+        status: Optional[str] = None,
+    ) -> None:
+        """Update the progress and/or status of a batch job; progress never decreases."""
+        self._connection().execute(
+            "UPDATE jobs SET progress = MAX(progress, COALESCE(?, progress)), "
+            "status = COALESCE(?, status), updated = ? WHERE id = ?",
+            (progress, status, time.time(), job_id),
+        )
+
+    def resumable_job(
+        self, kind: str, scope: str, stale_after: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the latest unfinished job of a kind and scope, if it can be resumed.
+
+        A job can be resumed if it ended without completing every row, or if
+        it is still marked as running but has not been updated for
+        `stale_after` seconds (its worker died or was killed).
+
+        Args:
+            kind (str): Kind of the job.
+            scope (str): Scope of the job.
+            stale_after (float): Seconds without progress after which a running
+                job is considered abandoned.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job record, or None.
+        """
+        cursor = self._connection().execute(
+            "SELECT * FROM jobs WHERE kind = ? AND scope = ? "
+            "ORDER BY created DESC LIMIT 1",
+            (kind, scope),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        job = dict(zip([column[0] for column in cursor.description], row))
+        if job["status"] == "done":
+            return None
+        if job["status"] == "running" and job["updated"] > time.time() - stale_after:
+            return None
+        return job
+
+    def checkpoint_row(
+        self,
+        job_id: str,
+        idx: int,
+        row: Dict[str, Any],
+        recording: Optional[str] = None,
+        inputs: Optional[str] = None,
+    ) -> None:
+        """
+        Save the result of one finished row of a batch job.
+
+        Args:
+            job_id (str): ID of the job.
+            idx (int): Index of the row in the conversation path.
+            row (Dict[str, Any]): The row after processing.
+            recording (Optional[str]): Audio key of the row's generated recording.
+            inputs (Optional[str]): Hash of the inputs and settings the row was
+                processed with; a resumed job only restores matching rows.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO job_rows (job_id, idx, row, recording, inputs) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (job_id, idx, json.dumps(row), recording, inputs),
+        )
+
+    def job_checkpoints(
+        self, job_id: str
+    ) -> Dict[int, Tuple[Dict[str, Any], Optional[str], Optional[str]]]:
+        """Return the saved rows of a batch job, their recordings and input hashes by row index."""
+        rows = self._connection().execute(
+            "SELECT idx, row, recording, inputs FROM job_rows WHERE job_id = ?",
+            (job_id,),
+        )
+        return {
+            idx: (json.loads(row), recording, inputs)
+            for idx, row, recording, inputs in rows
+        }
+
+    def prune_checkpoints(
+        self, kind: str, scope: str, keep: Optional[str], stale_after: float
+    ) -> None:
+        """
+        Delete the checkpoints of superseded jobs of a kind and scope.
+
+        Checkpoints of jobs that are still running (updated within
+        `stale_after` seconds, e.g. in another worker) are kept.
+
+        Args:
+            kind (str): Kind of the jobs.
+            scope (str): Scope of the jobs.
+            keep (Optional[str]): Job whose checkpoints are kept, e.g. the current one.
+            stale_after (float): Seconds without progress after which a running
+                job is considered abandoned.
+        """
+        self._connection().execute(
+            "DELETE FROM job_rows WHERE job_id IN (SELECT id FROM jobs "
+            "WHERE kind = ? AND scope = ? AND id IS NOT ? "
+            "AND (status != 'running' OR updated < ?))",
+            (kind, scope, keep, time.time() - stale_after),
+        )
+
+
+# Process-wide store; connections are opened lazily per thread and per process
+store = ServerStore()
@@ -0,0 +1,207 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Deque, List, Optional, Tuple
+from voice_utils import SessionExpiredError, create_session_id
+
+if TYPE_CHECKING:
+    from watson_async import AsyncWatsonClient
+
+# Idle seconds after which Watson Assistant expires a session (depends on the plan)
+ASSISTANT_SESSION_TIMEOUT: float = float(os.getenv("ASSISTANT_SESSION_TIMEOUT", "300"))
+# Number of fresh sessions kept ready ahead of demand
+ASSISTANT_SESSION_POOL_SIZE: int = int(os.getenv("ASSISTANT_SESSION_POOL_SIZE", "2"))
+# Treat sessions as expired this many seconds early to avoid racing the server
+SESSION_EXPIRY_MARGIN: float = 15.0
+# Seconds between failed session pre-creation attempts, doubling up to the maximum
+SESSION_RETRY_MIN: float = 5.0
+SESSION_RETRY_MAX: float = 300.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AssistantSession:
+    """A Watson Assistant session and the user turns sent on it so far."""
+
+    session_id: str
+    last_used: float = field(default_factory=time.monotonic)
+    history: List[str] = field(default_factory=list)
+
+    def is_expired(self, idle_timeout: float) -> bool:
+        """Whether the session has been idle long enough to have expired."""
+        return time.monotonic() - self.last_used > idle_timeout - SESSION_EXPIRY_MARGIN
+
+
+class SessionPool:
+    """
+    Pool of pre-created Watson Assistant sessions.
+
+    Sessions are created by a background thread ahead of demand, so acquiring
+    one for a conversation path does not pay the `create_session` round trip.
+    The thread starts on first use and stops once the pool has not been used
+    for the assistant's inactivity timeout, so an idle process does not keep
+    creating sessions. Idle sessions that reach that timeout are discarded.
+    When a session in use expires mid-path, `query_async` replaces it and replays
+    the earlier user turns so the conversation context is restored.
+    """
+
+    def __init__(
+        self,
+        size: int = ASSISTANT_SESSION_POOL_SIZE,
+        idle_timeout: float = ASSISTANT_SESSION_TIMEOUT,
+    ) -> None:
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._idle: Deque[AssistantSession] = deque()
+        self._target = size
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._last_demand = time.monotonic()
+
+    def _start(self) -> None:
+        """Record demand and start the background refill thread if it is not running."""
+        with self._condition:
+            self._last_demand = time.monotonic()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._refill, daemon=True)
+                self._worker.start()
+
+    def _refill(self) -> None:
+        """Keep the pool topped up with live sessions while it is in use."""
+        retry = SESSION_RETRY_MIN
+        while True:
+            with self._condition:
+                while self._idle and self._idle[0].is_expired(self.idle_timeout):
+                    self._idle.popleft()
+                if time.monotonic() - self._last_demand > self.idle_timeout:
+                    # Unused for a while; the next acquire_async or prewarm restarts it
+                    self._worker = None
+                    return
+                missing = self._target - len(self._idle)
+                if missing <= 0:
+                    # Wake up again in time to replace the oldest idle session
+                    self._condition.wait(timeout=self.idle_timeout / 2)
+                    continue
+            try:
+                session = AssistantSession(create_session_id())
+            except Exception as error:
+                logger.warning(
+                    "Session pre-creation failed, retrying in %g s: %s", retry, error
+                )
+                time.sleep(retry)
+                retry = min(2 * retry, SESSION_RETRY_MAX)
+                continue
+            retry = SESSION_RETRY_MIN
+            with self._condition:
+                self._idle.append(session)
+                self._condition.notify_all()
+
+    def prewarm(self, count: int) -> None:
+        """
+        Ask the pool to hold at least `count` ready sessions, e.g. before a parallel run.
+
+        Args:
+            count (int): Number of sessions needed at the same time.
+        """
+        with self._condition:
+            self._target = max(self.size, count)
+            self._condition.notify_all()
+        self._start()
+
+    def _take_idle(self) -> Optional[AssistantSession]:
+        """Take a live session from the pool without waiting, or None if empty."""
+        self._start()
+        with self._condition:
+            while self._idle:
+                session = self._idle.popleft()
+                if not session.is_expired(self.idle_timeout):
+                    self._condition.notify_all()
+                    return session
+            self._condition.notify_all()
+        return None
+
+    async def acquire_async(self, client: "AsyncWatsonClient") -> AssistantSession:
+        """
+        Take a ready session from the pool, creating one only if none is available.
+
+        Args:
+            client (AsyncWatsonClient): Client of the running event loop.
+
+        Returns:
+            AssistantSession: A session that has not been used yet.
+        """
+        return self._take_idle() or AssistantSession(await client.create_session())
+
+    async def resume_async(
+        self, client: "AsyncWatsonClient", history: List[str]
+    ) -> AssistantSession:
+        """
+        Acquire a session and replay earlier user turns, e.g. to resume a path.
+
+        Args:
+            client (AsyncWatsonClient): Client of the running event loop.
+            history (List[str]): User turns to send before the session is used.
+
+        Returns:
+            AssistantSession: Session holding the conversation context of `history`.
+        """
+        session = await self.acquire_async(client)
+        for text in history:
+            await client.message(text, session.session_id)
+        session.history = list(history)
+        return session
+
+    async def _replace_async(
+        self, session: AssistantSession, client: "AsyncWatsonClient"
+    ) -> None:
+        """Swap an expired session for a new one and replay its earlier turns."""
+        fresh = await self.acquire_async(client)
+        for text in session.history:
+            await client.message(text, fresh.session_id)
+        session.session_id = fresh.session_id
+
+    async def query_async(
+        self, session: AssistantSession, text: str, client: "AsyncWatsonClient"
+    ) -> Tuple[str, float]:
+        """
+        Send one user turn through an async client, recovering from session expiry.
+
+        Args:
+            session (AssistantSession): Session acquired for this conversation path.
+            text (str): Input text to send to Watson Assistant.
+            client (AsyncWatsonClient): Client of the running event loop.
+
+        Returns:
+            Tuple[str, float]: Assistant response and the latency in seconds of
+            the message call itself, excluding any session recreation.
+        """
+        if session.is_expired(self.idle_timeout):
+            await self._replace_async(session, client)
+        try:
+            start = time.perf_counter()
+            response = await client.message(text, session.session_id)
+        except SessionExpiredError:
+            await self._replace_async(session, client)
+            start = time.perf_counter()
+            response = await client.message(text, session.session_id)
+        latency = time.perf_counter() - start
+        session.history.append(text)
+        session.last_used = time.monotonic()
+        return response, latency
+
+
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """Return this process's session pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SessionPool()
+        return _pool
@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Filter operators emitted by DataTable with filter_action="custom", longest match first
+FILTER_OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+
+def split_filter_part(filter_part: str) -> Tuple[Optional[str], Optional[str], Any]:
+    """
+    Split one DataTable filter expression into column, operator and value.
+
+    Args:
+        filter_part (str): Expression such as "{Latency} contains 200".
+
+    Returns:
+        Tuple[Optional[str], Optional[str], Any]: Column ID, operator name and
+        value, or (None, None, None) if the expression is not understood.
+    """
+    # Parse positionally, so an operator word inside the column name or the
+    # value (e.g. "ne " in "phone ") is never mistaken for the operator
+    filter_part = filter_part.strip()
+    if not filter_part.startswith("{") or "}" not in filter_part:
+        return None, None, None
+    name, _, rest = filter_part[1:].partition("}")
+    rest = rest.lstrip()
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if rest.startswith(operator):
+                value_part = rest[len(operator) :].strip()
+                first = value_part[:1]
+                if first and first == value_part[-1] and first in ("'", '"', "`"):
+                    value = value_part[1:-1].replace("\\" + first, first)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+
+def _matches(cell: Any, operator: str, value: Any) -> bool:
+    """Evaluate one filter expression against a cell value."""
+    if operator in ("ge", "le", "lt", "gt"):
+        try:
+            number = float(cell)
+        except (TypeError, ValueError):
+            return False
+        return {
+            "ge": number >= value,
+            "le": number <= value,
+            "lt": number < value,
+            "gt": number > value,
+        }[operator]
+    text = "" if cell is None else str(cell)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if operator == "eq":
+        return text == str(value)
+    if operator == "ne":
+        return text != str(value)
+    if operator == "contains":
+        return str(value).lower() in text.lower()
+    if operator == "datestartswith":
+        return text.startswith(str(value))
+    return True
+
+
+def _sort_key(cell: Any) -> Tuple[int, float, str]:
+    """Order numbers numerically and before text; empty cells sort as empty text."""
+    if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+        return 0, cell, ""
+    return 1, 0.0, str(cell or "")
+
+
+def query_rows(
+    rows: List[Dict[str, Any]],
+    filter_query: Optional[str],
+    sort_by: Optional[List[Dict[str, str]]],
+) -> List[int]:
+    """
+    Filter and sort rows server-side.
+
+    Args:
+        rows (List[Dict[str, Any]]): Every row of the conversation path.
+        filter_query (Optional[str]): DataTable filter query, parts joined by " && ".
+        sort_by (Optional[List[Dict[str, str]]]): DataTable sort specification.
+
+    Returns:
+        List[int]: Indices into `rows` of the matching rows, in display order.
+    """
+    indices = list(range(len(rows)))
+    for filter_part in (filter_query or "").split(" && "):
+        column, operator, value = split_filter_part(filter_part)
+        if column is not None:
+            indices = [
+                idx
+                for idx in indices
+                if _matches(rows[idx].get(column), operator, value)
+            ]
+    # Apply the sort keys in reverse so the first key takes precedence
+    for sort in reversed(sort_by or []):
+        column = sort["column_id"]
+        indices.sort(
+            key=lambda idx: _sort_key(rows[idx].get(column)),
+            reverse=sort["direction"] == "desc",
+        )
+    return indices
+
+
+def page_rows(
+    rows: List[Dict[str, Any]],
+    indices: List[int],
+    page_current: Optional[int],
+    page_size: int,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Cut one page out of the filtered and sorted rows.
+
+    Each returned row carries an "id" field holding its index in the full
+    path, which DataTable reports back as `row_id` for edits and clicks.
+
+    Args:
+        rows (List[Dict[str, Any]]): Every row of the conversation path.
+        indices (List[int]): Row indices in display order, from `query_rows`.
+        page_current (Optional[int]): Zero-based page requested by the table.
+        page_size (int): Rows per page.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: Rows of the page and the page count.
+    """
+    page_count = max(1, -(-len(indices) // page_size))
+    page = min(page_current or 0, page_count - 1)
+    start = page * page_size
+    return [
+        dict(rows[idx], id=idx) for idx in indices[start : start + page_size]
+    ], page_count
@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from voice_utils import synthesize_speech_cached
+
+# Concurrent synthesis requests per generation run (the rate limiter still applies)
+VOICE_GEN_WORKERS: int = int(os.getenv("VOICE_GEN_WORKERS", "8"))
+
+
+def voice_set_name(voice: str) -> str:
+    """Name of the voice set generated with a TTS voice."""
+    return f"tts_{voice}"
+
+
+def recording_name(idx: int) -> str:
+    """File name given to the synthesized recording of a table row."""
+    return f"row_{idx:04d}.wav"
+
+
+def generate_voice_sets(
+    texts: List[str], voices: List[str]
+) -> Tuple[Dict[str, Dict[str, str]], List[Tuple[str, int]]]:
+    """
+    Synthesize user utterances with several TTS voices in parallel.
+
+    Each voice produces one voice set holding a recording per non-empty text,
+    named after the row it belongs to so the same table works with every set.
+    A failed synthesis leaves its row out of that voice set instead of
+    aborting the rest.
+
+    Args:
+        texts (List[str]): "Expected User Text" of each table row.
+        voices (List[str]): Text to speech voices to synthesize with.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, str]], List[Tuple[str, int]]]:
+            - Dict[str, Dict[str, str]]: New voice store entries mapping voice
+              set name to recording file name and server-side audio key.
+            - List[Tuple[str, int]]: Voice and row index of each skipped row.
+    """
+    tasks: List[Tuple[str, int, str]] = [
+        (voice, idx, text) for voice in voices for idx, text in enumerate(texts) if text
+    ]
+    voice_sets: Dict[str, Dict[str, str]] = {
+        voice_set_name(voice): {} for voice in voices
+    }
+    skipped: List[Tuple[str, int]] = []
+
+    def synthesize(task: Tuple[str, int, str]) -> Optional[str]:
+        voice, idx, text = task
+        try:
+            return synthesize_speech_cached(text, voice)
+        except Exception as error:
+            print(f"Skipping row {idx + 1} for {voice}: {error}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=VOICE_GEN_WORKERS) as executor:
+        audio_keys = executor.map(synthesize, tasks)
+        for (voice, idx, _), audio_key in zip(tasks, audio_keys):
+            if audio_key is None:
+                skipped.append((voice, idx))
+            else:
+                voice_sets[voice_set_name(voice)][recording_name(idx)] = audio_key
+    return voice_sets, skipped
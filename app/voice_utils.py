@@ -1,18 +1,34 @@
 import os
-import base64
 import io
-from typing import List
+import time
+import wave
+import queue
+import struct
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from pydub import AudioSegment  # Library for manipulating audio files
 from ibm_watson import (
     AssistantV2,
     SpeechToTextV1,
     TextToSpeechV1,
 )  # IBM Watson services for assistant, speech-to-text, and text-to-speech
+from ibm_watson.websocket import (
+    AudioSource,
+    RecognizeCallback,
+    SynthesizeCallback,
+)  # Streaming recognition over WebSocket
+import websocket  # WebSocket client used by the SDK's streaming calls
 from ibm_cloud_sdk_core.authenticators import (
+    Authenticator,
     IAMAuthenticator,
+    NoAuthAuthenticator,
 )  # Authenticator for IBM Cloud services
 from dotenv import load_dotenv  # Library to load environment variables from a .env file
 import urllib3  # Library for handling HTTP requests
+from metrics import watson_call  # Latency and in-flight tracking for Watson calls
+from server_store import store  # Server-side state shared between worker processes
 
 # Disable SSL warnings for insecure connections
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -33,74 +49,297 @@ TTS_URL: str = os.getenv("TTS_URL")  # URL for Text to Speech service
 TTS_MODEL: str = os.getenv("TTS_MODEL")  # Text to Speech model
 STT_MODEL: str = os.getenv("STT_MODEL")  # Speech to Text model
 
-
-def transcribe_audio(encoded_audio: str) -> str:
+# Seconds before an unanswered Watson request is abandoned
+WATSON_TIMEOUT: float = float(os.getenv("WATSON_TIMEOUT", "30"))
+# The SDK's WebSocket streams ignore set_http_config, so bound their
+# connection and reads through the client library's default socket timeout
+websocket.setdefaulttimeout(WATSON_TIMEOUT)
+
+STT_MODE: str = os.getenv("STT_MODE", "http")  # "http" or "stream" (WebSocket)
+# Optional A/B list of "model" or "model:customization_id" entries, comma separated
+STT_MODELS: str = os.getenv("STT_MODELS", "")
+# Reuse transcriptions of identical clips ("1"); off by default so every run measures STT
+STT_CACHE: bool = os.getenv("STT_CACHE", "0") == "1"
+# "realtime" paces streamed audio at playback speed, "fast" sends it as fast as possible
+STT_STREAM_PACING: str = os.getenv("STT_STREAM_PACING", "realtime")
+STT_STREAM_CHUNK_MS: int = int(
+    os.getenv("STT_STREAM_CHUNK_MS", "100")
+)  # Audio per chunk
+# Optional ws:// or wss:// base URL for streaming, e.g. a local stand-in server
+STT_WS_URL: Optional[str] = os.getenv("STT_WS_URL")
+
+TTS_MODE: str = os.getenv("TTS_MODE", "http")  # "http" or "stream" (WebSocket)
+TTS_RATE_LIMIT: float = float(os.getenv("TTS_RATE_LIMIT", "5"))  # Requests per second
+# Optional ws:// or wss:// base URL for streaming, e.g. a local stand-in server
+TTS_WS_URL: Optional[str] = os.getenv("TTS_WS_URL")
+
+# Raw WAV file contents: bytes, or a memoryview of a memory-mapped clip
+AudioData = Union[bytes, memoryview]
+# Enough of a WAV file to parse its header without copying the audio
+WAV_HEADER_BYTES = 4096
+
+
+class RateLimiter:
+    """Token bucket limiting how often a Watson service is called from this process."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Shared by every caller of synthesize_speech_cached in this process
+tts_rate_limiter = RateLimiter(TTS_RATE_LIMIT, burst=max(1, int(TTS_RATE_LIMIT)))
+
+
+def _authenticator(api_key: Optional[str]) -> Authenticator:
+    """Return an IAM authenticator, or no authentication when no key is configured."""
+    if not api_key:
+        # Local stand-in services do not check credentials
+        return NoAuthAuthenticator()
+    return IAMAuthenticator(api_key)
+
+
+class SessionExpiredError(Exception):
+    """Raised when Watson Assistant no longer recognizes a session ID."""
+
+
+class StreamError(Exception):
+    """Raised when a Watson WebSocket stream reports an error."""
+
+
+def parse_stt_models(spec: str = STT_MODELS) -> List[Tuple[str, Optional[str]]]:
     """
-    Transcribe audio from a base64 encoded string using IBM Watson Speech to Text.
+    Parse the STT_MODELS setting.
 
     Args:
-        encoded_audio (str): Base64 encoded audio data.
+        spec (str): Comma separated "model" or "model:customization_id" entries.
 
     Returns:
-        str: Transcribed text from the audio.
+        List[Tuple[str, Optional[str]]]: Model and optional customization ID pairs.
     """
-    # Create an authenticator object for Speech to Text using the API key
-    stt_authenticator = IAMAuthenticator(STT_API_KEY)
+    models = []
+    for entry in spec.split(","):
+        model, _, customization_id = entry.strip().partition(":")
+        if model:
+            models.append((model, customization_id or None))
+    return models
 
-    # Instantiate the SpeechToTextV1 object with the authenticator
-    speech_to_text = SpeechToTextV1(authenticator=stt_authenticator)
 
-    # Set the service URL for Speech to Text
-    speech_to_text.set_service_url(STT_URL)
-    speech_to_text.set_disable_ssl_verification(True)
+def stt_model_label(model: str, customization_id: Optional[str] = None) -> str:
+    """Label identifying a model and customization in column names and caches."""
+    return f"{model}:{customization_id}" if customization_id else model
+
 
-    # Decode the base64 encoded audio data
-    audio_data = base64.b64decode(encoded_audio)
-    # Open the audio data in binary mode and pass it to the Speech to Text service
-    with io.BytesIO(audio_data) as audio_file:
+def _stt_client(url: Optional[str]) -> SpeechToTextV1:
+    """Create a Speech to Text client for the given service URL."""
+    speech_to_text = SpeechToTextV1(authenticator=_authenticator(STT_API_KEY))
+    speech_to_text.set_service_url(url)
+    speech_to_text.set_disable_ssl_verification(True)
+    speech_to_text.set_http_config({"timeout": WATSON_TIMEOUT})
+    return speech_to_text
+
+
+def _recognize(
+    speech_to_text: SpeechToTextV1,
+    audio_data: AudioData,
+    model: Optional[str],
+    customization_id: Optional[str] = None,
+) -> str:
+    """Transcribe decoded WAV audio with one model over HTTP."""
+    with io.BytesIO(audio_data) as audio_file, watson_call("stt", "recognize"):
         stt_result = speech_to_text.recognize(
             audio=audio_file,
             content_type="audio/wav",
             smart_formatting=True,
-            model=STT_MODEL,
+            model=model,
+            language_customization_id=customization_id,
         ).get_result()
-    # Extract and return the transcript from the Speech to Text service response
+    return stt_transcript(stt_result)
+
+
+def stt_transcript(stt_result: Dict) -> str:
+    """Extract the transcript from a Speech to Text recognition result."""
     try:
-        transcript = stt_result["results"][0]["alternatives"][0]["transcript"]
+        return stt_result["results"][0]["alternatives"][0]["transcript"]
     except (IndexError, KeyError):
         print(stt_result)
         return "Transcription failed"
-    return transcript
 
 
-def query_assistant(text: str, session_id: str) -> str:
+class _StreamingRecognizeCallback(RecognizeCallback):
+    """Collect final transcripts and result timings from a WebSocket recognition."""
+
+    def __init__(self, feed_audio: threading.Thread) -> None:
+        super().__init__()
+        self.feed_audio = feed_audio
+        self.start: Optional[float] = None
+        self.first_interim: Optional[float] = None
+        self.first_final: Optional[float] = None
+        self.transcripts: List[str] = []
+        self.error: Optional[str] = None
+
+    def on_listening(self) -> None:
+        # The SDK sends queued audio only once the service has answered the start
+        # message, so both pacing and the result timings begin here rather than
+        # at connection time, excluding the WebSocket and "listening" handshake
+        self.start = time.perf_counter()
+        self.feed_audio.start()
+
+    def on_data(self, data: Dict) -> None:
+        elapsed = time.perf_counter() - self.start
+        for result in data.get("results", []):
+            if self.first_interim is None:
+                self.first_interim = elapsed
+            if result.get("final"):
+                if self.first_final is None:
+                    self.first_final = elapsed
+                self.transcripts.append(result["alternatives"][0]["transcript"])
+
+    def on_error(self, error: str) -> None:
+        self.error = error
+
+    def on_inactivity_timeout(self, error: str) -> None:
+        self.error = error
+
+
+def transcribe_audio_stream(
+    audio_data: AudioData, pacing: str = STT_STREAM_PACING
+) -> Tuple[str, Dict[str, float]]:
     """
-    Query Watson Assistant with text input and return the response.
+    Transcribe audio by streaming it to IBM Watson Speech to Text over WebSocket.
 
     Args:
-        text (str): Input text to send to Watson Assistant.
-        session_id (str): Session ID for the Watson Assistant interaction.
+        audio_data (AudioData): WAV file contents.
+        pacing (str): "realtime" to send each chunk at playback speed, or
+            "fast" to send the audio as fast as possible.
 
     Returns:
-        str: Response text from Watson Assistant.
-    """
-    # Create an authenticator object for Watson Assistant using the API key
-    assistant_authenticator = IAMAuthenticator(ASSISTANT_API_KEY)
+        Tuple[str, Dict[str, float]]: Transcribed text and timings in seconds
+        since the service started listening ("first interim", "first final", "total").
 
-    # Instantiate the AssistantV2 object with the authenticator and version information
-    assistant = AssistantV2(version="2023-06-15", authenticator=assistant_authenticator)
+    Raises:
+        StreamError: If the service or the connection reported an error.
+    """
+    # Streaming may target a separate ws:// URL
+    return _recognize_stream(
+        _stt_client(STT_WS_URL or STT_URL),
+        audio_data,
+        pacing,
+        STT_MODEL,
+    )
+
+
+def _recognize_stream(
+    speech_to_text: SpeechToTextV1,
+    audio_data: AudioData,
+    pacing: str,
+    model: Optional[str],
+    customization_id: Optional[str] = None,
+) -> Tuple[str, Dict[str, float]]:
+    """Stream decoded WAV audio to one model over WebSocket."""
+    # Work out how many bytes make up one chunk
+    with wave.open(io.BytesIO(audio_data[:WAV_HEADER_BYTES]), "rb") as wav_file:
+        bytes_per_second = (
+            wav_file.getframerate() * wav_file.getsampwidth() * wav_file.getnchannels()
+        )
+    chunk_ms = STT_STREAM_CHUNK_MS if pacing == "realtime" else 1000
+    chunk_size = max(1, bytes_per_second * chunk_ms // 1000)
+
+    # Audio chunks are handed to the SDK through a queue fed by a background thread
+    audio_queue: queue.Queue = queue.Queue()
+    audio_source = AudioSource(audio_queue, is_recording=True, is_buffer=True)
+
+    def feed_audio() -> None:
+        for offset in range(0, len(audio_data), chunk_size):
+            audio_queue.put(bytes(audio_data[offset : offset + chunk_size]))
+            if pacing == "realtime":
+                time.sleep(chunk_ms / 1000)
+        audio_source.completed_recording()
+
+    callback = _StreamingRecognizeCallback(threading.Thread(target=feed_audio))
+    with watson_call("stt", "recognize_stream"):
+        speech_to_text.recognize_using_websocket(
+            audio=audio_source,
+            content_type="audio/wav",
+            recognize_callback=callback,
+            model=model,
+            language_customization_id=customization_id,
+            interim_results=True,
+            smart_formatting=True,
+            # Also have the service close the stream if it hears no speech
+            inactivity_timeout=max(1, round(WATSON_TIMEOUT)),
+        )
+    timings = {"total": time.perf_counter() - (callback.start or time.perf_counter())}
+    if callback.first_interim is not None:
+        timings["first interim"] = callback.first_interim
+    if callback.first_final is not None:
+        timings["first final"] = callback.first_final
+
+    if callback.error:
+        raise StreamError(callback.error)
+    if not callback.transcripts:
+        return "Transcription failed", timings
+    return " ".join(transcript.strip() for transcript in callback.transcripts), timings
+
+
+def transcribe_audio_models(
+    audio_data: AudioData,
+    models: List[Tuple[str, Optional[str]]],
+    mode: str = STT_MODE,
+) -> Dict[str, Tuple[str, float]]:
+    """
+    Transcribe one clip with several Speech to Text models concurrently.
 
-    # Set the service URL for Watson Assistant
-    assistant.set_service_url(ASSISTANT_URL)
+    The same audio buffer is sent to every model.
 
-    # Disable SSL verification (use with caution in production environments)
-    assistant.set_disable_ssl_verification(True)
+    Args:
+        audio_data (AudioData): WAV file contents.
+        models (List[Tuple[str, Optional[str]]]): Model and customization ID pairs.
+        mode (str): "http" or "stream", as for STT_MODE.
 
-    # Send the text input to Watson Assistant and get the response
-    response = assistant.message(
-        assistant_id=ASSISTANT_ID, session_id=session_id, input={"text": text}
-    ).get_result()
-    # Extract and return the assistant's response text
+    Returns:
+        Dict[str, Tuple[str, float]]: Transcribed text and latency in seconds
+        per model label. In stream mode the latency is time to first final result.
+    """
+    speech_to_text = _stt_client(
+        (STT_WS_URL or STT_URL) if mode == "stream" else STT_URL
+    )
+
+    def recognize(model: str, customization_id: Optional[str]) -> Tuple[str, float]:
+        if mode == "stream":
+            transcript, timings = _recognize_stream(
+                speech_to_text, audio_data, STT_STREAM_PACING, model, customization_id
+            )
+            return transcript, timings.get("first final", timings["total"])
+        start = time.perf_counter()
+        transcript = _recognize(speech_to_text, audio_data, model, customization_id)
+        return transcript, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, len(models))) as executor:
+        results = executor.map(lambda pair: recognize(*pair), models)
+        return {stt_model_label(*pair): result for pair, result in zip(models, results)}
+
+
+def assistant_response_text(response: Dict) -> str:
+    """Join the text items of a Watson Assistant message response."""
     assistant_response = ""
     for response_item in response["output"]["generic"]:
         if response_item["response_type"] == "text":
@@ -108,6 +347,26 @@ def query_assistant(text: str, session_id: str) -> str:
     return assistant_response
 
 
+def get_stt_models() -> List[str]:
+    """
+    Get list of all available Speech to Text models
+
+    Returns:
+        List[str]: Strings naming each available model
+    """
+    # Reuse the model list fetched by any worker within the last hour
+    cached_models = store.cache_get("stt_models", STT_URL or "")
+    if cached_models is not None:
+        return cached_models
+
+    with watson_call("stt", "list_models"):
+        models = _stt_client(STT_URL).list_models().get_result()
+
+    plain_models = sorted(model["name"] for model in models["models"])
+    store.cache_set("stt_models", STT_URL or "", plain_models, ttl=3600)
+    return plain_models
+
+
 def get_voices() -> List[str]:
     """
     Get list of all available voices for text to speech
@@ -118,62 +377,189 @@ def get_voices() -> List[str]:
     Returns:
         List[str]: Strings naming each available voice
     """
-    # Create an authenticator object for Text to Speech using the API key
-    tts_authenticator = IAMAuthenticator(TTS_API_KEY)
+    # Reuse the voice list fetched by any worker within the last hour
+    cached_voices = store.cache_get("tts_voices", TTS_URL or "")
+    if cached_voices is not None:
+        return cached_voices
 
-    # Instantiate the TextToSpeechV1 object with the authenticator
-    text_to_speech = TextToSpeechV1(authenticator=tts_authenticator)
+    # Instantiate the TextToSpeechV1 object with an authenticator for the API key
+    text_to_speech = TextToSpeechV1(authenticator=_authenticator(TTS_API_KEY))
 
     # Set the service URL for Text to Speech
     text_to_speech.set_service_url(TTS_URL)
     text_to_speech.set_disable_ssl_verification(True)
+    text_to_speech.set_http_config({"timeout": WATSON_TIMEOUT})
 
-    voices = text_to_speech.list_voices().get_result()
+    with watson_call("tts", "list_voices"):
+        voices = text_to_speech.list_voices().get_result()
 
     plain_voices = [voice["name"] for voice in voices["voices"]]
+    store.cache_set("tts_voices", TTS_URL or "", plain_voices, ttl=3600)
 
     return plain_voices
 
 
-def synthesize_speech(text: str, voice: str) -> str:
+def synthesize_speech(text: str, voice: str) -> bytes:
     """
-    Convert text to speech using IBM Watson Text to Speech and return the audio as a base64 encoded string.
+    Convert text to speech using IBM Watson Text to Speech and return the WAV audio.
 
     Args:
         text (str): Text to convert to speech.
         voice (str): Name of voice to use for text to speech
 
     Returns:
-        str: Base64 encoded audio data.
+        bytes: WAV file contents.
     """
-    # Create an authenticator object for Text to Speech using the API key
-    tts_authenticator = IAMAuthenticator(TTS_API_KEY)
-
-    # Instantiate the TextToSpeechV1 object with the authenticator
-    text_to_speech = TextToSpeechV1(authenticator=tts_authenticator)
+    # Instantiate the TextToSpeechV1 object with an authenticator for the API key
+    text_to_speech = TextToSpeechV1(authenticator=_authenticator(TTS_API_KEY))
 
     # Set the service URL for Text to Speech
     text_to_speech.set_service_url(TTS_URL)
     text_to_speech.set_disable_ssl_verification(True)
+    text_to_speech.set_http_config({"timeout": WATSON_TIMEOUT})
 
     # Send the text to the Text to Speech service and get the audio content
-    response = text_to_speech.synthesize(
-        text, accept="audio/wav", voice=voice
-    ).get_result()
-    # Encode the audio content as base64
-    audio_base64 = base64.b64encode(response.content).decode("utf-8")
-    return audio_base64
+    with watson_call("tts", "synthesize"):
+        response = text_to_speech.synthesize(
+            text, accept="audio/wav", voice=voice
+        ).get_result()
+    return response.content
+
+
+class _StreamingSynthesizeCallback(SynthesizeCallback):
+    """Write synthesized audio chunks to the server-side store as they arrive."""
+
+    def __init__(self, stream: str) -> None:
+        super().__init__()
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.first_chunk: Optional[float] = None
+        self.header = b""
+        self.length = 0
+        self.error: Optional[str] = None
+
+    def on_audio_stream(self, audio_stream: bytes) -> None:
+        if self.first_chunk is None:
+            self.first_chunk = time.perf_counter() - self.start
+            # Keep the WAV header so its length fields can be fixed at the end
+            self.header = audio_stream
+        store.append_audio(self.stream, audio_stream)
+        self.length += len(audio_stream)
 
+    def on_error(self, error: str) -> None:
+        self.error = error
 
-def merge_recordings(recordings: List[bytes]) -> str:
+
+def synthesize_speech_cached(text: str, voice: str) -> str:
     """
-    Merge multiple audio recordings into a single audio file and return the combined audio as a base64 encoded string.
+    Synthesize speech through the shared TTS cache and the process rate limiter.
+
+    Identical text and voice pairs are synthesized once; the audio is kept in
+    the server-side store and reused by every worker.
 
     Args:
-        recordings (List[bytes]): List of audio recordings as byte data.
+        text (str): Text to convert to speech.
+        voice (str): Name of voice to use for text to speech
 
     Returns:
-        str: Base64 encoded combined audio data.
+        str: Server-side store key of the synthesized audio.
+    """
+    digest = hashlib.sha256(f"{voice}\n{text}".encode("utf-8")).hexdigest()
+    audio_key = store.cache_get("tts", digest)
+    if audio_key is not None:
+        return audio_key
+    tts_rate_limiter.acquire()
+    audio_key = store.put_audio(f"tts/{digest}", synthesize_speech(text, voice))
+    store.cache_set("tts", digest, audio_key)
+    return audio_key
+
+
+def _fix_wav_header(header: bytes, total_length: int) -> bytes:
+    """
+    Fill in the RIFF and data chunk sizes of a streamed WAV header.
+
+    Streamed WAV audio is sent before its length is known, so the size fields
+    hold placeholder values that some players reject.
+
+    Args:
+        header (bytes): First chunk of the stream, containing the WAV header.
+        total_length (int): Length of the complete stream in bytes.
+
+    Returns:
+        bytes: The first chunk with corrected size fields.
+    """
+    data_offset = header.find(b"data")
+    if (
+        not header.startswith(b"RIFF")
+        or data_offset < 0
+        or len(header) < data_offset + 8
+    ):
+        return header
+    fixed = bytearray(header)
+    fixed[4:8] = struct.pack("<I", total_length - 8)
+    fixed[data_offset + 4 : data_offset + 8] = struct.pack(
+        "<I", total_length - data_offset - 8
+    )
+    return bytes(fixed)
+
+
+def synthesize_speech_stream(text: str, voice: str, key: str) -> Dict[str, float]:
+    """
+    Stream text to speech from IBM Watson over WebSocket into the server-side store.
+
+    Audio chunks are appended to a stream in the store as they arrive instead
+    of being buffered as one clip; the clip replaces the one under `key` once
+    the stream is complete.
+
+    Args:
+        text (str): Text to convert to speech.
+        voice (str): Name of voice to use for text to speech
+        key (str): Server-side store key to write the audio under.
+
+    Returns:
+        Dict[str, float]: Timings in seconds ("first chunk", "total").
+
+    Raises:
+        StreamError: If the service reported an error; the partial clip is
+            discarded and any earlier clip under `key` is deleted.
+    """
+    # Create the Text to Speech client; streaming may target a separate ws:// URL
+    text_to_speech = TextToSpeechV1(authenticator=_authenticator(TTS_API_KEY))
+    text_to_speech.set_service_url(TTS_WS_URL or TTS_URL)
+    text_to_speech.set_disable_ssl_verification(True)
+    text_to_speech.set_http_config({"timeout": WATSON_TIMEOUT})
+
+    stream = store.start_audio_stream(key)
+    callback = _StreamingSynthesizeCallback(stream)
+    try:
+        with watson_call("tts", "synthesize_stream"):
+            text_to_speech.synthesize_using_websocket(
+                text, callback, accept="audio/wav", voice=voice
+            )
+        if callback.error:
+            raise StreamError(callback.error)
+    except BaseException:
+        # Neither the truncated clip nor an outdated one is played back as the response
+        store.discard_audio_stream(stream)
+        store.delete_audio(key)
+        raise
+    timings = {"total": time.perf_counter() - callback.start}
+    if callback.first_chunk is not None:
+        timings["first chunk"] = callback.first_chunk
+        store.patch_audio(stream, 0, _fix_wav_header(callback.header, callback.length))
+    store.finish_audio_stream(stream, key)
+    return timings
+
+
+def merge_recordings(recordings: Sequence[AudioData]) -> bytes:
+    """
+    Merge multiple audio recordings into a single WAV file.
+
+    Args:
+        recordings (Sequence[AudioData]): WAV file contents of each recording.
+
+    Returns:
+        bytes: Combined WAV file contents.
     """
     combined = AudioSegment.empty()  # Create an empty audio segment
     for recording in recordings:
@@ -185,9 +571,7 @@ def merge_recordings(recordings: List[bytes]) -> str:
     output_buffer = io.BytesIO()
     combined.export(output_buffer, format="wav")
 
-    # Encode the combined audio as base64
-    audio_base64 = base64.b64encode(output_buffer.getvalue()).decode("utf-8")
-    return audio_base64
+    return output_buffer.getvalue()
 
 
 def create_session_id() -> str:
@@ -197,18 +581,19 @@ def create_session_id() -> str:
     Returns:
         str: Watson Assistant session ID.
     """
-    # Create an authenticator object for Watson Assistant using the API key
-    assistant_authenticator = IAMAuthenticator(ASSISTANT_API_KEY)
-
     # Instantiate the AssistantV2 object with the authenticator and version information
-    assistant = AssistantV2(version="2023-06-15", authenticator=assistant_authenticator)
+    assistant = AssistantV2(
+        version="2023-06-15", authenticator=_authenticator(ASSISTANT_API_KEY)
+    )
 
     # Set the service URL for Watson Assistant
     assistant.set_service_url(ASSISTANT_URL)
 
     # Disable SSL verification (use with caution in production environments)
     assistant.set_disable_ssl_verification(True)
+    assistant.set_http_config({"timeout": WATSON_TIMEOUT})
 
-    return assistant.create_session(assistant_id=ASSISTANT_ID).get_result()[
-        "session_id"
-    ]
+    with watson_call("assistant", "create_session"):
+        return assistant.create_session(assistant_id=ASSISTANT_ID).get_result()[
+            "session_id"
+        ]
@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+import aiohttp
+from ibm_cloud_sdk_core import ApiException
+from metrics import watson_call
+from voice_utils import (
+    ASSISTANT_API_KEY,
+    ASSISTANT_ID,
+    ASSISTANT_URL,
+    STT_API_KEY,
+    STT_MODEL,
+    STT_URL,
+    TTS_API_KEY,
+    TTS_URL,
+    WATSON_TIMEOUT,
+    AudioData,
+    SessionExpiredError,
+    _authenticator,
+    assistant_response_text,
+    stt_transcript,
+)
+
+# Open connections shared by all Watson services of one client
+WATSON_CONNECTION_LIMIT: int = int(os.getenv("WATSON_CONNECTION_LIMIT", "100"))
+# Requests in flight per service; further requests wait on the event loop
+STT_CONCURRENCY: int = int(os.getenv("STT_CONCURRENCY", "16"))
+TTS_CONCURRENCY: int = int(os.getenv("TTS_CONCURRENCY", "16"))
+ASSISTANT_CONCURRENCY: int = int(os.getenv("ASSISTANT_CONCURRENCY", "64"))
+
+ASSISTANT_VERSION = "2023-06-15"
+
+# Seconds an Authorization header is reused before the authenticator is asked
+# again; IAM tokens are refreshed with well over this much lifetime left
+AUTH_HEADER_REUSE = 60.0
+
+T = TypeVar("T")
+
+
+class AsyncWatsonClient:
+    """
+    Asyncio client for the Watson endpoints used by batch runs.
+
+    Covers Speech to Text `recognize`, Text to Speech `synthesize` and
+    Assistant `create_session`/`message` over one pooled HTTP session, so
+    thousands of concurrent requests can be driven from a single event loop
+    without a thread per call. Each service is guarded by a bounded
+    semaphore. Blocking SDK calls run in the client's own threads through
+    `run_sync`. Use it as an async context manager within the loop it runs on:
+
+        async with AsyncWatsonClient() as client:
+            text = await client.recognize(audio_data)
+    """
+
+    def __init__(
+        self,
+        connection_limit: int = WATSON_CONNECTION_LIMIT,
+        stt_concurrency: int = STT_CONCURRENCY,
+        tts_concurrency: int = TTS_CONCURRENCY,
+        assistant_concurrency: int = ASSISTANT_CONCURRENCY,
+    ) -> None:
+        self.connection_limit = connection_limit
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._limits = {
+            "stt": asyncio.BoundedSemaphore(stt_concurrency),
+            "tts": asyncio.BoundedSemaphore(tts_concurrency),
+            "assistant": asyncio.BoundedSemaphore(assistant_concurrency),
+        }
+        self._authenticators = {
+            "stt": _authenticator(STT_API_KEY),
+            "tts": _authenticator(TTS_API_KEY),
+            "assistant": _authenticator(ASSISTANT_API_KEY),
+        }
+        # Authorization headers per service and when they must be fetched again
+        self._auth_headers: Dict[str, Dict[str, str]] = {}
+        self._auth_expires: Dict[str, float] = {}
+        self._auth_lock = asyncio.Lock()
+        # Threads for blocking SDK calls, at most one per slot plus token fetches.
+        # They are not the loop's default executor, which asyncio.run waits for
+        self._executor = ThreadPoolExecutor(
+            max_workers=stt_concurrency + tts_concurrency + assistant_concurrency + 1,
+            thread_name_prefix="watson-sdk",
+        )
+
+    async def __aenter__(self) -> "AsyncWatsonClient":
+        # SSL verification is disabled, as for the SDK clients in voice_utils
+        connector = aiohttp.TCPConnector(limit=self.connection_limit, ssl=False)
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=WATSON_TIMEOUT)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._session.close()
+        # A call abandoned after its deadline may still be stuck in the SDK;
+        # leave it behind rather than holding up the end of the batch
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run_sync(
+        self, service: Optional[str], func: Callable[..., T], *args: Any
+    ) -> T:
+        """
+        Run a blocking SDK call in a worker thread of the client.
+
+        Args:
+            service (Optional[str]): "stt", "tts" or "assistant" to hold one of
+                the service's slots while the call runs, like a request of
+                this client, or None.
+            func (Callable[..., T]): Blocking function, e.g. a WebSocket stream.
+            *args: Passed on to `func`.
+
+        Returns:
+            T: Result of `func`.
+        """
+        call = functools.partial(func, *args)
+        loop = asyncio.get_running_loop()
+        if service is None:
+            return await loop.run_in_executor(self._executor, call)
+        async with self._limits[service]:
+            return await loop.run_in_executor(self._executor, call)
+
+    async def _authorization(self, service: str) -> Dict[str, str]:
+        """
+        Return the authentication headers of a service without blocking the loop.
+
+        The SDK authenticator fetches and refreshes IAM tokens with blocking
+        HTTP calls, so it runs in a worker thread, one call at a time, and its
+        headers are reused for AUTH_HEADER_REUSE seconds.
+        """
+        if time.monotonic() >= self._auth_expires.get(service, 0.0):
+            async with self._auth_lock:
+                # Another request may have fetched the headers while this one waited
+                if time.monotonic() >= self._auth_expires.get(service, 0.0):
+                    request = {"headers": {}}
+                    await self.run_sync(
+                        None, self._authenticators[service].authenticate, request
+                    )
+                    self._auth_headers[service] = request["headers"]
+                    self._auth_expires[service] = time.monotonic() + AUTH_HEADER_REUSE
+        return self._auth_headers[service]
+
+    async def _request(
+        self,
+        service: str,
+        operation: str,
+        url: str,
+        **kwargs: Any,
+    ) -> Tuple[int, bytes]:
+        """
+        Send one authenticated request, waiting for a free slot of the service.
+
+        The body is read while the connection is held, so callers get plain
+        bytes rather than a response whose connection has been released.
+
+        Args:
+            service (str): "stt", "tts" or "assistant".
+            operation (str): Operation name recorded in the Watson metrics.
+            url (str): Request URL.
+            **kwargs: Passed on to `aiohttp.ClientSession.post`.
+
+        Returns:
+            Tuple[int, bytes]: Status code and body of the response.
+
+        Raises:
+            ApiException: If the service answers with an error status.
+            asyncio.TimeoutError: If no response arrived within WATSON_TIMEOUT.
+        """
+        headers = dict(kwargs.pop("headers", {}))
+        headers.update(await self._authorization(service))
+        async with self._limits[service]:
+            with watson_call(service, operation):
+                async with self._session.post(
+                    url, headers=headers, **kwargs
+                ) as response:
+                    status, body = response.status, await response.read()
+        if status >= 400:
+            raise ApiException(status, message=body.decode("utf-8", "replace"))
+        return status, body
+
+    async def recognize(
+        self,
+        audio_data: AudioData,
+        model: Optional[str] = STT_MODEL,
+        customization_id: Optional[str] = None,
+    ) -> str:
+        """
+        Transcribe WAV audio with Speech to Text.
+
+        Args:
+            audio_data (AudioData): WAV file contents.
+            model (Optional[str]): Speech to Text model.
+            customization_id (Optional[str]): Language customization ID.
+
+        Returns:
+            str: Transcribed text from the audio.
+        """
+        params = {"smart_formatting": "true"}
+        if model:
+            params["model"] = model
+        if customization_id:
+            params["language_customization_id"] = customization_id
+        _, body = await self._request(
+            "stt",
+            "recognize",
+            f"{STT_URL}/v1/recognize",
+            params=params,
+            data=audio_data,
+            headers={"Content-Type": "audio/wav"},
+        )
+        return stt_transcript(json.loads(body))
+
+    async def synthesize(self, text: str, voice: str) -> bytes:
+        """
+        Convert text to speech with Text to Speech.
+
+        Args:
+            text (str): Text to convert to speech.
+            voice (str): Name of voice to use for text to speech
+
+        Returns:
+            bytes: WAV file contents.
+        """
+        _, body = await self._request(
+            "tts",
+            "synthesize",
+            f"{TTS_URL}/v1/synthesize",
+            params={"voice": voice},
+            json={"text": text},
+            headers={"Accept": "audio/wav"},
+        )
+        return body
+
+    def _assistant_url(self, path: str) -> str:
+        return f"{ASSISTANT_URL}/v2/assistants/{ASSISTANT_ID}/{path}"
+
+    async def create_session(self) -> str:
+        """
+        Create a new Watson Assistant session.
+
+        Returns:
+            str: Watson Assistant session ID.
+        """
+        _, body = await self._request(
+            "assistant",
+            "create_session",
+            self._assistant_url("sessions"),
+            params={"version": ASSISTANT_VERSION},
+            json={},
+        )
+        return json.loads(body)["session_id"]
+
+    async def message(self, text: str, session_id: str) -> str:
+        """
+        Send one user turn to Watson Assistant.
+
+        Args:
+            text (str): Input text to send to Watson Assistant.
+            session_id (str): Session ID for the Watson Assistant interaction.
+
+        Returns:
+            str: Response text from Watson Assistant.
+
+        Raises:
+            SessionExpiredError: If the session timed out or no longer exists.
+        """
+        try:
+            _, body = await self._request(
+                "assistant",
+                "message",
+                self._assistant_url(f"sessions/{session_id}/message"),
+                params={"version": ASSISTANT_VERSION},
+                json={"input": {"text": text}},
+            )
+        except ApiException as error:
+            # Watson Assistant answers 404 "Invalid Session" once a session has expired
+            if error.code == 404:
+                raise SessionExpiredError(session_id) from error
+            raise
+        return assistant_response_text(json.loads(body))
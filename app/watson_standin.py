@@ -0,0 +1,287 @@
+"""
+Local stand-in for the IBM Watson services used by the voice testing tool.
+
+Serves the Speech to Text WebSocket recognition endpoint (`/v1/recognize`)
+with canned transcripts, the Text to Speech WebSocket synthesis endpoint
+(`/v1/synthesize`) with generated tones, HTTP `POST` versions of both, the
+model and voice lists (`GET /v1/models`, `/v1/voices`), and the Assistant
+v2 session and message endpoints with echoed responses, so
+streaming modes, batch runs and load tests can be exercised without
+credentials. Point the app at it with:
+
+    python watson_standin.py --port 9443
+    STT_MODE=stream STT_WS_URL=ws://localhost:9443 STT_API_KEY= python app.py
+    TTS_MODE=stream TTS_WS_URL=ws://localhost:9443 TTS_API_KEY= python app.py
+    ASSISTANT_URL=http://localhost:9443 ASSISTANT_API_KEY= python load_test.py
+"""
+
+import io
+import json
+import math
+import time
+import uuid
+import wave
+import random
+import threading
+import base64
+import struct
+import hashlib
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+# GUID defined by RFC 6455 for computing the Sec-WebSocket-Accept header
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler emulating the Watson endpoints the app calls."""
+
+    protocol_version = "HTTP/1.1"
+
+    # Overridden from the command line in main()
+    transcript = "this is a stand in transcript"
+    interim_every_bytes = 16000  # Send an interim result after this much audio
+    final_delay = 0.2  # Seconds between the stop message and the final result
+    first_chunk_delay = 0.1  # Seconds before the first synthesized chunk
+    chunk_interval = 0.05  # Seconds between synthesized chunks
+    # Chunks sent before a synthesis stream reports an error; None never fails
+    fail_synthesis_after: Optional[int] = None
+    sample_rate = 22050
+    stt_models = ["en-US_Multimedia", "en-US_Telephony"]  # Listed by /v1/models
+    voices = ["en-US_AllisonV3Voice", "en-US_EmmaExpressive"]  # Listed by /v1/voices
+    assistant_delay = 0.05  # Seconds before each assistant message is answered
+    error_rate = 0.0  # Fraction of assistant messages answered with a 500 error
+
+    # Assistant sessions created so far, shared by all handler threads
+    sessions: set = set()
+    sessions_lock = threading.Lock()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    # WebSocket framing
+
+    def _read_frame(self) -> Tuple[Optional[int], bytes]:
+        """Read one client frame, returning its opcode and unmasked payload."""
+        header = self.rfile.read(2)
+        if len(header) < 2:
+            return None, b""
+        opcode = header[0] & 0x0F
+        masked = header[1] & 0x80
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self.rfile.read(8))[0]
+        mask = self.rfile.read(4) if masked else b""
+        payload = self.rfile.read(length)
+        if masked and length:
+            key = (mask * (length // 4 + 1))[:length]
+            payload = (
+                int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")
+            ).to_bytes(length, "big")
+        return opcode, payload
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        """Send one unmasked server frame."""
+        length = len(payload)
+        header = bytes([0x80 | opcode])
+        if length < 126:
+            header += bytes([length])
+        elif length < 65536:
+            header += bytes([126]) + struct.pack(">H", length)
+        else:
+            header += bytes([127]) + struct.pack(">Q", length)
+        self.wfile.write(header + payload)
+        self.wfile.flush()
+
+    def _send_json(self, message: dict) -> None:
+        self._send_frame(OPCODE_TEXT, json.dumps(message).encode("utf-8"))
+
+    def _accept_websocket(self) -> None:
+        """Complete the WebSocket upgrade handshake."""
+        key = self.headers["Sec-WebSocket-Key"]
+        accept = base64.b64encode(
+            hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()
+        ).decode("ascii")
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.close_connection = True
+
+    # Endpoints
+
+    def do_GET(self) -> None:
+        if self.headers.get("Upgrade", "").lower() != "websocket":
+            # Model and voice lists requested when the page loads
+            path = self.path.split("?", 1)[0]
+            if path == "/v1/models":
+                models = [{"name": model} for model in self.stt_models]
+                self._send_body(200, {"models": models})
+            elif path == "/v1/voices":
+                voices = [{"name": voice} for voice in self.voices]
+                self._send_body(200, {"voices": voices})
+            else:
+                self.send_error(404)
+            return
+        self._accept_websocket()
+        if self.path.startswith("/v1/recognize"):
+            self._recognize()
+        elif self.path.startswith("/v1/synthesize"):
+            self._synthesize()
+
+    def do_POST(self) -> None:
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        # HTTP recognition and synthesis used by batch runs
+        if parts == ["v1", "recognize"]:
+            self._send_body(200, self._result(self.transcript, final=True))
+        elif parts == ["v1", "synthesize"]:
+            audio = self._tone(json.loads(body or b"{}").get("text", ""))
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/wav")
+            self.send_header("Content-Length", str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio)
+        # Assistant v2: /v2/assistants/{id}/sessions[/{session_id}/message]
+        elif parts[:2] != ["v2", "assistants"] or len(parts) < 4:
+            self.send_error(404)
+        elif len(parts) == 4 and parts[3] == "sessions":
+            self._create_session()
+        elif len(parts) == 6 and parts[3] == "sessions" and parts[5] == "message":
+            self._message(parts[4], json.loads(body or b"{}"))
+        else:
+            self.send_error(404)
+
+    def _send_body(self, status: int, message: dict) -> None:
+        payload = json.dumps(message).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _create_session(self) -> None:
+        session_id = str(uuid.uuid4())
+        with self.sessions_lock:
+            self.sessions.add(session_id)
+        self._send_body(201, {"session_id": session_id})
+
+    def _message(self, session_id: str, request: dict) -> None:
+        """Emulate a stateful assistant turn that echoes the user's text."""
+        time.sleep(self.assistant_delay)
+        with self.sessions_lock:
+            known = session_id in self.sessions
+        if not known:
+            self._send_body(404, {"error": "Invalid Session", "code": 404})
+        elif random.random() < self.error_rate:
+            self._send_body(500, {"error": "Internal Server Error", "code": 500})
+        else:
+            text = request.get("input", {}).get("text", "")
+            generic = [{"response_type": "text", "text": f"You said: {text}"}]
+            self._send_body(200, {"output": {"generic": generic}})
+
+    def _result(self, transcript: str, final: bool) -> dict:
+        return {
+            "result_index": 0,
+            "results": [{"alternatives": [{"transcript": transcript}], "final": final}],
+        }
+
+    def _recognize(self) -> None:
+        """Emulate streaming recognition: interim results while audio arrives."""
+        words = self.transcript.split()
+        received = 0
+        interim_sent = 0
+        while True:
+            opcode, payload = self._read_frame()
+            if opcode is None or opcode == OPCODE_CLOSE:
+                self._send_frame(OPCODE_CLOSE, b"")
+                return
+            if opcode == OPCODE_PING:
+                self._send_frame(OPCODE_PONG, payload)
+            elif opcode in (OPCODE_BINARY, OPCODE_CONTINUATION):
+                received += len(payload)
+                if received // self.interim_every_bytes > interim_sent:
+                    interim_sent = received // self.interim_every_bytes
+                    partial = " ".join(words[: min(len(words), interim_sent)])
+                    self._send_json(self._result(partial, final=False))
+            elif opcode == OPCODE_TEXT:
+                action = json.loads(payload).get("action")
+                if action == "start":
+                    self._send_json({"state": "listening"})
+                elif action == "stop":
+                    time.sleep(self.final_delay)
+                    self._send_json(self._result(self.transcript, final=True))
+                    self._send_json({"state": "listening"})
+
+    def _tone(self, text: str) -> bytes:
+        """Generate a WAV tone lasting roughly as long as `text` takes to say."""
+        frames = int(self.sample_rate * max(0.5, len(text.split()) * 0.3))
+        step = 2 * math.pi * 440 / self.sample_rate
+        samples = b"".join(
+            struct.pack("<h", int(8000 * math.sin(step * n))) for n in range(frames)
+        )
+        output = io.BytesIO()
+        with wave.open(output, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(samples)
+        return output.getvalue()
+
+    def _synthesize(self) -> None:
+        """Emulate streaming synthesis: audio sent in chunks after the text message."""
+        opcode, payload = self._read_frame()
+        if opcode != OPCODE_TEXT:
+            self._send_frame(OPCODE_CLOSE, b"")
+            return
+        audio = bytearray(self._tone(json.loads(payload).get("text", "")))
+        # The service sends the header before the length is known, so the RIFF
+        # and data chunk sizes hold placeholders
+        data_offset = audio.find(b"data")
+        audio[4:8] = audio[data_offset + 4 : data_offset + 8] = b"\xff" * 4
+        self._send_json({"binary_streams": [{"content_type": "audio/wav"}]})
+        time.sleep(self.first_chunk_delay)
+        chunk_size = self.sample_rate // 10
+        for sent, offset in enumerate(range(0, len(audio), chunk_size)):
+            if sent == self.fail_synthesis_after:
+                self._send_json({"error": "stand-in synthesis failure"})
+                break
+            self._send_frame(OPCODE_BINARY, bytes(audio[offset : offset + chunk_size]))
+            time.sleep(self.chunk_interval)
+        self._send_frame(OPCODE_CLOSE, struct.pack(">H", 1000))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--transcript", default=StandinHandler.transcript)
+    parser.add_argument("--final-delay", type=float, default=StandinHandler.final_delay)
+    parser.add_argument(
+        "--assistant-delay", type=float, default=StandinHandler.assistant_delay
+    )
+    parser.add_argument("--error-rate", type=float, default=StandinHandler.error_rate)
+    args = parser.parse_args()
+
+    StandinHandler.transcript = args.transcript
+    StandinHandler.final_delay = args.final_delay
+    StandinHandler.assistant_delay = args.assistant_delay
+    StandinHandler.error_rate = args.error_rate
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    print(f"Watson stand-in listening on {args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import re
+import uuid
+import flask
+
+# Cookie holding the browser's workspace, so each tester gets separate paths
+WORKSPACE_COOKIE = "workspace"
+WORKSPACE_MAX_AGE = 365 * 24 * 3600  # Seconds the workspace cookie is kept
+# Characters allowed in workspace names given in the ?workspace= query parameter
+_WORKSPACE_NAME = re.compile(r"^[\w.-]{1,64}$")
+
+
+def current_workspace() -> str:
+    """
+    Return the workspace of the browser making the current request.
+
+    Conversation paths, their recordings and batch jobs are stored per
+    workspace. A browser is given a random workspace on its first visit;
+    opening the app with `?workspace=<name>` switches it to a named one, e.g.
+    so several testers work on the same paths.
+
+    Returns:
+        str: Workspace name.
+    """
+    if "workspace" not in flask.g:
+        requested = flask.request.args.get("workspace", "")
+        if not _WORKSPACE_NAME.match(requested):
+            requested = flask.request.cookies.get(WORKSPACE_COOKIE, "")
+        flask.g.workspace = requested or uuid.uuid4().hex
+    return flask.g.workspace
+
+
+def init_app(server: flask.Flask) -> None:
+    """
+    Remember each browser's workspace in a cookie.
+
+    Args:
+        server (flask.Flask): The Flask server backing the Dash app.
+    """
+
+    @server.after_request
+    def set_workspace_cookie(response: flask.Response) -> flask.Response:
+        workspace = current_workspace()
+        if flask.request.cookies.get(WORKSPACE_COOKIE) != workspace:
+            response.set_cookie(
+                WORKSPACE_COOKIE,
+                workspace,
+                max_age=WORKSPACE_MAX_AGE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
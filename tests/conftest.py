@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+# The app's modules import each other as top-level modules from app/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "app"))
+
+# Keep the server-side store of the tests out of uploaded_files/ and call the
+# stand-in services without credentials; both are read when the modules load
+_state_dir = tempfile.mkdtemp(prefix="voice-tests-")
+os.environ["STATE_DB"] = os.path.join(_state_dir, "state.db")
+os.environ["AUDIO_DIR"] = os.path.join(_state_dir, "audio")
+for _key in ("STT_API_KEY", "TTS_API_KEY", "ASSISTANT_API_KEY"):
+    os.environ[_key] = ""
+
+
+@pytest.fixture
+def standin():
+    """Serve the Watson stand-in on a free local port and yield its base URL."""
+    from watson_standin import StandinHandler
+
+    server = ThreadingHTTPServer(("localhost", 0), StandinHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+import voice_utils
+import watson_async
+from app_utils import AppUtils, parse_latency
+from server_store import store
+from watson_async import AsyncWatsonClient
+from watson_standin import StandinHandler
+
+WORKSPACE = "app-utils-tests"
+
+
+def test_parse_latency():
+    assert parse_latency("stt: 820 ms, tts total: 1200 ms, assistant: 312 ms") == {
+        "stt": 820,
+        "tts total": 1200,
+        "assistant": 312,
+    }
+
+
+def test_parse_latency_skips_cached_and_malformed_stages():
+    assert parse_latency("stt: cached, assistant: 312 ms, tts: 1.5 s") == {
+        "assistant": 312
+    }
+    assert parse_latency("") == {}
+    assert parse_latency(None) == {}
+
+
+def _utils(path, voice_store=None, **settings):
+    """AppUtils for a conversation path, as the table callback builds it."""
+    values = dict(
+        voice_dropdown="alice",
+        convo_path_dropdown_value=path,
+        convo_path_dropdown_options=[],
+        response_voice_dropdown_value="en-US_Voice",
+        new_convo_path_name="",
+        page_current=0,
+        page_size=25,
+        sort_by=[],
+        filter_query="",
+        page_data=[],
+        page_previous=None,
+        page_ids=[],
+        page_version=None,
+        table_dropdown={},
+        voice_store=voice_store or {},
+        stt_models=[],
+        restart=False,
+        workspace=WORKSPACE,
+    )
+    values.update(settings)
+    return AppUtils(**values)
+
+
+def test_identical_clips_share_one_recognition(monkeypatch):
+    recognized = []
+
+    async def recognize(self, audio_data, model=None, customization_id=None):
+        recognized.append(bytes(audio_data))
+        await asyncio.sleep(0.05)
+        return "hello"
+
+    monkeypatch.setattr(AsyncWatsonClient, "recognize", recognize)
+    key = store.put_audio("tests/shared-clip", b"RIFF shared clip")
+    other = store.put_audio("tests/other-clip", b"RIFF other clip")
+    store.replace_path(
+        WORKSPACE,
+        "shared",
+        [{"User Recording": name} for name in ("a.wav", "b.wav", "c.wav")],
+    )
+    voice_store = {"alice": {"a.wav": key, "b.wav": key, "c.wav": other}}
+
+    _utils("shared", voice_store).run_batch("transcribe-btn")
+
+    rows, _, _ = store.load_path(WORKSPACE, "shared")
+    assert len(recognized) == 2
+    assert [row["Transcribed Text"] for row in rows] == ["hello"] * 3
+    assert [row["Latency"].startswith("stt: ") for row in rows] == [True] * 3
+    assert [row["Latency"] == "stt: cached" for row in rows].count(True) == 1
+
+
+@pytest.fixture
+def stt_calls(standin, monkeypatch):
+    """Recognize through the stand-in, failing the clips listed in `failing`."""
+    monkeypatch.setattr(watson_async, "STT_URL", standin)
+    calls = {"clips": [], "failing": set()}
+    recognize = AsyncWatsonClient.recognize
+
+    async def counted(self, audio_data, *args):
+        clip = bytes(audio_data)
+        calls["clips"].append(clip)
+        if clip in calls["failing"]:
+            raise RuntimeError("recognition failed")
+        return await recognize(self, audio_data, *args)
+
+    monkeypatch.setattr(AsyncWatsonClient, "recognize", counted)
+    return calls
+
+
+def _transcription_path(name):
+    """Store a path of three rows with their own clips and return its voice store."""
+    clips = [f"RIFF clip {name} {idx}".encode() for idx in range(3)]
+    files = {
+        f"{idx}.wav": store.put_audio(f"tests/{name}/{idx}", clip)
+        for idx, clip in enumerate(clips)
+    }
+    store.replace_path(
+        WORKSPACE,
+        name,
+        [
+            {"User Recording": f"{idx}.wav", "Expected User Text": ""}
+            for idx in range(3)
+        ],
+    )
+    return clips, {"alice": files}
+
+
+def test_resume_restores_only_rows_with_unchanged_inputs(stt_calls):
+    clips, voice_store = _transcription_path("resume")
+    stt_calls["failing"].add(clips[1])
+    _utils("resume", voice_store).run_batch("transcribe-btn")
+
+    rows, _, version = store.load_path(WORKSPACE, "resume")
+    assert [bool(row["Error"]) for row in rows] == [False, True, False]
+    assert store.resumable_job("transcribe-btn", f"{WORKSPACE}/resume", 60)
+
+    # Row 2's result no longer matches its inputs
+    store.update_rows(WORKSPACE, "resume", {2: {"Expected User Text": "hi"}}, version)
+    stt_calls["failing"].clear()
+    stt_calls["clips"].clear()
+    _utils("resume", voice_store).run_batch("transcribe-btn")
+
+    rows, _, _ = store.load_path(WORKSPACE, "resume")
+    assert stt_calls["clips"] == [clips[1], clips[2]]
+    assert [row["Error"] for row in rows] == ["", "", ""]
+    assert {row["Transcribed Text"] for row in rows} == {StandinHandler.transcript}
+    assert store.resumable_job("transcribe-btn", f"{WORKSPACE}/resume", 60) is None
+
+
+def test_restart_runs_every_row_again(stt_calls):
+    clips, voice_store = _transcription_path("restart")
+    stt_calls["failing"].add(clips[0])
+    _utils("restart", voice_store).run_batch("transcribe-btn")
+
+    stt_calls["failing"].clear()
+    stt_calls["clips"].clear()
+    _utils("restart", voice_store, restart=True).run_batch("transcribe-btn")
+
+    rows, _, _ = store.load_path(WORKSPACE, "restart")
+    assert sorted(stt_calls["clips"]) == sorted(clips)
+    assert [row["Error"] for row in rows] == ["", "", ""]
+
+
+def test_turns_record_why_no_session_could_be_created(standin, monkeypatch):
+    # The stand-in answers 404 for sessions of this URL
+    monkeypatch.setattr(watson_async, "ASSISTANT_URL", f"{standin}/unavailable")
+    monkeypatch.setattr(voice_utils, "ASSISTANT_URL", f"{standin}/unavailable")
+    store.replace_path(
+        WORKSPACE,
+        "no-session",
+        [{"Expected User Text": text} for text in ("hello", "cancel my plan")],
+    )
+
+    _utils("no-session").run_batch("query-btn")
+
+    rows, _, _ = store.load_path(WORKSPACE, "no-session")
+    assert [row["Error"].startswith("assistant: ") for row in rows] == [True, True]
+    assert [row.get("Actual Assistant Response", "") for row in rows] == ["", ""]
+    assert store.resumable_job("query-btn", f"{WORKSPACE}/no-session", 60)
@@ -0,0 +1,80 @@
+import io
+import wave
+
+import numpy as np
+
+from fingerprint import content_hash, ingest_clip, near_duplicate_of
+
+RATE = 16000
+
+
+def _wav(samples, rate=RATE, extra_chunk=b""):
+    """Encode float samples in [-1, 1] as 16-bit mono WAV, optionally with metadata."""
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes((np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes())
+    data = output.getvalue()
+    if extra_chunk:
+        # Insert a LIST chunk before the data chunk and fix the RIFF size
+        data_offset = data.find(b"data")
+        chunk = b"LIST" + len(extra_chunk).to_bytes(4, "little") + extra_chunk
+        data = data[:data_offset] + chunk + data[data_offset:]
+        data = data[:4] + (len(data) - 8).to_bytes(4, "little") + data[8:]
+    return data
+
+
+def _utterance(seed, frames=40, frame_length=1024):
+    """Noise whose spectral shape changes every frame, standing in for speech."""
+    rng = np.random.default_rng(seed)
+    frequencies = np.fft.rfftfreq(frame_length, 1 / RATE)
+    frames_out = []
+    for _ in range(frames):
+        gains = np.interp(
+            frequencies, np.geomspace(200, 5000, 17), rng.uniform(0.05, 1, 17)
+        )
+        spectrum = np.fft.rfft(rng.normal(0, 1, frame_length)) * gains
+        frames_out.append(np.fft.irfft(spectrum))
+    samples = np.concatenate(frames_out)
+    return 0.3 * samples / np.abs(samples).max()
+
+
+def test_content_hash_ignores_metadata_but_not_audio():
+    samples = _utterance(1)
+
+    plain = _wav(samples)
+    tagged = _wav(samples, extra_chunk=b"INFOISFT\x04\x00\x00\x00test")
+
+    assert plain != tagged
+    assert content_hash(plain) == content_hash(tagged)
+    assert content_hash(plain) != content_hash(_wav(samples * 0.5))
+    assert content_hash(plain) != content_hash(_wav(samples, rate=8000))
+
+
+def test_ingest_clip_stores_identical_clips_once():
+    samples = _utterance(2)
+
+    key = ingest_clip(_wav(samples))
+
+    assert ingest_clip(_wav(samples, extra_chunk=b"INFO")) == key
+    assert near_duplicate_of(key) is None
+
+
+def test_ingest_clip_links_near_duplicates_to_the_first_take():
+    rng = np.random.default_rng(0)
+    samples = _utterance(3)
+    first = ingest_clip(_wav(samples))
+
+    # Quieter, noisier take of the same utterance
+    retake = ingest_clip(_wav(0.7 * samples + rng.normal(0, 0.01, len(samples))))
+    # Different utterance of the same length
+    other = ingest_clip(_wav(_utterance(4)))
+    # Augmented copies are never linked
+    derived = ingest_clip(_wav(0.8 * samples), derived=True)
+
+    assert retake != first
+    assert near_duplicate_of(retake) == first
+    assert near_duplicate_of(other) is None
+    assert near_duplicate_of(derived) is None
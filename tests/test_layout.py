@@ -0,0 +1,53 @@
+import layout
+import voice_utils
+
+
+def _find(component, component_id):
+    """Find a component of the layout tree by ID."""
+    if getattr(component, "id", None) == component_id:
+        return component
+    children = getattr(component, "children", None)
+    if not isinstance(children, list):
+        children = [children]
+    for child in children:
+        if hasattr(child, "to_plotly_json"):
+            found = _find(child, component_id)
+            if found is not None:
+                return found
+    return None
+
+
+def _options(page, component_id):
+    return [option["value"] for option in _find(page, component_id).options]
+
+
+def test_create_layout_lists_models_and_voices(standin, monkeypatch):
+    monkeypatch.setattr(voice_utils, "STT_URL", standin)
+    monkeypatch.setattr(voice_utils, "TTS_URL", standin)
+    monkeypatch.setattr(
+        layout, "parse_stt_models", lambda: [("en-US_Telephony", "custom-id")]
+    )
+
+    page = layout.create_layout(["p"], [])
+
+    assert _options(page, "stt-model-dropdown") == [
+        "en-US_Telephony:custom-id",
+        "en-US_Multimedia",
+        "en-US_Telephony",
+    ]
+    assert _options(page, "response-voice-dropdown") == [
+        "en-US_AllisonV3Voice",
+        "en-US_EmmaExpressive",
+    ]
+
+
+def test_create_layout_falls_back_to_configured_models(standin, monkeypatch):
+    # Nothing serves Speech to Text, so listing its models fails
+    monkeypatch.setattr(voice_utils, "STT_URL", f"{standin}/unavailable")
+    monkeypatch.setattr(voice_utils, "TTS_URL", standin)
+    monkeypatch.setattr(layout, "parse_stt_models", lambda: [("en-US_Telephony", None)])
+
+    page = layout.create_layout(["p"], [])
+
+    assert _options(page, "stt-model-dropdown") == ["en-US_Telephony"]
+    assert _find(page, "stt-model-dropdown").value == ["en-US_Telephony"]
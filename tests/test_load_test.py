@@ -0,0 +1,56 @@
+import asyncio
+
+import watson_async
+from load_test import LoadProfile, LoadStats, TurnResult, run_load_test
+from watson_standin import StandinHandler
+
+
+def test_run_load_test_against_standin(standin, monkeypatch):
+    monkeypatch.setattr(watson_async, "ASSISTANT_URL", standin)
+    monkeypatch.setattr(StandinHandler, "assistant_delay", 0.02)
+    profile = LoadProfile(
+        callers=5, duration=3.0, ramp_up=1.0, think_time=(0.05, 0.1), interval=1.0
+    )
+
+    intervals, summary = asyncio.run(
+        run_load_test([["hello", "cancel my plan"], ["hi"]], profile)
+    )
+
+    assert len(intervals) >= 2
+    assert summary["turns"] > 20
+    assert summary["error rate"] == 0.0
+    assert summary["throughput"] > 0
+    assert 20 <= summary["p50 ms"] <= summary["p90 ms"] <= summary["p99 ms"]
+    # Every caller has stopped by the end of the run
+    assert summary["callers"] == 0
+
+
+def test_run_load_test_counts_errors(standin, monkeypatch):
+    monkeypatch.setattr(watson_async, "ASSISTANT_URL", standin)
+    monkeypatch.setattr(StandinHandler, "assistant_delay", 0.0)
+    monkeypatch.setattr(StandinHandler, "error_rate", 1.0)
+    profile = LoadProfile(callers=2, duration=1.0, think_time=(0.01, 0.02))
+
+    _, summary = asyncio.run(run_load_test([["hello"]], profile))
+
+    assert summary["turns"] > 0
+    assert summary["error rate"] == 1.0
+    assert summary["p50 ms"] is None
+
+
+def test_load_stats_summarizes_each_interval_once():
+    stats = LoadStats()
+    for latency in (0.1, 0.2, 0.3):
+        stats.record(TurnResult(latency, True))
+    stats.record(TurnResult(5.0, False))
+
+    first = stats.summarize_interval(0.0, 2.0)
+    stats.record(TurnResult(0.4, True))
+    second = stats.summarize_interval(2.0, 3.0)
+    run = stats.summarize_run(4.0)
+
+    assert (first["turns"], first["throughput"], first["error rate"]) == (4, 2.0, 0.25)
+    assert first["p50 ms"] == 200
+    assert (second["turns"], second["p50 ms"]) == (1, 400)
+    assert (run["turns"], run["throughput"], run["error rate"]) == (5, 1.25, 0.2)
+    assert run["p50 ms"] == 250
@@ -0,0 +1,92 @@
+import pytest
+
+from run_compare import compare_runs, run_names, save_run
+from server_store import store
+
+WORKSPACE = "compare-tests"
+
+
+def _save(name, rows, voice="alice", workspace=WORKSPACE):
+    store.replace_path(workspace, "p", rows)
+    save_run(workspace, name, ["p"], voice)
+
+
+def _row(transcript, latency):
+    return {
+        "Expected User Text": "cancel my phone plan",
+        "Transcribed Text": transcript,
+        "Latency": latency,
+    }
+
+
+def test_compare_runs_labels_changes():
+    _save(
+        "base",
+        [
+            _row("cancel my phone plan", "stt: 800 ms, assistant: 300 ms"),
+            _row("cancel my phone plan", "stt: 800 ms, assistant: 300 ms"),
+            _row("cancel my phone plan", "stt: 800 ms, assistant: 300 ms"),
+            _row("cancel my phone plan", "stt: 800 ms"),
+        ],
+    )
+    _save(
+        "new",
+        [
+            _row("cancel my phone plan", "stt: 820 ms, assistant: 310 ms"),
+            _row("cancel my phone", "stt: 800 ms, assistant: 300 ms"),
+            _row("cancel my phone plan", "stt: 400 ms, assistant: 200 ms"),
+        ],
+    )
+
+    changes, summary = compare_runs(WORKSPACE, "base", "new")
+
+    assert {change["Row"]: change["Change"] for change in changes} == {
+        1: "regressed",
+        2: "improved",
+    }
+    assert summary["aligned"] == 3
+    assert summary["only in A"] == 1
+    assert summary["only in B"] == 0
+    regressed = changes[0]
+    assert regressed["Score A"] == 100.0
+    assert regressed["Score B"] == pytest.approx(75.0)
+    assert changes[1]["Latency Change (ms)"] == -500
+
+
+def test_compare_runs_counts_one_stage_per_service():
+    streaming = (
+        "stt first interim: 200 ms, stt first final: 700 ms, "
+        "tts first chunk: 150 ms, tts total: 900 ms, assistant: 300 ms"
+    )
+    _save("stream", [_row("cancel my phone plan", streaming)])
+    _save(
+        "http",
+        [_row("cancel my phone plan", "stt: 700 ms, tts: 900 ms, assistant: 300 ms")],
+    )
+
+    changes, summary = compare_runs(WORKSPACE, "stream", "http")
+
+    assert changes == []
+    assert summary["aligned"] == 1
+
+
+def test_compare_runs_aligns_by_row_across_voice_sets():
+    _save("alice", [_row("cancel my phone plan", "stt: 800 ms")], voice="alice")
+    _save("bob", [_row("cancel my plan", "stt: 800 ms")], voice="bob")
+
+    changes, summary = compare_runs(WORKSPACE, "alice", "bob")
+
+    assert summary["aligned"] == 1
+    assert [change["Change"] for change in changes] == ["regressed"]
+    assert changes[0]["Voice"] == "bob"
+
+
+def test_runs_are_kept_per_workspace():
+    _save("baseline", [_row("cancel my phone plan", "stt: 800 ms")], workspace="ws-a")
+    _save("baseline", [_row("cancel my plan", "stt: 800 ms")], workspace="ws-b")
+    _save("other", [_row("cancel my plan", "stt: 800 ms")], workspace="ws-b")
+
+    assert run_names("ws-a") == ["baseline"]
+    assert run_names("ws-b") == ["baseline", "other"]
+    changes, summary = compare_runs("ws-a", "baseline", "baseline")
+    assert changes == [] and summary["aligned"] == 1
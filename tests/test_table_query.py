@@ -0,0 +1,41 @@
+from table_query import query_rows, split_filter_part
+
+
+def test_split_filter_part_reads_operator_after_column():
+    # "phone " contains "ne ", which must not be taken as the operator
+    assert split_filter_part(
+        '{Expected User Text} contains "cancel my phone plan"'
+    ) == (
+        "Expected User Text",
+        "contains",
+        "cancel my phone plan",
+    )
+
+
+def test_split_filter_part_symbols_and_numbers():
+    assert split_filter_part("{Accuracy (en-US_Telephony)} >= 90") == (
+        "Accuracy (en-US_Telephony)",
+        "ge",
+        90.0,
+    )
+    assert split_filter_part("{Error} != timed out") == ("Error", "ne", "timed out")
+    assert split_filter_part("{Error} = 'it\\'s'") == ("Error", "eq", "it's")
+
+
+def test_split_filter_part_rejects_unknown_expressions():
+    assert split_filter_part("") == (None, None, None)
+    assert split_filter_part("contains x") == (None, None, None)
+    assert split_filter_part("{Latency} matches 200") == (None, None, None)
+
+
+def test_query_rows_filters_and_sorts():
+    rows = [
+        {"Expected User Text": "cancel my phone plan", "n": 2},
+        {"Expected User Text": "upgrade my plan", "n": 1},
+        {"Expected User Text": "new phone", "n": 3},
+    ]
+    assert query_rows(rows, '{Expected User Text} contains "phone"', None) == [0, 2]
+    assert query_rows(rows, "{n} gt 1", [{"column_id": "n", "direction": "desc"}]) == [
+        2,
+        0,
+    ]
@@ -0,0 +1,20 @@
+import voice_generator
+
+
+def test_generate_voice_sets_skips_failed_rows(monkeypatch):
+    def synthesize(text, voice):
+        if voice == "bad" and text == "two":
+            raise RuntimeError("synthesis failed")
+        return f"tts/{voice}/{text}"
+
+    monkeypatch.setattr(voice_generator, "synthesize_speech_cached", synthesize)
+
+    voice_sets, skipped = voice_generator.generate_voice_sets(
+        ["one", "", "two"], ["good", "bad"]
+    )
+
+    assert voice_sets == {
+        "tts_good": {"row_0000.wav": "tts/good/one", "row_0002.wav": "tts/good/two"},
+        "tts_bad": {"row_0000.wav": "tts/bad/one"},
+    }
+    assert skipped == [("bad", 2)]
@@ -0,0 +1,93 @@
+import io
+import struct
+import wave
+
+import pytest
+
+import voice_utils
+from watson_standin import StandinHandler
+
+
+def _clip(seconds: float, rate: int = 16000) -> bytes:
+    """A silent mono 16-bit WAV clip."""
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(b"\0\0" * int(rate * seconds))
+    return output.getvalue()
+
+
+@pytest.fixture
+def stt_standin(standin, monkeypatch):
+    monkeypatch.setattr(voice_utils, "STT_WS_URL", standin.replace("http", "ws", 1))
+    monkeypatch.setattr(voice_utils, "STT_STREAM_PACING", "fast")
+    monkeypatch.setattr(StandinHandler, "final_delay", 0.05)
+    return standin
+
+
+def test_transcribe_audio_stream_reports_result_timings(stt_standin):
+    transcript, timings = voice_utils.transcribe_audio_stream(_clip(2.0), pacing="fast")
+
+    assert transcript == StandinHandler.transcript
+    assert set(timings) == {"total", "first interim", "first final"}
+    assert 0 < timings["first interim"] <= timings["first final"] <= timings["total"]
+
+
+@pytest.fixture
+def tts_standin(standin, monkeypatch):
+    monkeypatch.setattr(voice_utils, "TTS_WS_URL", standin.replace("http", "ws", 1))
+    monkeypatch.setattr(StandinHandler, "first_chunk_delay", 0.0)
+    monkeypatch.setattr(StandinHandler, "chunk_interval", 0.0)
+    return standin
+
+
+def test_synthesize_speech_stream_patches_wav_header(tts_standin):
+    key = "tests/tts-stream"
+
+    timings = voice_utils.synthesize_speech_stream("hello there", "en-US_Voice", key)
+
+    assert 0 < timings["first chunk"] <= timings["total"]
+    audio = bytes(voice_utils.store.get_audio(key))
+    data_offset = audio.find(b"data")
+    assert struct.unpack("<I", audio[4:8])[0] == len(audio) - 8
+    assert struct.unpack("<I", audio[data_offset + 4 : data_offset + 8])[0] == (
+        len(audio) - data_offset - 8
+    )
+    with wave.open(io.BytesIO(audio), "rb") as wav_file:
+        assert wav_file.getnframes() * 2 == len(audio) - data_offset - 8
+
+
+def test_synthesis_stream_replaces_mapped_clip_without_rewriting_it(tts_standin):
+    key = "tests/tts-stream-replaced"
+    earlier = _clip(0.5)
+    voice_utils.store.put_audio(key, earlier)
+    mapped = voice_utils.store.get_audio(key)
+
+    voice_utils.synthesize_speech_stream("hello there", "en-US_Voice", key)
+
+    # A reader of the earlier clip still sees it whole
+    assert bytes(mapped) == earlier
+    assert bytes(voice_utils.store.get_audio(key)) != earlier
+
+
+def test_failed_synthesis_stream_deletes_partial_clip(tts_standin, monkeypatch):
+    monkeypatch.setattr(StandinHandler, "fail_synthesis_after", 2)
+    key = "tests/tts-stream-failed"
+
+    with pytest.raises(voice_utils.StreamError):
+        voice_utils.synthesize_speech_stream("hello there", "en-US_Voice", key)
+
+    assert voice_utils.store.get_audio(key) is None
+
+
+def test_transcribe_audio_models_streams_to_every_model(stt_standin):
+    models = [("en-US_Telephony", None), ("en-US_Multimedia", "custom-id")]
+
+    results = voice_utils.transcribe_audio_models(_clip(1.0), models, mode="stream")
+
+    assert list(results) == ["en-US_Telephony", "en-US_Multimedia:custom-id"]
+    for transcript, latency in results.values():
+        assert transcript == StandinHandler.transcript
+        assert latency > 0
@@ -0,0 +1,65 @@
+import asyncio
+import io
+import wave
+
+import pytest
+from ibm_cloud_sdk_core import ApiException
+
+import watson_async
+from voice_utils import SessionExpiredError
+from watson_async import AsyncWatsonClient
+from watson_standin import StandinHandler
+
+
+@pytest.fixture
+def client_standin(standin, monkeypatch):
+    for setting in ("STT_URL", "TTS_URL", "ASSISTANT_URL"):
+        monkeypatch.setattr(watson_async, setting, standin)
+    monkeypatch.setattr(StandinHandler, "assistant_delay", 0.0)
+    return standin
+
+
+def _run(call):
+    """Run one client call on a fresh event loop."""
+
+    async def main():
+        async with AsyncWatsonClient() as client:
+            return await call(client)
+
+    return asyncio.run(main())
+
+
+def test_recognize(client_standin):
+    assert _run(lambda client: client.recognize(b"RIFF audio")) == (
+        StandinHandler.transcript
+    )
+
+
+def test_synthesize_returns_wav_audio(client_standin):
+    audio = _run(lambda client: client.synthesize("hello there", "en-US_Voice"))
+
+    with wave.open(io.BytesIO(audio), "rb") as wav_file:
+        assert wav_file.getframerate() == StandinHandler.sample_rate
+        assert wav_file.getnframes() > 0
+
+
+def test_create_session_and_message(client_standin):
+    async def conversation(client):
+        session_id = await client.create_session()
+        return await client.message("cancel my plan", session_id)
+
+    assert _run(conversation).strip() == "You said: cancel my plan"
+
+
+def test_message_errors(client_standin, monkeypatch):
+    with pytest.raises(SessionExpiredError):
+        _run(lambda client: client.message("hello", "unknown-session"))
+
+    monkeypatch.setattr(StandinHandler, "error_rate", 1.0)
+
+    async def failing_turn(client):
+        return await client.message("hello", await client.create_session())
+
+    with pytest.raises(ApiException) as error:
+        _run(failing_turn)
+    assert error.value.code == 500